@@ -0,0 +1,63 @@
+# ==============================================================================
+# PACOTE DE APOIO DO DASHBOARD
+# ==============================================================================
+# Aqui ficam as partes "pesadas" que não dependem do Streamlit, para poderem ser
+# importadas por outros processos: o pool de processos do simulador, o job
+# headless que gera o snapshot analítico (python -m brasileirao.snapshot), o
+# benchmark offline (python -m brasileirao.benchmark), o backtest do modelo
+# (python -m brasileirao.backtest), o dublê local da API e o teste de carga
+# (python -m brasileirao.api_local / brasileirao.carga) e a execução em lote de
+# várias competições (python -m brasileirao, ver lote.py).
+#
+# As funções principais podem ser importadas direto do pacote:
+#     from brasileirao import process_data, calcular_forca_times, prever_jogo
+# O import é preguiçoso (PEP 562): `import brasileirao` sozinho não carrega
+# pandas/scipy; cada módulo só é lido quando um nome dele é usado.
+import importlib
+
+# nome público -> módulo onde ele mora
+_EXPORTS = {
+    "process_data": "etl",
+    "montar_registro_times": "etl",
+    "calcular_forca_times": "modelo",
+    "prever_jogo": "modelo",
+    "prever_jogos_lote": "modelo",
+    "calcular_pmf_poisson": "modelo",
+    "calcular_forca_dixon_coles": "dixon_coles",
+    "ajustar_dixon_coles": "dixon_coles",
+    "simular_temporada": "simulacao",
+    "montar_confrontos": "forma",
+    "montar_forma": "forma",
+    "fatores_forma": "forma",
+    "montar_snapshot": "snapshot",
+    "carregar_snapshot": "snapshot",
+    "ClienteFootballData": "api",
+    "buscar_competicao": "api",
+    "historico_para_modelo": "historico",
+    "processar_competicao": "lote",
+    "rodar_lote": "lote",
+    "MonitorAoVivo": "ao_vivo",
+    "aplicar_deltas": "ao_vivo",
+    "criar_cache": "cache_compartilhado",
+    "Cenario": "cenarios",
+    "backtest_temporada": "backtest",
+    "rodar_backtest": "backtest",
+    "comparar_cenarios": "cenarios",
+    "ServidorApiLocal": "api_local",
+    "rodar_carga": "carga",
+    "CacheEscudos": "escudos",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(nome):
+    if nome in _EXPORTS:
+        valor = getattr(importlib.import_module(f"brasileirao.{_EXPORTS[nome]}"), nome)
+        globals()[nome] = valor  # Próximo acesso nem passa por aqui
+        return valor
+    raise AttributeError(f"module 'brasileirao' has no attribute {nome!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
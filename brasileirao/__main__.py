@@ -0,0 +1,6 @@
+# python -m brasileirao -> execução em lote (ver brasileirao/lote.py)
+import sys
+
+from brasileirao.lote import main
+
+sys.exit(main())
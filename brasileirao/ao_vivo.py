@@ -0,0 +1,341 @@
+# ==============================================================================
+# MODO AO VIVO (CONSULTA ADAPTATIVA + ATUALIZAÇÃO POR DELTAS)
+# ==============================================================================
+# O cache de 1 hora do dashboard tinha dois problemas: no meio da rodada mostrava
+# placar de uma hora atrás, e numa terça sem jogo gastava cota buscando tudo de
+# novo à toa. E cada atualização refazia TODAS as tabelas a partir do JSON.
+#
+# Aqui:
+#   - o horário dos jogos (coluna Data dos agendados) define as "janelas de jogo"
+#     (um pouco antes do apito até o fim provável). Dentro de uma janela a API é
+#     consultada a cada minuto; fora dela, só quando a próxima janela abrir
+#     (com teto de 1 hora);
+#   - cada consulta pede só os jogos de ontem a amanhã (payload pequeno, com ETag);
+#   - só os jogos cujo status ou placar mudou viram "deltas", aplicados em cima do
+#     snapshot atual: duas linhas da classificação por jogo, as linhas dos dois
+#     times no formato longo e, quando algum jogo TERMINA, o refit das forças
+#     (partindo do ajuste anterior), as previsões e o Monte Carlo.
+#
+# Não depende de Streamlit: o dashboard guarda um MonitorAoVivo por processo.
+import hashlib
+import json
+import threading
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from brasileirao import metricas
+from brasileirao.etl import achatar_jogos, montar_jogos_por_time
+from brasileirao.forma import montar_confrontos, montar_forma
+from brasileirao.historico import PASTA_HISTORICO, historico_para_modelo
+from brasileirao.metricas import cronometrado
+from brasileirao.snapshot import ajuste_do_snapshot, modelar
+
+# Janela de um jogo: de ANTES_DO_JOGO antes do apito até DURACAO_JANELA depois
+# (90 min + intervalo + acréscimos + folga para a API fechar o placar)
+ANTES_DO_JOGO = timedelta(minutes=10)
+DURACAO_JANELA = timedelta(hours=2, minutes=15)
+# Consulta durante a janela: 1 por minuto (a cota gratuita é 10/min, sobra para o resto)
+INTERVALO_AO_VIVO = 60
+# Fora das janelas: espera a próxima abrir, mas nunca mais que isso
+INTERVALO_OCIOSO = 3600
+# Status da API de jogo rolando (vale mesmo se o relógio disser que a janela fechou)
+STATUS_EM_ANDAMENTO = {"IN_PLAY", "PAUSED"}
+# O que define "o jogo mudou"
+COLUNAS_DELTA = ["Status", "Gols_Home", "Gols_Away", "Gols_Home_1T", "Gols_Away_1T"]
+COLUNAS_TABELA = ["Pontos", "Jogos", "Vitórias", "Empates", "Derrotas", "Gols Pró", "Gols Sofridos", "Saldo"]
+
+
+def janelas_de_jogo(datas):
+    """Série de horários de início -> DataFrame com Inicio/Fim de cada janela (mesma ordem)."""
+    datas = pd.to_datetime(pd.Series(datas), utc=True)
+    return pd.DataFrame({"Inicio": datas - ANTES_DO_JOGO, "Fim": datas + DURACAO_JANELA})
+
+
+def intervalo_consulta(df_agendados, agora=None):
+    """
+    Segundos até a próxima consulta à API:
+      - algum jogo dentro da janela (ou com status de jogo rolando): INTERVALO_AO_VIVO;
+      - senão: até a próxima janela abrir, entre INTERVALO_AO_VIVO e INTERVALO_OCIOSO.
+    """
+    agora = pd.Timestamp(agora if agora is not None else datetime.now(timezone.utc))
+    agora = agora.tz_localize("UTC") if agora.tzinfo is None else agora.tz_convert("UTC")
+    if df_agendados is None or df_agendados.empty:
+        return INTERVALO_OCIOSO
+    if df_agendados["Status"].isin(STATUS_EM_ANDAMENTO).any():
+        return INTERVALO_AO_VIVO
+
+    janelas = janelas_de_jogo(df_agendados["Data"].dropna())
+    if ((janelas["Inicio"] <= agora) & (agora <= janelas["Fim"])).any():
+        return INTERVALO_AO_VIVO
+    futuras = janelas.loc[janelas["Inicio"] > agora, "Inicio"]
+    if futuras.empty:
+        return INTERVALO_OCIOSO
+    espera = (futuras.min() - agora).total_seconds()
+    return int(min(max(espera, INTERVALO_AO_VIVO), INTERVALO_OCIOSO))
+
+
+def parametros_consulta(agora=None):
+    """Filtro de datas do /matches: de ontem a amanhã (UTC), para pegar jogo da madrugada."""
+    agora = agora or datetime.now(timezone.utc)
+    return {"dateFrom": (agora - timedelta(days=1)).strftime("%Y-%m-%d"),
+            "dateTo": (agora + timedelta(days=1)).strftime("%Y-%m-%d")}
+
+
+def jogos_alterados(snapshot, matches_raw):
+    """
+    Jogos do payload cujo status ou placar é diferente do que está no snapshot.
+    Devolve o DataFrame "cru" (achatar_jogos) só com eles, indexado por ID_Jogo.
+    Jogo que o snapshot não conhece também entra (quem aplica decide o que fazer).
+    """
+    novos = achatar_jogos(matches_raw).set_index("ID_Jogo")
+    if novos.empty:
+        return novos
+    atuais = pd.concat([snapshot.finalizados, snapshot.agendados])
+    atuais = atuais.set_index("ID_Jogo")[COLUNAS_DELTA].reindex(novos.index)
+    # Comparação coluna a coluna tratando NaN == NaN (placar de jogo que não começou)
+    iguais = pd.Series(True, index=novos.index)
+    for coluna in COLUNAS_DELTA:
+        a, b = novos[coluna], atuais[coluna]
+        iguais &= (a == b) | (a.isna() & b.isna())
+    return novos[~iguais]
+
+
+def _somar_resultados(df_jogos):
+    """Contribuição de jogos FINALIZADOS para a classificação: DataFrame (índice = ID do time)."""
+    jogos = df_jogos[df_jogos["Status"] == "FINISHED"]
+    if jogos.empty:
+        return pd.DataFrame(columns=COLUNAS_TABELA, dtype=int)
+    gh, ga = jogos["Gols_Home"].to_numpy(dtype=int), jogos["Gols_Away"].to_numpy(dtype=int)
+    lados = pd.DataFrame({
+        "ID": np.concatenate([jogos["Home_ID"].to_numpy(), jogos["Away_ID"].to_numpy()]),
+        "Gols Pró": np.concatenate([gh, ga]),
+        "Gols Sofridos": np.concatenate([ga, gh]),
+    })
+    lados["Vitórias"] = (lados["Gols Pró"] > lados["Gols Sofridos"]).astype(int)
+    lados["Empates"] = (lados["Gols Pró"] == lados["Gols Sofridos"]).astype(int)
+    lados["Derrotas"] = (lados["Gols Pró"] < lados["Gols Sofridos"]).astype(int)
+    lados["Jogos"] = 1
+    lados["Pontos"] = 3 * lados["Vitórias"] + lados["Empates"]
+    lados["Saldo"] = lados["Gols Pró"] - lados["Gols Sofridos"]
+    return lados.groupby("ID")[COLUNAS_TABELA].sum()
+
+
+def _atualizar_tabela(df_tabela, antes, depois):
+    """Tira a contribuição antiga dos jogos alterados, soma a nova e reordena a classificação."""
+    delta = _somar_resultados(depois).sub(_somar_resultados(antes), fill_value=0)
+    tabela = df_tabela.set_index("ID")
+    delta = delta.reindex(tabela.index, fill_value=0).astype(int)
+    tabela[COLUNAS_TABELA] = tabela[COLUNAS_TABELA] + delta
+    # Mesmo critério de desempate do Monte Carlo (pontos, vitórias, saldo, gols pró)
+    tabela = tabela.sort_values(["Pontos", "Vitórias", "Saldo", "Gols Pró"], ascending=False, kind="stable")
+    tabela["Pos"] = np.arange(1, len(tabela) + 1)
+    return tabela.reset_index()[df_tabela.columns]
+
+
+def _atualizar_forma(snapshot, time_jogos, remontado, times):
+    """Confrontos e forma recalculados só para os times envolvidos (e os pares com eles)."""
+    if snapshot.forma.empty or snapshot.confrontos.empty:
+        # Snapshot antigo, sem essas tabelas: calculo tudo uma vez
+        return montar_confrontos(time_jogos), montar_forma(time_jogos)
+    forma = pd.concat([snapshot.forma[~snapshot.forma.index.isin(times)], montar_forma(remontado)])
+    pares = snapshot.confrontos.index
+    mantidos = ~(pares.get_level_values(0).isin(times) | pares.get_level_values(1).isin(times))
+    com_eles = time_jogos.index.isin(times) | time_jogos["Adversario_ID"].isin(times)
+    confrontos = pd.concat([snapshot.confrontos[mantidos], montar_confrontos(time_jogos[com_eles])])
+    return confrontos.sort_index(), forma.sort_index(kind="stable")
+
+
+def versao_com_deltas(versao, alterados):
+    """Versão nova = hash da versão anterior + os deltas (invalida os caches por versão)."""
+    deltas = alterados[COLUNAS_DELTA].astype(str).reset_index().to_dict(orient="records")
+    conteudo = json.dumps([versao, deltas], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()[:16]
+
+
+@cronometrado()
+def aplicar_deltas(snapshot, alterados, df_historico=None, n_simulacoes=None, seed=None):
+    """
+    Aplica os jogos alterados (saída do jogos_alterados) em cima do snapshot e devolve
+    (snapshot_novo, resumo). Não refaz o ETL:
+      - as linhas dos jogos alterados mudam de status/placar (e passam de agendados
+        para finalizados quando terminam), mantendo o índice (as previsões casam por ele);
+      - a classificação recebe só a diferença de pontos/gols dos times envolvidos;
+      - o formato longo (time_jogos) é remontado só para esses times;
+      - forças, previsões e projeção só são refeitas se o conjunto de jogos
+        finalizados mudou (placar de jogo rolando não mexe no modelo).
+    Jogo que o snapshot não conhece (tabela nova da API) é ignorado e contado no resumo:
+    o snapshot completo seguinte (job ou plano B) traz ele.
+    """
+    resumo = {"alterados": 0, "finalizados": 0, "ignorados": 0, "remodelado": False}
+    if alterados is None or alterados.empty:
+        return snapshot, resumo
+
+    jogos = pd.concat([snapshot.finalizados, snapshot.agendados])
+    conhecidos = alterados.index.isin(jogos["ID_Jogo"])
+    resumo["ignorados"] = int((~conhecidos).sum())
+    alterados = alterados[conhecidos]
+    if alterados.empty:
+        return snapshot, resumo
+
+    # Linhas antigas (com nomes, siglas e o índice original) recebem status e placar novos
+    antes = jogos[jogos["ID_Jogo"].isin(alterados.index)]
+    depois = antes.copy()
+    novos_valores = alterados.reindex(antes["ID_Jogo"])[COLUNAS_DELTA]
+    for coluna in COLUNAS_DELTA:
+        depois[coluna] = novos_valores[coluna].to_numpy()
+
+    terminou = depois["Status"] == "FINISHED"
+    finalizados = pd.concat([snapshot.finalizados.drop(antes.index, errors="ignore"), depois[terminou]]).sort_index()
+    agendados = pd.concat([snapshot.agendados.drop(antes.index, errors="ignore"), depois[~terminou]]).sort_index()
+    resumo["alterados"] = len(alterados)
+    resumo["finalizados"] = int((terminou & (antes["Status"] != "FINISHED")).sum())
+
+    # Mudou algum resultado que conta (jogo terminou, placar final corrigido, jogo anulado)?
+    mudou_resultado = ((antes["Status"] == "FINISHED") | terminou).any()
+    if not mudou_resultado:
+        # Só jogo rolando: placar/status novo nos agendados, modelo e tabelas intactos
+        novo = replace(snapshot, agendados=agendados, versao=versao_com_deltas(snapshot.versao, alterados))
+        return novo, resumo
+
+    tabela = _atualizar_tabela(snapshot.tabela, antes, depois)
+    # Formato longo: só os times dos jogos alterados são remontados
+    times = pd.unique(np.concatenate([antes["Home_ID"].to_numpy(), antes["Away_ID"].to_numpy()]))
+    dos_times = finalizados["Home_ID"].isin(times) | finalizados["Away_ID"].isin(times)
+    remontado = montar_jogos_por_time(finalizados[dos_times])
+    remontado = remontado[remontado.index.isin(times)]
+    time_jogos = pd.concat([snapshot.time_jogos[~snapshot.time_jogos.index.isin(times)], remontado])
+    time_jogos = time_jogos.sort_values(["ID", "Data"]) if not time_jogos.empty else time_jogos
+    confrontos, forma = _atualizar_forma(snapshot, time_jogos, remontado, times)
+
+    modelo = snapshot.metadados.get("modelo", "dixon_coles")
+    n_simulacoes = n_simulacoes or snapshot.metadados.get("n_simulacoes", 100_000)
+    if df_historico is None and not snapshot.historico.empty:
+        df_historico = snapshot.historico  # O mesmo histórico com que o snapshot foi montado
+    forcas, media_casa, media_fora, rho, previsoes, projecao, posicoes = modelar(
+        tabela, finalizados, agendados, n_simulacoes=n_simulacoes, seed=seed, df_historico=df_historico,
+        modelo=modelo, ajuste_anterior=ajuste_do_snapshot(snapshot),
+    )
+    resumo["remodelado"] = True
+    novo = replace(
+        snapshot, versao=versao_com_deltas(snapshot.versao, alterados),
+        gerado_em=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        tabela=tabela, finalizados=finalizados, agendados=agendados, time_jogos=time_jogos,
+        confrontos=confrontos, forma=forma,
+        historico=df_historico if df_historico is not None else snapshot.historico,
+        forcas=forcas, previsoes=previsoes, projecao=projecao, posicoes=posicoes,
+        media_casa=float(media_casa), media_fora=float(media_fora),
+        metadados={**snapshot.metadados, "n_simulacoes": n_simulacoes, "rho": rho},
+    )
+    return novo, resumo
+
+
+class MonitorAoVivo:
+    """
+    Um por processo (o dashboard guarda com st.cache_resource): todas as sessões
+    leem o mesmo snapshot e só UMA consulta a API por vez, no ritmo do
+    intervalo_consulta. A trava só protege o "quem consulta agora?": a ida à API
+    (com os retries do cliente) e o remodelo rodam FORA dela, numa thread em segundo
+    plano, e o snapshot novo entra no lugar do antigo quando fica pronto. Enquanto
+    isso, todo mundo (inclusive quem disparou a consulta) recebe o snapshot atual na hora.
+    Com `cache` (ver cache_compartilhado.py), as réplicas dividem a consulta: no
+    máximo uma ida à API por intervalo para todas elas.
+    `relogio` existe para simular o tempo passando; com em_segundo_plano=False a
+    consulta roda na própria chamada (útil em scripts e testes).
+    """
+
+    def __init__(self, cliente, competicao="BSA", pasta_historico=PASTA_HISTORICO, relogio=time.time, cache=None,
+                 em_segundo_plano=True):
+        self.cliente = cliente
+        self.cache = cache
+        self.competicao = competicao
+        self.pasta_historico = pasta_historico
+        self.relogio = relogio
+        self.em_segundo_plano = em_segundo_plano
+        self._trava = threading.Lock()
+        self._base = None          # versão do snapshot completo de onde os deltas partiram
+        self._snapshot = None
+        self._historico = None
+        self._historico_carregado = False
+        self._consultando = False
+        self.proxima_consulta = 0.0
+        self.ultimo_resumo = None
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def intervalo(self):
+        """Segundos até a próxima consulta, pelo calendário do snapshot atual."""
+        agora = datetime.fromtimestamp(self.relogio(), timezone.utc)
+        return intervalo_consulta(self._snapshot.agendados if self._snapshot is not None else None, agora)
+
+    def atualizar(self, snapshot_base, forcar=False):
+        """
+        Devolve o snapshot mais novo: o completo (`snapshot_base`, do job ou do plano B)
+        com os deltas ao vivo aplicados por cima. Se já deu a hora (ou forcar=True) e
+        ninguém está consultando, dispara a consulta; o resultado aparece nas próximas
+        chamadas. Snapshot completo novo (versão diferente) substitui os deltas acumulados.
+        """
+        if snapshot_base is None:
+            return None
+        with self._trava:
+            if snapshot_base.versao != self._base:
+                # Consulta em andamento sobre a base antiga é descartada quando terminar
+                self._base, self._snapshot = snapshot_base.versao, snapshot_base
+                self.proxima_consulta = 0.0
+            agora = self.relogio()
+            if self._consultando or (not forcar and agora < self.proxima_consulta):
+                return self._snapshot
+            # Esta chamada fica com a consulta; as outras passam direto até ela terminar
+            self._consultando = True
+            partida = self._snapshot
+        if self.em_segundo_plano:
+            threading.Thread(target=self._consultar, args=(partida,), name="ao-vivo", daemon=True).start()
+        else:
+            self._consultar(partida)
+        return self._snapshot
+
+    def _consultar(self, partida):
+        novo, resumo = partida, None
+        try:
+            novo, resumo = self._buscar_e_aplicar(partida)
+        except Exception as erro:
+            # API fora do ar não derruba a página: fica o último snapshot, tenta de novo depois
+            metricas.contar("ao_vivo_erros")
+            resumo = {"erro": str(erro)}
+        finally:
+            with self._trava:
+                if self._snapshot is partida:
+                    self._snapshot = novo
+                    self.proxima_consulta = self.relogio() + self.intervalo()
+                else:
+                    # A base mudou no meio (snapshot completo novo): ela é consultada na próxima chamada
+                    self.proxima_consulta = 0.0
+                self.ultimo_resumo = resumo
+                self._consultando = False
+
+    def _buscar_e_aplicar(self, snapshot):
+        metricas.contar("ao_vivo_consultas")
+        agora = datetime.fromtimestamp(self.relogio(), timezone.utc)
+        params = parametros_consulta(agora)
+
+        def buscar():
+            return self.cliente.get(f"/competitions/{self.competicao}/matches", params)
+
+        if self.cache is None:
+            matches = buscar()
+        else:
+            chave = f"ao_vivo:{self.competicao}:{params['dateFrom']}:{params['dateTo']}"
+            matches = self.cache.obter(chave, INTERVALO_AO_VIVO, buscar)
+        alterados = jogos_alterados(snapshot, matches)
+        if not alterados.empty and not self._historico_carregado:
+            # Temporada(s) anterior(es), igual ao snapshot completo: carregadas uma vez só
+            self._historico = historico_para_modelo(matches, self.competicao, pasta=self.pasta_historico)
+            self._historico_carregado = True
+        novo, resumo = aplicar_deltas(snapshot, alterados, self._historico)
+        metricas.contar("ao_vivo_jogos_alterados", resumo["alterados"])
+        return novo, resumo
@@ -0,0 +1,274 @@
+# ==============================================================================
+# CLIENTE HTTP DA FOOTBALL-DATA.ORG
+# ==============================================================================
+# Antes eu fazia requests.get "solto": conexão nova a cada chamada, sem timeout e
+# sem retry. Aqui fica uma Session só (pool de conexões reaproveitado), com:
+#   - GET condicional (ETag / Last-Modified): se nada mudou a API responde 304
+#     e eu reaproveito o corpo que já tenho guardado;
+#   - retry com backoff em 429 e erros 5xx;
+#   - respeito aos cabeçalhos de cota (X-Requests-Available-Minute), para não
+#     estourar as 10 requisições/minuto da tier gratuita;
+#   - um "balde de fichas" (token bucket) compartilhado por todas as threads, para
+#     poder disparar vários endpoints EM PARALELO (get_varios) sem passar da cota.
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from brasileirao import metricas
+
+BASE_URL = "https://api.football-data.org/v4"
+
+# Status que valem uma nova tentativa (limite de cota ou instabilidade do servidor)
+STATUS_RETRY = {429, 500, 502, 503, 504}
+
+# Tier gratuita: 10 requisições por minuto
+REQUISICOES_POR_MINUTO = 10
+
+
+class LimitadorCota:
+    """
+    Token bucket: o balde começa cheio (`capacidade` fichas) e ganha `taxa` fichas
+    por segundo. Cada requisição gasta uma ficha; sem ficha, a thread espera.
+    Com o balde cheio, as primeiras requisições saem todas juntas (rajada) e o
+    total por minuto nunca passa da cota.
+    """
+
+    def __init__(self, capacidade=REQUISICOES_POR_MINUTO, por_segundos=60.0):
+        self.capacidade = capacidade
+        self.taxa = capacidade / por_segundos
+        self._fichas = float(capacidade)
+        self._ultima = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reabastecer(self):
+        agora = time.monotonic()
+        self._fichas = min(self.capacidade, self._fichas + (agora - self._ultima) * self.taxa)
+        self._ultima = agora
+
+    def adquirir(self):
+        """Bloqueia até ter uma ficha e gasta. Devolve quanto tempo esperou (segundos)."""
+        esperado = 0.0
+        while True:
+            with self._lock:
+                self._reabastecer()
+                if self._fichas >= 1:
+                    self._fichas -= 1
+                    return esperado
+                falta = (1 - self._fichas) / self.taxa
+            # Dorme FORA do lock, para as outras threads poderem conferir o balde
+            time.sleep(falta)
+            esperado += falta
+
+
+class ClienteFootballData:
+    """
+    Cliente com pool de conexões, GET condicional, retry e controle de cota.
+    Uma instância é compartilhada por todas as sessões do Streamlit (ver
+    get_cliente_api no app), por isso o estado interno fica protegido por lock.
+    """
+
+    def __init__(self, api_key, base_url=BASE_URL, timeout=(3.05, 15), max_tentativas=4,
+                 backoff=1.0, espera_maxima=60, tamanho_pool=10, limitador=None):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_tentativas = max_tentativas
+        self.backoff = backoff
+        self.espera_maxima = espera_maxima
+
+        self.session = requests.Session()
+        self.session.headers.update({"X-Auth-Token": api_key})
+        adaptador = HTTPAdapter(pool_connections=tamanho_pool, pool_maxsize=tamanho_pool)
+        self.session.mount("https://", adaptador)
+        self.session.mount("http://", adaptador)
+
+        # url -> {"etag", "last_modified", "dados"} da última resposta 200
+        self._respostas = {}
+        # Estado da cota informado pela própria API
+        self.requisicoes_disponiveis = None
+        self._reset_cota_em = 0.0
+        self._lock = threading.Lock()
+        # Balde de fichas compartilhado por todas as threads que usam este cliente
+        self.limitador = limitador or LimitadorCota()
+
+    def _atualizar_cota(self, resposta):
+        """Lê os cabeçalhos de cota que a football-data.org manda em toda resposta."""
+        disponiveis = resposta.headers.get("X-Requests-Available-Minute")
+        reset = resposta.headers.get("X-RequestCounter-Reset")
+        with self._lock:
+            if disponiveis is not None:
+                self.requisicoes_disponiveis = int(disponiveis)
+            if reset is not None:
+                self._reset_cota_em = time.monotonic() + int(reset)
+
+    def _esperar_cota(self):
+        """Se a API já disse que a cota do minuto acabou, espero o contador zerar."""
+        with self._lock:
+            sem_cota = self.requisicoes_disponiveis is not None and self.requisicoes_disponiveis <= 0
+            espera = self._reset_cota_em - time.monotonic()
+        if sem_cota and espera > 0:
+            time.sleep(min(espera, self.espera_maxima))
+
+    def _tempo_de_espera(self, resposta, tentativa):
+        """Quanto esperar antes de tentar de novo: o que a API pedir, senão backoff exponencial."""
+        if resposta is not None:
+            for cabecalho in ("Retry-After", "X-RequestCounter-Reset"):
+                valor = resposta.headers.get(cabecalho)
+                if valor and valor.isdigit():
+                    return min(int(valor), self.espera_maxima)
+        return min(self.backoff * 2 ** tentativa, self.espera_maxima)
+
+    def get(self, caminho, params=None):
+        """
+        Faz o GET em base_url + caminho e devolve o JSON.
+        Se a API responder 304 (nada mudou), devolvo o corpo guardado da última vez.
+        Depois de esgotar as tentativas, a exceção do requests sobe para quem chamou.
+        """
+        with metricas.medir("api_get_segundos", endpoint=caminho):
+            return self._get(caminho, params)
+
+    def _get(self, caminho, params):
+        url = f"{self.base_url}{caminho}"
+        chave = requests.Request("GET", url, params=params).prepare().url
+
+        with self._lock:
+            guardada = self._respostas.get(chave)
+        cabecalhos = {}
+        if guardada:
+            if guardada["etag"]:
+                cabecalhos["If-None-Match"] = guardada["etag"]
+            if guardada["last_modified"]:
+                cabecalhos["If-Modified-Since"] = guardada["last_modified"]
+
+        for tentativa in range(self.max_tentativas):
+            self._esperar_cota()
+            espera = self.limitador.adquirir()
+            if espera:
+                metricas.observar_tempo("api_espera_cota_segundos", espera)
+            resposta = None
+            try:
+                resposta = self.session.get(url, params=params, headers=cabecalhos, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if tentativa == self.max_tentativas - 1:
+                    raise
+            else:
+                self._atualizar_cota(resposta)
+                metricas.contar("api_respostas", endpoint=caminho, status=resposta.status_code)
+                if resposta.status_code == 304:
+                    if guardada:
+                        return guardada["dados"]
+                    # 304 sem termos mandado GET condicional (proxy/servidor mal comportado): não há
+                    # corpo para reaproveitar, e o raise_for_status deixaria passar um 304 vazio
+                    raise requests.HTTPError(
+                        f"304 Not Modified para {caminho} sem resposta guardada (nenhum GET condicional foi feito)",
+                        response=resposta,
+                    )
+                if resposta.status_code not in STATUS_RETRY or tentativa == self.max_tentativas - 1:
+                    break
+            time.sleep(self._tempo_de_espera(resposta, tentativa))
+
+        resposta.raise_for_status()
+        metricas.registrar_valor("api_payload_bytes", len(resposta.content), endpoint=caminho)
+        dados = resposta.json()
+        with self._lock:
+            self._respostas[chave] = {
+                "etag": resposta.headers.get("ETag"),
+                "last_modified": resposta.headers.get("Last-Modified"),
+                "dados": dados,
+            }
+        return dados
+
+    def get_varios(self, pedidos, max_paralelo=None, ao_chegar=None):
+        """
+        Dispara vários GETs em paralelo (thread pool; cada thread usa o pool de
+        conexões da mesma Session) e devolve {nome: json} na mesma ordem de `pedidos`.
+
+        `pedidos` é {nome: caminho} ou {nome: (caminho, params)}. O limitador de cota
+        continua valendo para o conjunto todo, então o tempo total fica perto do da
+        requisição mais lenta (até acabarem as fichas do balde). `ao_chegar(nome, json)`
+        é chamado (na thread de quem chamou) assim que cada resposta chega. Se alguma
+        falhar, a exceção sobe depois que as outras terminam.
+        """
+        normalizados = {
+            nome: pedido if isinstance(pedido, tuple) else (pedido, None) for nome, pedido in pedidos.items()
+        }
+        if not normalizados:
+            return {}
+        n_threads = max_paralelo or min(len(normalizados), self.limitador.capacidade)
+        with ThreadPoolExecutor(max_workers=n_threads, thread_name_prefix="football-data") as pool:
+            futuros = {nome: pool.submit(self.get, caminho, params) for nome, (caminho, params) in normalizados.items()}
+            if ao_chegar is not None:
+                nomes = {futuro: nome for nome, futuro in futuros.items()}
+                for futuro in as_completed(nomes):
+                    if futuro.exception() is None:
+                        ao_chegar(nomes[futuro], futuro.result())
+        return {nome: futuro.result() for nome, futuro in futuros.items()}
+
+
+def buscar_competicao(cliente, codigo="BSA", temporada=None, times=True, artilheiros=False, jogos_detalhados=()):
+    """
+    Busca tudo de uma competição de uma vez, com os endpoints independentes em
+    paralelo, e já devolve (standings_raw, matches_raw) no formato que o
+    process_data consome (os extras são mesclados dentro deles, ver mesclar_detalhes).
+
+    - times: /competitions/{codigo}/teams (completa nome curto, sigla e escudo dos clubes);
+    - artilheiros: /competitions/{codigo}/scorers (fica em standings_raw["scorers"]);
+    - jogos_detalhados: IDs de jogos para buscar em /matches/{id} (placar mais fresco).
+    """
+    params = {"season": temporada} if temporada else None
+    pedidos = {
+        "standings": (f"/competitions/{codigo}/standings", params),
+        "matches": (f"/competitions/{codigo}/matches", params),
+    }
+    if times:
+        pedidos["teams"] = (f"/competitions/{codigo}/teams", params)
+    if artilheiros:
+        pedidos["scorers"] = (f"/competitions/{codigo}/scorers", params)
+    for id_jogo in jogos_detalhados:
+        pedidos[("match", id_jogo)] = f"/matches/{id_jogo}"
+
+    with metricas.medir("buscar_competicao_segundos", competicao=codigo):
+        respostas = cliente.get_varios(pedidos)
+    detalhes = {nome[1]: dados for nome, dados in respostas.items() if isinstance(nome, tuple)}
+    return mesclar_detalhes(
+        respostas["standings"], respostas["matches"],
+        times=respostas.get("teams"), artilheiros=respostas.get("scorers"), detalhes_jogos=detalhes,
+    )
+
+
+def mesclar_detalhes(standings_raw, matches_raw, times=None, artilheiros=None, detalhes_jogos=None):
+    """
+    Junta os endpoints extras nas duas estruturas de sempre, sem mudar o formato:
+    - dados de /teams completam (sem sobrescrever) o dicionário de cada time;
+    - /matches/{id} substitui o jogo correspondente na lista de jogos;
+    - /scorers vai para standings_raw["scorers"].
+    Devolve CÓPIAS: depois de um 304, os dicionários recebidos são os que o cliente
+    guarda (e divide entre sessões e threads), então nada aqui mexe neles.
+    """
+    if times or detalhes_jogos:
+        # Os times e jogos alterados moram lá dentro das listas: cópia profunda
+        standings_raw, matches_raw = copy.deepcopy(standings_raw), copy.deepcopy(matches_raw)
+    elif artilheiros:
+        standings_raw = dict(standings_raw)
+    if times:
+        por_id = {t["id"]: t for t in times.get("teams", [])}
+        equipes = [linha["team"] for tabela in standings_raw.get("standings", []) for linha in tabela["table"]]
+        equipes += [jogo[lado] for jogo in matches_raw.get("matches", []) for lado in ("homeTeam", "awayTeam")]
+        for equipe in equipes:
+            detalhe = por_id.get(equipe.get("id"))
+            if detalhe:
+                for chave in ("name", "shortName", "tla", "crest"):
+                    if not equipe.get(chave) and detalhe.get(chave):
+                        equipe[chave] = detalhe[chave]
+    if detalhes_jogos:
+        for i, jogo in enumerate(matches_raw.get("matches", [])):
+            detalhe = detalhes_jogos.get(jogo["id"])
+            if detalhe:
+                # /matches/{id} devolve o jogo "solto" (v4) ou dentro de "match" (versões antigas)
+                matches_raw["matches"][i] = {**jogo, **detalhe.get("match", detalhe)}
+    if artilheiros:
+        standings_raw["scorers"] = artilheiros.get("scorers", [])
+    return standings_raw, matches_raw
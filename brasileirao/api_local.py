@@ -0,0 +1,480 @@
+# ==============================================================================
+# DUBLÊ LOCAL DA FOOTBALL-DATA.ORG (GRAVAR E REPRODUZIR)
+# ==============================================================================
+# Testar o dashboard com muita gente ao mesmo tempo contra a API de verdade gasta
+# a cota (10 requisições/minuto) e depende de ter jogo rolando. Aqui ficam:
+#   - o gravador: baixa standings/matches/teams de cada competição UMA vez e grava
+#     em <pasta>/<codigo>/*.json (o mesmo formato do --entrada do lote);
+#   - o dublê: um servidor HTTP local que responde os mesmos caminhos da API v4 a
+#     partir da gravação, com:
+#       * latência configurável e 429 (cota por minuto e/ou sorteado), com os
+#         mesmos cabeçalhos de cota da API de verdade;
+#       * ETag / If-None-Match (304), para o GET condicional do cliente funcionar;
+#       * filtros do /matches (dateFrom, dateTo, status, matchday);
+#       * placar mudando com o tempo: os jogos que ainda não aconteceram viram uma
+#         "linha do tempo" no relógio do servidor (rodada a rodada: apito, gols,
+#         intervalo, fim) e a classificação é refeita a partir dos jogos finalizados;
+#       * contadores de requisições por endpoint e status (/_controle/estatisticas).
+#
+#     python -m brasileirao.api_local gravar --competicoes BSA --pasta dados/gravacao
+#     python -m brasileirao.api_local gravar --sintetico --pasta dados/gravacao
+#     python -m brasileirao.api_local servir --pasta dados/gravacao --porta 8765 --latencia 0.2 --cota 10
+#     FOOTBALL_DATA_BASE_URL=http://127.0.0.1:8765/v4 streamlit run brasileiro_serie_A.py
+import argparse
+import copy
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ENDPOINTS = ("standings", "matches", "teams", "scorers")
+# Status de jogo que ainda vai acontecer (entram na linha do tempo)
+STATUS_FUTUROS = {"SCHEDULED", "TIMED"}
+# Linha do tempo: segundos (no relógio do servidor) de cada fase
+INICIO_EM = 30
+DURACAO_JOGO = 120
+INTERVALO_RODADAS = 60
+# Fração do jogo em que fica o intervalo (status PAUSED)
+INTERVALO_DE_JOGO = (0.45, 0.55)
+# Média de gols dos placares sorteados para os jogos que ainda não tinham resultado
+MEDIA_GOLS = (1.4, 1.1)
+
+
+# ------------------------------------------------------------------------------
+# Gravação
+# ------------------------------------------------------------------------------
+def _gravar_json(caminho, dados):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False)
+
+
+def gravar_api(cliente, codigos, pasta, temporada=None, artilheiros=False):
+    """
+    Baixa as respostas CRUAS (sem mesclar nada) de cada competição e grava em
+    <pasta>/<codigo>/<endpoint>.json. Todos os GETs saem juntos pelo get_varios
+    (o limitador do cliente segura a cota). Devolve {codigo: [endpoints gravados]}.
+    """
+    params = {"season": temporada} if temporada else None
+    endpoints = [e for e in ENDPOINTS if artilheiros or e != "scorers"]
+    pedidos = {(codigo, endpoint): (f"/competitions/{codigo}/{endpoint}", params)
+               for codigo in codigos for endpoint in endpoints}
+    gravados = {}
+
+    def gravar(nome, dados):
+        codigo, endpoint = nome
+        _gravar_json(os.path.join(pasta, codigo, f"{endpoint}.json"), dados)
+        gravados.setdefault(codigo, []).append(endpoint)
+
+    cliente.get_varios(pedidos, ao_chegar=gravar)
+    _gravar_json(os.path.join(pasta, "gravacao.json"), {
+        "gravado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "origem": cliente.base_url, "competicoes": gravados,
+    })
+    return gravados
+
+
+def gravar_sintetico(pasta, codigo="BSA", rodadas_jogadas=19, seed=2024):
+    """Gravação de uma temporada sintética (sintetico.py): dá para testar sem chave nenhuma."""
+    from brasileirao.sintetico import gerar_temporada
+    standings, matches = gerar_temporada(rodadas_jogadas=rodadas_jogadas, competicao=codigo, seed=seed)
+    times = {"count": len(standings["standings"][0]["table"]), "competition": standings["competition"],
+             "teams": [linha["team"] for linha in standings["standings"][0]["table"]]}
+    for endpoint, dados in (("standings", standings), ("matches", matches), ("teams", times)):
+        _gravar_json(os.path.join(pasta, codigo, f"{endpoint}.json"), dados)
+    _gravar_json(os.path.join(pasta, "gravacao.json"), {
+        "gravado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "origem": "sintetico", "competicoes": {codigo: ["standings", "matches", "teams"]},
+    })
+    return {codigo: ["standings", "matches", "teams"]}
+
+
+# ------------------------------------------------------------------------------
+# Reprodução: gravação + linha do tempo dos placares
+# ------------------------------------------------------------------------------
+def _data_api(instante):
+    return datetime.fromtimestamp(instante, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class Reproducao:
+    """
+    O que o dublê serve: os payloads gravados de cada competição e, com evoluir=True,
+    os jogos futuros "acontecendo" no relógio do servidor. A rodada seguinte apita
+    `inicio_em` segundos depois da criação, cada jogo dura `duracao_jogo` segundos
+    (com intervalo no meio) e as rodadas seguintes vêm em sequência. Os placares são
+    sorteados uma vez (semente fixa), então duas execuções veem a mesma história.
+    O estado é função só do relógio: várias threads podem ler ao mesmo tempo.
+    """
+
+    def __init__(self, pasta, evoluir=True, inicio_em=INICIO_EM, duracao_jogo=DURACAO_JOGO,
+                 intervalo_rodadas=INTERVALO_RODADAS, seed=0, relogio=time.time):
+        self.relogio = relogio
+        self.duracao_jogo = duracao_jogo
+        self.gravado = {}
+        for codigo in sorted(os.listdir(pasta)):
+            if not os.path.isdir(os.path.join(pasta, codigo)):
+                continue
+            self.gravado[codigo] = {}
+            for endpoint in ENDPOINTS:
+                caminho = os.path.join(pasta, codigo, f"{endpoint}.json")
+                if os.path.exists(caminho):
+                    with open(caminho, encoding="utf-8") as f:
+                        self.gravado[codigo][endpoint] = json.load(f)
+        if not self.gravado:
+            raise FileNotFoundError(f"nenhuma competição gravada em {pasta} (rode o `gravar` antes)")
+
+        # Roteiro de cada jogo futuro: {id: (apito, [(segundo, lado), ...] dos gols)}
+        self._roteiro = {}
+        if evoluir:
+            rng = random.Random(seed)
+            inicio = relogio() + inicio_em
+            for codigo, gravado in self.gravado.items():
+                futuros = [j for j in gravado.get("matches", {}).get("matches", []) if j["status"] in STATUS_FUTUROS]
+                rodadas = sorted({j["matchday"] for j in futuros})
+                for jogo in futuros:
+                    apito = inicio + rodadas.index(jogo["matchday"]) * (duracao_jogo + intervalo_rodadas)
+                    self._roteiro[jogo["id"]] = (apito, self._sortear_gols(rng))
+
+    def _sortear_gols(self, rng):
+        """Minutos (em segundos do servidor) e lado de cada gol, fora do intervalo."""
+        pausa, volta = INTERVALO_DE_JOGO
+        gols = []
+        for lado, media in zip(("home", "away"), MEDIA_GOLS):
+            # Poisson por inversão (o random da biblioteca padrão não tem poisson)
+            limite, produto, n = pow(2.718281828459045, -media), rng.random(), 0
+            while produto > limite:
+                produto *= rng.random()
+                n += 1
+            for _ in range(n):
+                fracao = rng.uniform(0, 1 - (volta - pausa))
+                gols.append((self.duracao_jogo * (fracao if fracao < pausa else fracao + volta - pausa), lado))
+        return sorted(gols)
+
+    def _jogo_agora(self, jogo, agora):
+        roteiro = self._roteiro.get(jogo["id"])
+        if roteiro is None:
+            return jogo
+        apito, gols = roteiro
+        jogo = copy.deepcopy(jogo)
+        jogo["utcDate"] = _data_api(apito)
+        decorrido = agora - apito
+        if decorrido < 0:
+            return jogo
+        pausa, volta = INTERVALO_DE_JOGO
+        if decorrido >= self.duracao_jogo:
+            jogo["status"] = "FINISHED"
+        elif pausa * self.duracao_jogo <= decorrido < volta * self.duracao_jogo:
+            jogo["status"] = "PAUSED"
+        else:
+            jogo["status"] = "IN_PLAY"
+        placar = {"home": 0, "away": 0}
+        primeiro_tempo = {"home": 0, "away": 0}
+        for segundo, lado in gols:
+            if segundo <= decorrido:
+                placar[lado] += 1
+                if segundo < pausa * self.duracao_jogo:
+                    primeiro_tempo[lado] += 1
+        ultimo_evento = max([apito] + [apito + s for s, _ in gols if s <= decorrido])
+        if jogo["status"] == "FINISHED":
+            ultimo_evento = apito + self.duracao_jogo
+            vencedor = "HOME_TEAM" if placar["home"] > placar["away"] else (
+                "AWAY_TEAM" if placar["away"] > placar["home"] else "DRAW")
+        else:
+            vencedor = None
+        jogo["lastUpdated"] = _data_api(ultimo_evento)
+        jogo["score"] = {**jogo.get("score", {}), "winner": vencedor, "fullTime": placar,
+                         "halfTime": primeiro_tempo if decorrido >= pausa * self.duracao_jogo else dict(placar)}
+        return jogo
+
+    def jogos(self, codigo, agora=None):
+        """Payload do /matches da competição no instante `agora` (padrão: relógio)."""
+        agora = self.relogio() if agora is None else agora
+        gravado = self.gravado[codigo]["matches"]
+        return {**gravado, "matches": [self._jogo_agora(j, agora) for j in gravado["matches"]]}
+
+    def classificacao(self, codigo, agora=None):
+        """Payload do /standings: o gravado, com a tabela refeita se algum jogo da linha do tempo já terminou."""
+        gravado = self.gravado[codigo]["standings"]
+        agora = self.relogio() if agora is None else agora
+        if not any(apito + self.duracao_jogo <= agora for apito, _ in self._roteiro.values()):
+            return gravado
+        tabela = _tabela_dos_jogos(gravado["standings"][0]["table"], self.jogos(codigo, agora)["matches"])
+        standings = copy.deepcopy(gravado)
+        standings["standings"][0]["table"] = tabela
+        return standings
+
+    def responder(self, caminho, params):
+        """(status, payload) para um caminho da API v4 (sem o prefixo /v4)."""
+        partes = caminho.strip("/").split("/")
+        if len(partes) == 2 and partes[0] == "matches" and partes[1].isdigit():
+            for codigo in self.gravado:
+                for jogo in self.jogos(codigo)["matches"]:
+                    if jogo["id"] == int(partes[1]):
+                        return 200, jogo
+            return 404, {"message": f"Match {partes[1]} not found.", "errorCode": 404}
+        if len(partes) != 3 or partes[0] != "competitions" or partes[1] not in self.gravado:
+            return 404, {"message": "The resource you are looking for does not exist.", "errorCode": 404}
+        codigo, endpoint = partes[1], partes[2]
+        if endpoint not in self.gravado[codigo]:
+            return 404, {"message": f"{endpoint} não foi gravado para {codigo}.", "errorCode": 404}
+        if endpoint == "matches":
+            return 200, _filtrar_jogos(self.jogos(codigo), params)
+        if endpoint == "standings":
+            return 200, self.classificacao(codigo)
+        return 200, self.gravado[codigo][endpoint]
+
+
+def _filtrar_jogos(payload, params):
+    """Os filtros do /matches da API: dateFrom/dateTo (dia UTC, inclusivos), status e matchday."""
+    jogos = payload["matches"]
+    if "dateFrom" in params:
+        jogos = [j for j in jogos if j["utcDate"][:10] >= params["dateFrom"]]
+    if "dateTo" in params:
+        jogos = [j for j in jogos if j["utcDate"][:10] <= params["dateTo"]]
+    if "status" in params:
+        status = set(params["status"].split(","))
+        jogos = [j for j in jogos if j["status"] in status]
+    if "matchday" in params:
+        jogos = [j for j in jogos if str(j["matchday"]) == params["matchday"]]
+    filtros = {**payload.get("filters", {}), **params}
+    return {**payload, "filters": filtros, "resultSet": {"count": len(jogos)}, "matches": jogos}
+
+
+def _tabela_dos_jogos(tabela_gravada, jogos):
+    """Classificação a partir dos jogos FINISHED (pontos, vitórias, saldo, gols pró), no formato da API."""
+    linhas = {linha["team"]["id"]: {"team": linha["team"], "playedGames": 0, "form": None, "won": 0, "draw": 0,
+                                    "lost": 0, "points": 0, "goalsFor": 0, "goalsAgainst": 0, "goalDifference": 0}
+              for linha in tabela_gravada}
+    for jogo in jogos:
+        if jogo["status"] != "FINISHED":
+            continue
+        gols = jogo["score"]["fullTime"]
+        for lado, pro, contra in (("homeTeam", gols["home"], gols["away"]), ("awayTeam", gols["away"], gols["home"])):
+            linha = linhas.get(jogo[lado]["id"])
+            if linha is None:
+                continue
+            linha["playedGames"] += 1
+            linha["goalsFor"] += pro
+            linha["goalsAgainst"] += contra
+            linha["goalDifference"] += pro - contra
+            resultado = "won" if pro > contra else "draw" if pro == contra else "lost"
+            linha[resultado] += 1
+            linha["points"] += {"won": 3, "draw": 1, "lost": 0}[resultado]
+    ordem = sorted(linhas.values(), key=lambda l: (-l["points"], -l["won"], -l["goalDifference"], -l["goalsFor"]))
+    return [{"position": posicao, **linha} for posicao, linha in enumerate(ordem, start=1)]
+
+
+# ------------------------------------------------------------------------------
+# Servidor HTTP
+# ------------------------------------------------------------------------------
+# Caminho "modelo" para os contadores (/matches/123 e /matches/456 contam juntos)
+_ID_NUMERICO = re.compile(r"/\d+")
+
+
+class _HandlerApiLocal(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive: o pool de conexões do cliente é reaproveitado
+
+    def do_GET(self):
+        servidor = self.server.api_local
+        url = urlsplit(self.path)
+        if url.path.startswith("/_controle/"):
+            self._controle(servidor, url.path)
+            return
+        params = {chave: valores[-1] for chave, valores in parse_qs(url.query).items()}
+        caminho = url.path[len("/v4"):] if url.path.startswith("/v4") else url.path
+        status, payload, cabecalhos = servidor.atender(caminho, params, self.headers)
+        corpo = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        for nome, valor in cabecalhos.items():
+            self.send_header(nome, valor)
+        if status != 304:
+            self.send_header("Content-Type", "application/json;charset=UTF-8")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _controle(self, servidor, caminho):
+        if caminho == "/_controle/estatisticas":
+            corpo = json.dumps(servidor.estatisticas(), ensure_ascii=False).encode("utf-8")
+        elif caminho == "/_controle/zerar":
+            servidor.zerar()
+            corpo = b'{"ok": true}'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass  # Os contadores já contam tudo; log por requisição só atrapalha no teste de carga
+
+
+class ServidorApiLocal:
+    """
+    O dublê em si: um ThreadingHTTPServer numa thread daemon, respondendo a partir
+    de uma Reproducao. A base para o cliente é `servidor.url` (já com o /v4).
+
+    - latencia / variacao: cada resposta espera latencia ± variacao segundos;
+    - cota: requisições por minuto por token (0 = sem limite); estourou, 429 com
+      X-RequestCounter-Reset, igual à API;
+    - taxa_429: fração das requisições que recebe 429 mesmo dentro da cota.
+    """
+
+    def __init__(self, reproducao, porta=0, endereco="127.0.0.1", latencia=0.0, variacao=0.0, cota=0,
+                 taxa_429=0.0, seed=None):
+        self.reproducao = reproducao
+        self.latencia = latencia
+        self.variacao = variacao
+        self.cota = cota
+        self.taxa_429 = taxa_429
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._janelas = {}  # token -> (início da janela de 1 minuto, requisições nela)
+        self.zerar()
+        self._http = ThreadingHTTPServer((endereco, porta), _HandlerApiLocal)
+        self._http.daemon_threads = True
+        self._http.api_local = self
+        self.url = f"http://{endereco}:{self._http.server_address[1]}/v4"
+        self._thread = None
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._http.serve_forever, name="api-local", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+        self._http.shutdown()
+        self._http.server_close()
+
+    def zerar(self):
+        with self._lock:
+            self._contadores = Counter()
+            self._bytes = 0
+            self._inicio = time.time()
+
+    def estatisticas(self):
+        """Requisições por endpoint e status desde o último zerar() (é o que o teste de carga lê)."""
+        with self._lock:
+            por_endpoint = {}
+            for (endpoint, status), n in sorted(self._contadores.items()):
+                por_endpoint.setdefault(endpoint, {})[str(status)] = n
+            por_status = Counter()
+            for (_, status), n in self._contadores.items():
+                por_status[str(status)] += n
+            return {"requisicoes": sum(self._contadores.values()), "por_status": dict(por_status),
+                    "por_endpoint": por_endpoint, "bytes": self._bytes,
+                    "segundos": round(time.time() - self._inicio, 3)}
+
+    def _cota(self, token):
+        """(pode atender?, requisições que sobram no minuto, segundos até zerar)."""
+        agora = time.time()
+        with self._lock:
+            inicio, usadas = self._janelas.get(token, (agora, 0))
+            if agora - inicio >= 60:
+                inicio, usadas = agora, 0
+            atende = not self.cota or usadas < self.cota
+            if atende:
+                usadas += 1
+            self._janelas[token] = (inicio, usadas)
+        restante = max(self.cota - usadas, 0) if self.cota else 999
+        return atende, restante, max(int(60 - (agora - inicio)), 1)
+
+    def atender(self, caminho, params, cabecalhos):
+        """(status, payload ou None, cabecalhos da resposta) de uma requisição."""
+        if self.latencia or self.variacao:
+            time.sleep(max(self.latencia + self._rng.uniform(-self.variacao, self.variacao), 0.0))
+        endpoint = _ID_NUMERICO.sub("/{id}", caminho)
+        atende, restante, reset = self._cota(cabecalhos.get("X-Auth-Token", ""))
+        resposta = {"X-Requests-Available-Minute": str(restante), "X-RequestCounter-Reset": str(reset)}
+        with self._lock:
+            sorteou_429 = self.taxa_429 and self._rng.random() < self.taxa_429
+        if not atende or sorteou_429:
+            status, payload = 429, {"message": f"You reached your request limit. Wait {reset} seconds.",
+                                    "errorCode": 429}
+        else:
+            status, payload = self.reproducao.responder(caminho, params)
+            if status == 200:
+                etag = '"' + hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+                resposta["ETag"] = etag
+                if cabecalhos.get("If-None-Match") == etag:
+                    status, payload = 304, None
+        with self._lock:
+            self._contadores[(endpoint, status)] += 1
+            if payload is not None:
+                self._bytes += len(json.dumps(payload))
+        return status, payload, resposta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grava respostas da football-data.org e serve uma cópia local.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    gravar = comandos.add_parser("gravar", help="Grava standings/matches/teams (da API ou sintéticos).")
+    gravar.add_argument("--pasta", default="dados/gravacao")
+    gravar.add_argument("--competicoes", nargs="+", default=["BSA"], help="Códigos da football-data.org.")
+    gravar.add_argument("--temporada", type=int, default=None, help="Temporada (padrão: a atual).")
+    gravar.add_argument("--artilheiros", action="store_true", help="Grava também o /scorers.")
+    gravar.add_argument("--sintetico", action="store_true", help="Temporada sintética em vez da API (sem chave).")
+    gravar.add_argument("--rodadas-jogadas", type=int, default=19, help="Com --sintetico: rodadas já finalizadas.")
+
+    servir = comandos.add_parser("servir", help="Sobe o dublê da API a partir de uma gravação.")
+    servir.add_argument("--pasta", default="dados/gravacao")
+    servir.add_argument("--porta", type=int, default=8765)
+    servir.add_argument("--endereco", default="127.0.0.1")
+    servir.add_argument("--latencia", type=float, default=0.0, help="Segundos de espera por resposta.")
+    servir.add_argument("--variacao", type=float, default=0.0, help="Variação (±) da latência, em segundos.")
+    servir.add_argument("--cota", type=int, default=0, help="Requisições por minuto por token (0 = sem limite).")
+    servir.add_argument("--taxa-429", type=float, default=0.0, help="Fração de respostas 429 sorteadas.")
+    servir.add_argument("--congelar", action="store_true", help="Sem linha do tempo: serve a gravação parada.")
+    servir.add_argument("--inicio-em", type=float, default=INICIO_EM, help="Segundos até a próxima rodada apitar.")
+    servir.add_argument("--duracao-jogo", type=float, default=DURACAO_JOGO, help="Segundos de cada jogo.")
+    servir.add_argument("--intervalo-rodadas", type=float, default=INTERVALO_RODADAS,
+                        help="Segundos entre o fim de uma rodada e o apito da seguinte.")
+    servir.add_argument("--seed", type=int, default=0, help="Semente dos placares e das falhas sorteadas.")
+    args = parser.parse_args(argv)
+
+    if args.comando == "gravar":
+        if args.sintetico:
+            gravados = {}
+            for codigo in args.competicoes:
+                gravados.update(gravar_sintetico(args.pasta, codigo, args.rodadas_jogadas))
+        else:
+            api_key = os.environ.get("FOOTBALL_DATA_API_KEY")
+            if not api_key:
+                parser.error("defina a variável de ambiente FOOTBALL_DATA_API_KEY (ou use --sintetico)")
+            from brasileirao.api import BASE_URL, ClienteFootballData
+            cliente = ClienteFootballData(api_key, os.environ.get("FOOTBALL_DATA_BASE_URL", BASE_URL))
+            gravados = gravar_api(cliente, args.competicoes, args.pasta, args.temporada, args.artilheiros)
+        for codigo, endpoints in gravados.items():
+            print(f"{codigo}: {', '.join(sorted(endpoints))}")
+        print(f"Gravação em {args.pasta}")
+        return 0
+
+    reproducao = Reproducao(args.pasta, evoluir=not args.congelar, inicio_em=args.inicio_em,
+                            duracao_jogo=args.duracao_jogo, intervalo_rodadas=args.intervalo_rodadas, seed=args.seed)
+    servidor = ServidorApiLocal(reproducao, args.porta, args.endereco, args.latencia, args.variacao, args.cota,
+                                args.taxa_429, args.seed).iniciar()
+    print(f"Dublê da API em {servidor.url} (competições: {', '.join(reproducao.gravado)})")
+    print(f"Use FOOTBALL_DATA_BASE_URL={servidor.url}. Contadores em "
+          f"{servidor.url[:-len('/v4')]}/_controle/estatisticas. Ctrl+C para sair.")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        servidor.parar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
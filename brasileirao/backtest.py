@@ -0,0 +1,331 @@
+# ==============================================================================
+# BACKTEST WALK-FORWARD DO MODELO DE PREVISÃO
+# ==============================================================================
+# Quão bem o modelo acerta de verdade? Aqui cada temporada é "reprisada" rodada a
+# rodada: antes de cada rodada as forças saem SÓ dos jogos que começaram antes do
+# primeiro jogo dela (nada do futuro vaza), os jogos da rodada são previstos com o
+# mesmo prever_jogos_lote do snapshot e a previsão é comparada com o resultado.
+# Saem log-loss, Brier e a curva de calibração ("quando o modelo diz 60%, acontece
+# 60% das vezes?").
+#
+# Refazer o calcular_forca_times do zero a cada rodada seria varrer a temporada
+# 38 vezes. Só que o modelo de médias depende apenas de SOMAS por time (peso, gols
+# feitos e sofridos, em casa e fora): cada jogo entra uma vez na rodada em que
+# passa a contar, e um cumsum dá as somas acumuladas de todas as rodadas de uma
+# vez. O Dixon-Coles (que não é soma) é refeito a cada rodada, partindo do ajuste
+# da rodada anterior (warm start). Temporadas x configurações vão para um pool de
+# processos, então testar vários pesos em dez anos de histórico leva segundos.
+#
+#     python -m brasileirao.backtest --competicoes BSA --temporadas 2015-2024 --pesos-historico 0 0.25 0.5 1
+#     python -m brasileirao.backtest --sintetico 10 --modelos medias dixon_coles   # sem histórico baixado
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from brasileirao.dixon_coles import calcular_forca_dixon_coles
+from brasileirao.historico import PASTA_HISTORICO, _intervalo_temporadas, carregar_historico
+from brasileirao.metricas import cronometrado
+from brasileirao.modelo import prever_jogos_lote
+from brasileirao.snapshot import MODELOS
+
+RESULTADOS = ("Casa", "Empate", "Fora")
+COLUNAS_FORCA = ['Ataque_Casa', 'Ataque_Fora', 'Defesa_Casa', 'Defesa_Fora']
+COLUNAS_PREVISAO = ['ID_Jogo', 'Rodada', 'Data', 'Home_ID', 'Away_ID', 'Gols_Home', 'Gols_Away', 'Resultado',
+                    'Lambda_Casa', 'Lambda_Fora', 'Prob_Casa', 'Prob_Empate', 'Prob_Fora']
+# Faixas da curva de calibração (0-10%, 10-20%, ...)
+N_FAIXAS = 10
+# Probabilidade zero num resultado que aconteceu daria log-loss infinito
+PROB_MINIMA = 1e-12
+
+
+def _instantes(datas):
+    """Datas (com ou sem fuso) -> datetime64 em UTC, para comparar com searchsorted."""
+    return pd.to_datetime(datas, utc=True).dt.tz_localize(None).to_numpy()
+
+
+def _somas_acumuladas(jogos, ids, cortes):
+    """
+    Somas do modelo de médias ANTES de cada corte: array (n_rodadas, n_times, 6) com
+    peso, gols feitos e gols sofridos em casa, depois os mesmos três fora.
+    Um jogo entra no "bloco" da primeira rodada cujo corte é posterior a ele; o
+    cumsum nos blocos vira a soma de tudo o que começou antes de cada corte.
+    """
+    bloco = np.searchsorted(cortes, _instantes(jogos['Data']), side='right')
+    conta = bloco < len(cortes)  # Jogo depois do último corte não treina ninguém
+    bloco = bloco[conta]
+    casa = ids.get_indexer(jogos['Home_ID'])[conta]
+    fora = ids.get_indexer(jogos['Away_ID'])[conta]
+    peso = jogos['Peso'].to_numpy(dtype=float)[conta]
+    gols_casa = jogos['Gols_Home'].to_numpy(dtype=float)[conta]
+    gols_fora = jogos['Gols_Away'].to_numpy(dtype=float)[conta]
+
+    somas = np.zeros((len(cortes), len(ids), 6))
+    for estatistica, (lado, valor) in enumerate(((casa, peso), (casa, peso * gols_casa), (casa, peso * gols_fora),
+                                                 (fora, peso), (fora, peso * gols_fora), (fora, peso * gols_casa))):
+        np.add.at(somas, (bloco, lado, estatistica), valor)
+    return somas.cumsum(axis=0)
+
+
+def _forcas_por_rodada(somas):
+    """
+    As contas do calcular_forca_times, para todas as rodadas de uma vez:
+    (forcas (n_rodadas, n_times, 4) na ordem de COLUNAS_FORCA, media_casa, media_fora).
+    Time sem jogo (em casa ou fora) fica com força 1, como no fillna(1) de lá.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        peso_total = somas[:, :, 0].sum(axis=1)
+        media_casa = somas[:, :, 1].sum(axis=1) / peso_total
+        media_fora = somas[:, :, 2].sum(axis=1) / peso_total
+        mc, mf = media_casa[:, None], media_fora[:, None]
+        forcas = np.stack([
+            somas[..., 1] / somas[..., 0] / mc,  # Ataque_Casa: gols feitos em casa / média dos mandantes
+            somas[..., 4] / somas[..., 3] / mf,  # Ataque_Fora
+            somas[..., 2] / somas[..., 0] / mf,  # Defesa_Casa: gols sofridos em casa / média dos visitantes
+            somas[..., 5] / somas[..., 3] / mc,  # Defesa_Fora
+        ], axis=-1)
+    return np.where(np.isnan(forcas), 1.0, forcas), media_casa, media_fora
+
+
+@cronometrado()
+def backtest_temporada(df_jogos, df_historico=None, modelo="medias", peso_historico=0.5):
+    """
+    Previsões walk-forward de uma temporada (jogos finalizados, colunas do achatar_jogos).
+    Cada rodada é prevista com as forças dos jogos que começaram antes do primeiro
+    jogo dela, mais o df_historico (temporadas anteriores, com peso_historico no
+    modelo de médias; no Dixon-Coles quem pesa é o decaimento por tempo).
+    Time sem dados entra com força média, como no Monte Carlo do snapshot.
+
+    Devolve um DataFrame com COLUNAS_PREVISAO, uma linha por jogo previsto. Rodadas
+    sem jogo nenhum antes (primeira rodada sem histórico) ficam de fora.
+    """
+    jogos = df_jogos.dropna(subset=['Rodada', 'Gols_Home', 'Gols_Away'])
+    if jogos.empty:
+        return pd.DataFrame(columns=COLUNAS_PREVISAO)
+    historico = df_historico if df_historico is not None and not df_historico.empty else None
+
+    # Ordem do walk-forward = horário do primeiro jogo de cada rodada (rodada antecipada
+    # ou adiada não faz o modelo enxergar o futuro)
+    cortes = pd.Series(_instantes(jogos['Data']), index=jogos.index).groupby(jogos['Rodada']).min().sort_values()
+    ids_temporada = pd.Index(np.union1d(jogos['Home_ID'].unique(), jogos['Away_ID'].unique()), name='ID')
+    jogos_por_rodada = dict(list(jogos.groupby('Rodada')))
+
+    if modelo == "medias":
+        partes_treino = [jogos.assign(Peso=1.0)]
+        if historico is not None:
+            partes_treino.append(historico.assign(Peso=peso_historico))
+        treino = pd.concat(partes_treino, ignore_index=True)
+        ids = ids_temporada.union(pd.Index(treino['Home_ID'].unique())).union(pd.Index(treino['Away_ID'].unique()))
+        forcas, medias_casa, medias_fora = _forcas_por_rodada(_somas_acumuladas(treino, ids, cortes.to_numpy()))
+        posicoes = ids.get_indexer(ids_temporada)
+    elif modelo != "dixon_coles":
+        raise ValueError(f"modelo desconhecido: {modelo!r} (use {' ou '.join(MODELOS)})")
+
+    instantes = _instantes(jogos['Data'])
+    ajuste = None
+    partes = []
+    for k, (rodada, corte) in enumerate(cortes.items()):
+        if modelo == "medias":
+            if not np.isfinite(medias_casa[k]):
+                continue  # Nada antes desta rodada: ainda não há modelo
+            forcas_rodada = pd.DataFrame(forcas[k][posicoes], index=ids_temporada, columns=COLUNAS_FORCA)
+            media_casa, media_fora, rho = medias_casa[k], medias_fora[k], 0.0
+        else:
+            forcas_rodada, media_casa, media_fora, ajuste = calcular_forca_dixon_coles(
+                jogos[instantes < corte], historico, ids_times=ids_temporada, anterior=ajuste)
+            if forcas_rodada is None:
+                continue
+            forcas_rodada, rho = forcas_rodada.reindex(ids_temporada).fillna(1), ajuste.rho
+        da_rodada = jogos_por_rodada[rodada]
+        previsoes, _ = prever_jogos_lote(da_rodada, forcas_rodada, media_casa, media_fora, rho=rho)
+        partes.append(da_rodada.join(previsoes))
+
+    if not partes:
+        return pd.DataFrame(columns=COLUNAS_PREVISAO)
+    previsoes = pd.concat(partes)
+    saldo = np.sign(previsoes['Gols_Home'].to_numpy() - previsoes['Gols_Away'].to_numpy()).astype(int)
+    previsoes['Resultado'] = np.array(["Fora", "Empate", "Casa"])[saldo + 1]
+    return previsoes[COLUNAS_PREVISAO].reset_index(drop=True)
+
+
+# ------------------------------------------------------------------------------
+# Notas: log-loss, Brier e calibração
+# ------------------------------------------------------------------------------
+def _probabilidades(previsoes):
+    """(matriz n x 3 com Prob_Casa/Empate/Fora, matriz n x 3 com 1 no resultado que aconteceu)."""
+    probs = previsoes[[f"Prob_{r}" for r in RESULTADOS]].to_numpy(dtype=float)
+    observado = (previsoes['Resultado'].to_numpy()[:, None] == np.array(RESULTADOS)).astype(float)
+    return probs, observado
+
+
+def pontuar(previsoes):
+    """
+    Notas de um conjunto de previsões (saída do backtest_temporada):
+      - Log_Loss: -média do log da probabilidade do que aconteceu (chute 1/3 = 1.099);
+      - Brier: média da soma dos erros quadráticos dos 3 resultados (chute 1/3 = 0.667);
+      - Acerto: fração de jogos em que o resultado mais provável aconteceu;
+      - Erro_Calibracao: distância média entre probabilidade prevista e frequência (ECE).
+    Menor é melhor, menos no Acerto.
+    """
+    probs, observado = _probabilidades(previsoes)
+    if not len(probs):
+        return pd.Series({'Jogos': 0, 'Log_Loss': np.nan, 'Brier': np.nan, 'Acerto': np.nan,
+                          'Erro_Calibracao': np.nan})
+    curva = curva_calibracao(previsoes)
+    return pd.Series({
+        'Jogos': len(probs),
+        'Log_Loss': -np.log(np.clip((probs * observado).sum(axis=1), PROB_MINIMA, None)).mean(),
+        'Brier': ((probs - observado) ** 2).sum(axis=1).mean(),
+        'Acerto': (probs.argmax(axis=1) == observado.argmax(axis=1)).mean(),
+        'Erro_Calibracao': (curva['Jogos'] * (curva['Prob_Media'] - curva['Frequencia']).abs()).sum()
+                           / curva['Jogos'].sum(),
+    })
+
+
+def curva_calibracao(previsoes, n_faixas=N_FAIXAS):
+    """
+    Curva de calibração dos três resultados: para cada faixa de probabilidade
+    prevista, a probabilidade média e a frequência com que o resultado aconteceu.
+    Modelo bem calibrado: Prob_Media ~ Frequencia em todas as linhas.
+    """
+    probs, observado = _probabilidades(previsoes)
+    faixa = np.minimum((probs * n_faixas).astype(int), n_faixas - 1)
+    curva = pd.DataFrame({
+        'Resultado': np.repeat(np.array(RESULTADOS)[None, :], len(probs), axis=0).ravel(),
+        'Faixa': faixa.ravel(), 'Prob': probs.ravel(), 'Aconteceu': observado.ravel(),
+    }).groupby(['Resultado', 'Faixa']).agg(
+        Prob_Media=('Prob', 'mean'), Frequencia=('Aconteceu', 'mean'), Jogos=('Prob', 'size'))
+    curva = curva.reset_index()
+    curva['Faixa'] = [f"{f / n_faixas:.0%}-{(f + 1) / n_faixas:.0%}" for f in curva['Faixa']]
+    return curva
+
+
+def resumir(previsoes, por=('Configuracao',)):
+    """pontuar() por grupo (configuração, temporada...): uma linha por grupo."""
+    return previsoes.groupby(list(por), sort=False)[previsoes.columns.tolist()].apply(pontuar).astype(
+        {'Jogos': int})
+
+
+# ------------------------------------------------------------------------------
+# Várias temporadas x várias configurações, em paralelo
+# ------------------------------------------------------------------------------
+def rotulo_configuracao(config):
+    """Nome curto de uma configuração ({'modelo': ..., 'peso_historico': ...}) para as tabelas."""
+    if config.get("modelo", "medias") == "medias":
+        return f"medias (peso histórico {config.get('peso_historico', 0.5):g})"
+    return config["modelo"]
+
+
+def _rodar_tarefa(competicao, temporada, df_jogos, df_historico, config):
+    # Função de módulo (e não closure) porque vai para o pool de processos
+    previsoes = backtest_temporada(df_jogos, df_historico, **config)
+    return previsoes.assign(competicao=competicao, temporada=temporada, Configuracao=rotulo_configuracao(config))
+
+
+def rodar_backtest(df_jogos, temporadas=None, configuracoes=({},), temporadas_anteriores=1, n_processos=None):
+    """
+    Backtest de cada (competição, temporada) x configuração. df_jogos são jogos
+    finalizados com as colunas competicao e temporada (o que o carregar_historico
+    devolve); as `temporadas_anteriores` de cada uma entram como histórico.
+    Com n_processos > 1 as tarefas vão para um pool de processos.
+
+    Devolve todas as previsões num DataFrame só (colunas competicao, temporada e
+    Configuracao a mais), pronto para o resumir().
+    """
+    tarefas = []
+    por_temporada = dict(list(df_jogos.groupby(['competicao', 'temporada'])))
+    for (competicao, temporada), jogos in sorted(por_temporada.items()):
+        if temporadas is not None and temporada not in temporadas:
+            continue
+        anteriores = [por_temporada[(competicao, t)] for t in range(temporada - temporadas_anteriores, temporada)
+                      if (competicao, t) in por_temporada]
+        historico = pd.concat(anteriores, ignore_index=True) if anteriores else None
+        for config in configuracoes:
+            tarefas.append((competicao, temporada, jogos, historico, dict(config)))
+
+    if n_processos and n_processos > 1 and len(tarefas) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_processos, len(tarefas))) as pool:
+            resultados = list(pool.map(_rodar_tarefa, *zip(*tarefas)))
+    else:
+        resultados = [_rodar_tarefa(*tarefa) for tarefa in tarefas]
+    if not resultados:
+        return pd.DataFrame(columns=COLUNAS_PREVISAO + ['competicao', 'temporada', 'Configuracao'])
+    return pd.concat(resultados, ignore_index=True)
+
+
+def _jogos_sinteticos(n_temporadas, seed=2024):
+    """Temporadas completas do sintetico.py no formato do carregar_historico."""
+    from brasileirao.etl import achatar_jogos
+    from brasileirao.sintetico import gerar_temporadas
+    temporadas = gerar_temporadas(n_temporadas, rodadas_jogadas=38, seed=seed)
+    return pd.concat([achatar_jogos(matches).assign(competicao="BSA", temporada=ano)
+                      for ano, _, matches in temporadas], ignore_index=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest walk-forward (rodada a rodada) do modelo de previsão.")
+    parser.add_argument("--competicoes", nargs="+", default=["BSA"], help="Códigos da football-data.org.")
+    parser.add_argument("--temporadas", type=_intervalo_temporadas, default=None,
+                        help="Temporadas avaliadas, ex.: 2015-2024 (padrão: todas as do histórico).")
+    parser.add_argument("--historico", default=PASTA_HISTORICO, help="Pasta do histórico particionado.")
+    parser.add_argument("--sintetico", type=int, default=None, metavar="N",
+                        help="Usa N temporadas sintéticas em vez do histórico (para testar sem dados).")
+    parser.add_argument("--modelos", nargs="+", choices=MODELOS, default=["medias"], help="Modelos avaliados.")
+    parser.add_argument("--pesos-historico", nargs="+", type=float, default=[0.5],
+                        help="Pesos do histórico testados no modelo de médias.")
+    parser.add_argument("--temporadas-anteriores", type=int, default=1,
+                        help="Quantas temporadas passadas entram nas forças (0 desliga).")
+    parser.add_argument("--a-partir-da-rodada", type=int, default=1,
+                        help="Só conta na nota as rodadas a partir desta (as primeiras têm pouca informação).")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(), help="Tarefas ao mesmo tempo (1 = sem pool).")
+    parser.add_argument("--por-temporada", action="store_true", help="Mostra as notas de cada temporada.")
+    parser.add_argument("--saida", default=None, help="Grava previsoes.csv, resumo.csv e calibracao.csv nesta pasta.")
+    args = parser.parse_args(argv)
+
+    if args.sintetico:
+        jogos = _jogos_sinteticos(args.sintetico)
+    else:
+        jogos = carregar_historico(args.competicoes, pasta=args.historico,
+                                   colunas=["ID_Jogo", "Rodada", "Data", "Home_ID", "Away_ID", "Gols_Home", "Gols_Away",
+                                            "competicao", "temporada"])
+        if jogos.empty:
+            parser.error(f"nenhum jogo em {args.historico}: rode o backfill (python -m brasileirao.historico) "
+                         "ou use --sintetico")
+
+    configuracoes = [{"modelo": "medias", "peso_historico": peso} for peso in args.pesos_historico
+                     if "medias" in args.modelos]
+    configuracoes += [{"modelo": modelo} for modelo in args.modelos if modelo != "medias"]
+
+    inicio = time.perf_counter()
+    previsoes = rodar_backtest(jogos, args.temporadas, configuracoes, args.temporadas_anteriores, args.processos)
+    duracao = time.perf_counter() - inicio
+    avaliadas = previsoes[previsoes['Rodada'] >= args.a_partir_da_rodada]
+    if avaliadas.empty:
+        print("Nenhum jogo previsto (faltam temporadas ou rodadas).")
+        return 1
+
+    resumo = resumir(avaliadas)
+    pd.set_option("display.width", 140)
+    print(resumo.sort_values('Log_Loss').round(4).to_string())
+    if args.por_temporada:
+        print()
+        print(resumir(avaliadas, por=('Configuracao', 'competicao', 'temporada')).round(4).to_string())
+    print(f"\n{avaliadas['temporada'].nunique()} temporada(s), {len(configuracoes)} configuração(ões), "
+          f"{len(avaliadas):,} previsões em {duracao:.1f}s. Referência do chute 1/3: log-loss 1.0986, Brier 0.6667.")
+
+    if args.saida:
+        os.makedirs(args.saida, exist_ok=True)
+        previsoes.to_csv(os.path.join(args.saida, "previsoes.csv"), index=False)
+        resumo.to_csv(os.path.join(args.saida, "resumo.csv"))
+        calibracao = avaliadas.groupby('Configuracao', sort=False)[avaliadas.columns.tolist()].apply(curva_calibracao)
+        calibracao.reset_index(level=0).to_csv(os.path.join(args.saida, "calibracao.csv"), index=False)
+        print(f"Tabelas gravadas em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
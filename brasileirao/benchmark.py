@@ -0,0 +1,303 @@
+# ==============================================================================
+# BENCHMARK OFFLINE DO PIPELINE (SEM API, SEM STREAMLIT)
+# ==============================================================================
+# Roda cada etapa do pipeline em cima de temporadas sintéticas (ver sintetico.py)
+# e mede tempo, vazão (itens/s) e pico de memória. Com uma baseline gravada, o
+# comando termina com código 1 se alguma etapa ficar mais lenta (ou mais gorda)
+# que a tolerância: dá para provar uma otimização, ou pegar uma piora, sem rede.
+#
+# Uso:
+#     python -m brasileirao.benchmark                       # compara com a baseline
+#     python -m brasileirao.benchmark --salvar-baseline     # grava uma baseline nova
+#     python -m brasileirao.benchmark --cenarios temporada grande --repeticoes 3
+#
+# A baseline depende da máquina: gere de novo quando trocar o ambiente de CI.
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from brasileirao import graficos
+from brasileirao.backtest import backtest_temporada
+from brasileirao.dixon_coles import calcular_forca_dixon_coles
+from brasileirao.etl import achatar_jogos, process_data
+from brasileirao.forma import montar_confrontos, montar_forma
+from brasileirao.modelo import calcular_forca_times, prever_jogo, prever_jogos_lote
+from brasileirao.simulacao import simular_temporada
+from brasileirao.sintetico import gerar_temporadas
+from brasileirao.snapshot import carregar_snapshot, montar_snapshot, salvar_snapshot
+
+ARQUIVO_BASELINE = os.path.join("benchmarks", "baseline.json")
+
+# Cada cenário é um tamanho de "mundo". O "grande" passa de 10 mil jogos
+# (102 clubes); lá o Monte Carlo roda menos vezes para caber na memória.
+CENARIOS = {
+    "temporada": dict(n_times=20, rodadas_jogadas=19, temporadas_anteriores=0, n_simulacoes=20_000),
+    "inicio": dict(n_times=20, rodadas_jogadas=3, temporadas_anteriores=1, n_simulacoes=20_000),
+    "multi_temporada": dict(n_times=20, rodadas_jogadas=19, temporadas_anteriores=10, n_simulacoes=20_000),
+    "grande": dict(n_times=102, rodadas_jogadas=101, temporadas_anteriores=0, n_simulacoes=500),
+}
+
+# Quantos jogos agendados passam pelo prever_jogo um a um (o app chama jogo a jogo em alguns lugares)
+JOGOS_PREVER_UM_A_UM = 200
+# Abaixo disso a diferença de tempo/memória é ruído e não conta como regressão
+PISO_TEMPO_S = 0.020
+PISO_MEMORIA_MB = 1.0
+
+
+def preparar_cenario(nome, seed=2024):
+    """Gera os payloads do cenário uma vez só (fica fora da medição)."""
+    config = CENARIOS[nome]
+    temporadas = gerar_temporadas(config["temporadas_anteriores"] + 1, n_times=config["n_times"],
+                                  rodadas_jogadas=config["rodadas_jogadas"], seed=seed)
+    _, standings, matches = temporadas[-1]
+    return {
+        "config": config,
+        "standings": standings,
+        "matches": matches,
+        "matches_anteriores": [m for _, _, m in temporadas[:-1]],
+    }
+
+
+# ------------------------------------------------------------------------------
+# ETAPAS: cada uma recebe o contexto, guarda no contexto o que as próximas usam
+# e devolve quantos "itens" processou (para a vazão).
+# ------------------------------------------------------------------------------
+def etapa_process_data(ctx):
+    ctx["df_tabela"], ctx["df_finalizados"], ctx["df_agendados"], ctx["df_time_jogos"], ctx["df_times"] = \
+        process_data(ctx["standings"], ctx["matches"])
+    return len(ctx["matches"]["matches"])
+
+
+def etapa_forma(ctx):
+    """Confronto direto + série de forma de todos os times (uma vez por snapshot)."""
+    montar_confrontos(ctx["df_time_jogos"])
+    montar_forma(ctx["df_time_jogos"])
+    return len(ctx["df_time_jogos"])
+
+
+def etapa_historico(ctx):
+    if not ctx["matches_anteriores"]:
+        ctx["df_historico"] = None
+        return 0
+    ctx["df_historico"] = pd.concat([achatar_jogos(m) for m in ctx["matches_anteriores"]], ignore_index=True)
+    return len(ctx["df_historico"])
+
+
+def etapa_forcas(ctx):
+    ctx["forcas"], ctx["media_casa"], ctx["media_fora"] = calcular_forca_times(ctx["df_finalizados"], ctx["df_historico"])
+    historico = 0 if ctx["df_historico"] is None else len(ctx["df_historico"])
+    return len(ctx["df_finalizados"]) + historico
+
+
+def etapa_dixon_coles(ctx):
+    """Ajuste completo, partindo do zero (é o que o dashboard faz sem snapshot anterior)."""
+    *_, ctx["ajuste"] = calcular_forca_dixon_coles(ctx["df_finalizados"], ctx["df_historico"],
+                                                   ids_times=ctx["df_tabela"]["ID"])
+    return len(ctx["df_finalizados"]) + (0 if ctx["df_historico"] is None else len(ctx["df_historico"]))
+
+
+def etapa_dixon_coles_warm(ctx):
+    """Refit partindo do ajuste anterior (o job com snapshot anterior no disco)."""
+    calcular_forca_dixon_coles(ctx["df_finalizados"], ctx["df_historico"],
+                               ids_times=ctx["df_tabela"]["ID"], anterior=ctx["ajuste"])
+    return len(ctx["df_finalizados"]) + (0 if ctx["df_historico"] is None else len(ctx["df_historico"]))
+
+
+def etapa_prever_jogos_lote(ctx):
+    forcas_completas = ctx["forcas"].reindex(ctx["df_tabela"]["ID"]).fillna(1)
+    ctx["df_previsoes"], ctx["placares"] = prever_jogos_lote(
+        ctx["df_agendados"], forcas_completas, ctx["media_casa"], ctx["media_fora"])
+    return len(ctx["df_agendados"])
+
+
+def etapa_prever_jogo(ctx):
+    jogos = ctx["df_agendados"].head(JOGOS_PREVER_UM_A_UM)
+    for id_casa, id_fora in zip(jogos["Home_ID"], jogos["Away_ID"]):
+        prever_jogo(id_casa, id_fora, ctx["forcas"], ctx["media_casa"], ctx["media_fora"])
+    return len(jogos)
+
+
+def etapa_backtest(ctx):
+    """Walk-forward das rodadas já jogadas (modelo de médias, somas acumuladas por rodada)."""
+    previsoes = backtest_temporada(ctx["df_finalizados"], ctx["df_historico"])
+    return len(previsoes)
+
+
+def etapa_simular_temporada(ctx):
+    n_simulacoes = ctx["config"]["n_simulacoes"]
+    ctx["projecao"], ctx["posicoes"] = simular_temporada(
+        ctx["df_tabela"], ctx["df_agendados"], ctx["placares"], n_simulacoes=n_simulacoes, seed=0)
+    return n_simulacoes
+
+
+def etapa_graficos(ctx):
+    """Todos os gráficos do Panorama + o Raio-X do líder (o que um usuário vê numa visita)."""
+    df_tabela = ctx["df_tabela"]
+    lider = df_tabela["ID"].iloc[0]
+    jogos_lider = ctx["df_time_jogos"].loc[[lider]]
+    previsoes = ctx["df_agendados"].join(ctx["df_previsoes"]).sort_values(["Rodada", "Data"])
+    figuras = [graficos.grafico_pontos(df_tabela), graficos.grafico_eficiencia(df_tabela)]
+    # Barras de probabilidade de todos os jogos restantes numa figura só
+    figuras.append(graficos.grafico_probabilidades(previsoes))
+    figuras += [graficos.grafico_gols_rodada(jogos_lider), graficos.grafico_tempos(jogos_lider),
+                graficos.grafico_radar_mando(jogos_lider), graficos.grafico_posicoes(ctx["posicoes"], lider)]
+    return len(figuras)
+
+
+def etapa_snapshot_io(ctx):
+    """Grava e relê o snapshot Arrow (o que o job e o dashboard fazem a cada atualização)."""
+    if "snapshot" not in ctx:
+        # Monto uma vez só com poucas simulações: aqui o que interessa é o disco
+        ctx["snapshot"] = montar_snapshot(ctx["standings"], ctx["matches"], n_simulacoes=1_000, seed=0)
+    pasta = tempfile.mkdtemp(prefix="bench-snapshot-")
+    try:
+        salvar_snapshot(ctx["snapshot"], pasta)
+        lido = carregar_snapshot(pasta)
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+    return sum(len(getattr(lido, nome)) for nome in ("tabela", "finalizados", "agendados", "time_jogos"))
+
+
+ETAPAS = {
+    "process_data": etapa_process_data,
+    "forma": etapa_forma,
+    "historico": etapa_historico,
+    "calcular_forca_times": etapa_forcas,
+    "dixon_coles": etapa_dixon_coles,
+    "dixon_coles_warm": etapa_dixon_coles_warm,
+    "prever_jogos_lote": etapa_prever_jogos_lote,
+    "prever_jogo": etapa_prever_jogo,
+    "backtest": etapa_backtest,
+    "simular_temporada": etapa_simular_temporada,
+    "graficos": etapa_graficos,
+    "snapshot_io": etapa_snapshot_io,
+}
+
+
+def medir_etapa(funcao, ctx, repeticoes):
+    """
+    Uma rodada de aquecimento (imports preguiçosos, caches do Plotly...), depois
+    `repeticoes` medições de tempo SEM tracemalloc (ele deixa tudo mais lento) e
+    uma última rodada COM tracemalloc só para o pico de memória.
+    """
+    itens = funcao(ctx)
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(ctx)
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        funcao(ctx)
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    mediana = statistics.median(tempos)
+    return {
+        "tempo_mediano_s": round(mediana, 6),
+        "tempo_min_s": round(min(tempos), 6),
+        "itens": itens,
+        "vazao_itens_s": round(itens / mediana, 1) if mediana > 0 else None,
+        "pico_memoria_mb": round(pico / 2 ** 20, 3),
+    }
+
+
+def rodar(cenarios, repeticoes=5, seed=2024):
+    """Roda os cenários pedidos e devolve {cenario: {etapa: medidas}}."""
+    resultados = {}
+    for nome in cenarios:
+        ctx = preparar_cenario(nome, seed)
+        resultados[nome] = {etapa: medir_etapa(funcao, ctx, repeticoes) for etapa, funcao in ETAPAS.items()}
+    return resultados
+
+
+def comparar(resultados, baseline, tolerancia=0.5, tolerancia_memoria=0.25):
+    """Lista de regressões (texto) em relação à baseline. Etapa sem baseline não conta."""
+    regressoes = []
+    for cenario, etapas in resultados.items():
+        for etapa, medida in etapas.items():
+            base = baseline.get(cenario, {}).get(etapa)
+            if base is None:
+                continue
+            # O mínimo é o número mais estável entre execuções (o resto é interferência da máquina)
+            tempo, tempo_base = medida["tempo_min_s"], base["tempo_min_s"]
+            if tempo > tempo_base * (1 + tolerancia) and tempo - tempo_base > PISO_TEMPO_S:
+                regressoes.append(f"{cenario}/{etapa}: tempo {tempo_base:.4f}s -> {tempo:.4f}s "
+                                  f"({tempo / tempo_base - 1:+.0%})")
+            memoria, memoria_base = medida["pico_memoria_mb"], base["pico_memoria_mb"]
+            if memoria > memoria_base * (1 + tolerancia_memoria) and memoria - memoria_base > PISO_MEMORIA_MB:
+                regressoes.append(f"{cenario}/{etapa}: memória {memoria_base:.1f}MB -> {memoria:.1f}MB "
+                                  f"({memoria / memoria_base - 1:+.0%})")
+    return regressoes
+
+
+def imprimir(resultados, baseline=None):
+    baseline = baseline or {}
+    for cenario, etapas in resultados.items():
+        print(f"\n== {cenario} ==")
+        print(f"{'etapa':<22}{'mediana':>11}{'vs base':>9}{'itens':>9}{'itens/s':>13}{'pico MB':>10}")
+        for etapa, m in etapas.items():
+            base = baseline.get(cenario, {}).get(etapa)
+            delta = f"{m['tempo_mediano_s'] / base['tempo_mediano_s'] - 1:+.0%}" if base and base["tempo_mediano_s"] else "-"
+            vazao = f"{m['vazao_itens_s']:,.0f}" if m["vazao_itens_s"] else "-"
+            print(f"{etapa:<22}{m['tempo_mediano_s'] * 1000:>9.1f}ms{delta:>9}{m['itens']:>9}{vazao:>13}"
+                  f"{m['pico_memoria_mb']:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark offline do pipeline com temporadas sintéticas.")
+    parser.add_argument("--cenarios", nargs="+", choices=list(CENARIOS), default=list(CENARIOS))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--baseline", default=ARQUIVO_BASELINE, help="JSON com os números de referência.")
+    parser.add_argument("--salvar-baseline", action="store_true", help="Grava os resultados como a nova baseline.")
+    parser.add_argument("--tolerancia", type=float, default=0.5, help="Piora de tempo aceita (0.5 = 50%%).")
+    parser.add_argument("--tolerancia-memoria", type=float, default=0.25, help="Piora de pico de memória aceita.")
+    parser.add_argument("--saida", help="Grava os resultados desta execução em JSON.")
+    args = parser.parse_args(argv)
+
+    resultados = rodar(args.cenarios, args.repeticoes, args.seed)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.salvar_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    imprimir(resultados, baseline)
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+    if args.salvar_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+        print(f"\nBaseline gravada em {args.baseline}")
+        return 0
+
+    if not baseline:
+        print(f"\nSem baseline em {args.baseline}: rode com --salvar-baseline para criar uma.")
+        return 0
+
+    regressoes = comparar(resultados, baseline, args.tolerancia, args.tolerancia_memoria)
+    if regressoes:
+        print("\nREGRESSÕES:")
+        for linha in regressoes:
+            print(f"  - {linha}")
+        return 1
+    print("\nNenhuma regressão em relação à baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+# ==============================================================================
+# CACHE COMPARTILHADO ENTRE RÉPLICAS (SQLITE OU REDIS) COM SINGLE-FLIGHT
+# ==============================================================================
+# O st.cache_data mora dentro de UM processo: com a imagem Docker rodando em várias
+# réplicas (ou depois de um restart do Streamlit), cada uma ia sozinha na
+# football-data.org e refazia todo o processamento. Cota multiplicada pelo número
+# de réplicas, e um pico de latência toda vez que o TTL vencia.
+#
+# Aqui fica um cache "de fora" do processo, com dois backends trocáveis:
+#   - sqlite:///caminho/cache.db  -> um arquivo (volume compartilhado, mesma máquina);
+#   - redis://host:6379/0         -> Redis (ou qualquer coisa que fale o protocolo dele).
+#
+# Cada entrada guarda o valor e quando foi gravada. Quando vence o TTL:
+#   - UMA réplica pega a trava da chave (single-flight) e busca/calcula de novo;
+#   - as outras continuam servindo a cópia velha enquanto isso, sem esperar;
+#   - só na primeira carga (não existe cópia nenhuma) as outras esperam a dona da trava.
+# Se o backend cair, o cache vira "passa direto": a página continua funcionando.
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+
+from brasileirao import metricas
+
+logger = logging.getLogger(__name__)
+
+# Quanto tempo uma trava vale (se a réplica dona morrer no meio, outra assume depois disso)
+VALIDADE_TRAVA = 120
+# Primeira carga sem cópia nenhuma: quanto tempo esperar a réplica que está buscando
+ESPERA_MAXIMA = 60
+INTERVALO_ESPERA = 0.1
+# Entradas vencidas continuam guardadas (para servir velho) até este limite
+RETENCAO = 7 * 24 * 3600
+
+
+def json_para_bytes(valor):
+    return json.dumps(valor, ensure_ascii=False).encode("utf-8")
+
+
+def json_de_bytes(dados):
+    return json.loads(dados.decode("utf-8"))
+
+
+class CacheCompartilhado:
+    """
+    Base dos backends: a lógica de TTL, cópia velha e single-flight fica aqui;
+    cada backend só implementa ler/gravar/travar/liberar em cima de bytes.
+    """
+
+    def ler(self, chave):
+        """(valor em bytes, gravado_em em epoch) ou None."""
+        raise NotImplementedError
+
+    def gravar(self, chave, valor):
+        raise NotImplementedError
+
+    def travar(self, chave, dono, validade=VALIDADE_TRAVA):
+        """True se a trava ficou com `dono` (ninguém mais segurava, ou a anterior venceu)."""
+        raise NotImplementedError
+
+    def liberar(self, chave, dono):
+        """Solta a trava, só se ela ainda for do `dono`."""
+        raise NotImplementedError
+
+    def obter(self, chave, ttl, produzir, serializar=json_para_bytes, desserializar=json_de_bytes):
+        """
+        Valor da chave: do cache se tem menos de `ttl` segundos; senão produzir() é
+        chamado por UMA réplica de cada vez e o resultado vai para o cache.
+        Quem não pegou a trava recebe a cópia velha (se houver).
+        """
+        try:
+            entrada = self.ler(chave)
+        except Exception as erro:
+            return self._sem_cache(chave, produzir, erro)
+        if entrada is not None and time.time() - entrada[1] < ttl:
+            metricas.contar("cache_compartilhado", resultado="fresco", chave=_prefixo(chave))
+            return desserializar(entrada[0])
+
+        dono = uuid.uuid4().hex
+        inicio_espera = time.monotonic()
+        while True:
+            try:
+                pegou = self.travar(chave, dono)
+            except Exception as erro:
+                return self._sem_cache(chave, produzir, erro)
+            if pegou:
+                return self._produzir(chave, ttl, dono, produzir, serializar, desserializar, entrada)
+            if entrada is not None:
+                # Outra réplica já está atualizando: sirvo a cópia velha sem esperar
+                metricas.contar("cache_compartilhado", resultado="velho", chave=_prefixo(chave))
+                return desserializar(entrada[0])
+            # Primeira carga: espero a dona da trava gravar (ou desistir)
+            if time.monotonic() - inicio_espera > ESPERA_MAXIMA:
+                metricas.contar("cache_compartilhado", resultado="espera_estourada", chave=_prefixo(chave))
+                return produzir()
+            time.sleep(INTERVALO_ESPERA)
+            try:
+                entrada = self.ler(chave)
+            except Exception as erro:
+                return self._sem_cache(chave, produzir, erro)
+            if entrada is not None:
+                metricas.contar("cache_compartilhado", resultado="esperou", chave=_prefixo(chave))
+                return desserializar(entrada[0])
+
+    def _produzir(self, chave, ttl, dono, produzir, serializar, desserializar, velha):
+        try:
+            # Outra réplica pode ter gravado entre o ler() e a trava: confiro antes de buscar
+            atual = self.ler(chave)
+            if atual is not None and time.time() - atual[1] < ttl:
+                metricas.contar("cache_compartilhado", resultado="fresco", chave=_prefixo(chave))
+                return desserializar(atual[0])
+            velha = atual or velha
+            valor = produzir()
+        except Exception:
+            if velha is None:
+                raise
+            # Falhou a atualização (API fora do ar...): melhor a cópia velha que erro na tela
+            logger.exception("falha ao atualizar %s; servindo a cópia anterior", chave)
+            metricas.contar("cache_compartilhado", resultado="velho_por_erro", chave=_prefixo(chave))
+            return desserializar(velha[0])
+        else:
+            metricas.contar("cache_compartilhado", resultado="produzido", chave=_prefixo(chave))
+            try:
+                self.gravar(chave, serializar(valor))
+            except Exception as erro:
+                logger.warning("cache compartilhado indisponível ao gravar %s: %s", chave, erro)
+            return valor
+        finally:
+            try:
+                self.liberar(chave, dono)
+            except Exception:
+                pass  # A trava vence sozinha em VALIDADE_TRAVA
+
+    def _sem_cache(self, chave, produzir, erro):
+        logger.warning("cache compartilhado indisponível (%s): %s", chave, erro)
+        metricas.contar("cache_compartilhado", resultado="erro_backend", chave=_prefixo(chave))
+        return produzir()
+
+
+def _prefixo(chave):
+    # Rótulo da métrica: só o "tipo" da chave (api, snapshot...), não a chave inteira
+    return chave.split(":", 1)[0]
+
+
+class CacheSQLite(CacheCompartilhado):
+    """
+    Um arquivo SQLite (modo WAL). Serve para várias réplicas na mesma máquina ou
+    com o arquivo num volume compartilhado. Cada operação abre a própria conexão,
+    então o objeto pode ser usado de qualquer thread.
+    """
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        pasta = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as conexao:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("CREATE TABLE IF NOT EXISTS entradas "
+                            "(chave TEXT PRIMARY KEY, valor BLOB NOT NULL, gravado_em REAL NOT NULL)")
+            conexao.execute("CREATE TABLE IF NOT EXISTS travas "
+                            "(chave TEXT PRIMARY KEY, dono TEXT NOT NULL, expira_em REAL NOT NULL)")
+
+    def _conectar(self):
+        # isolation_level=None: eu abro as transações na mão (BEGIN IMMEDIATE na trava)
+        return _Conexao(sqlite3.connect(self.caminho, timeout=30, isolation_level=None))
+
+    def ler(self, chave):
+        with self._conectar() as conexao:
+            linha = conexao.execute("SELECT valor, gravado_em FROM entradas WHERE chave = ?", (chave,)).fetchone()
+        return (bytes(linha[0]), linha[1]) if linha else None
+
+    def gravar(self, chave, valor):
+        agora = time.time()
+        with self._conectar() as conexao:
+            conexao.execute("INSERT OR REPLACE INTO entradas VALUES (?, ?, ?)", (chave, sqlite3.Binary(valor), agora))
+            conexao.execute("DELETE FROM entradas WHERE gravado_em < ?", (agora - RETENCAO,))
+
+    def travar(self, chave, dono, validade=VALIDADE_TRAVA):
+        agora = time.time()
+        with self._conectar() as conexao:
+            # BEGIN IMMEDIATE pega a trava de escrita do arquivo: apagar a vencida e
+            # inserir a nova acontecem juntos, sem outra réplica no meio
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                conexao.execute("DELETE FROM travas WHERE chave = ? AND expira_em < ?", (chave, agora))
+                cursor = conexao.execute("INSERT OR IGNORE INTO travas VALUES (?, ?, ?)",
+                                         (chave, dono, agora + validade))
+                conexao.execute("COMMIT")
+            except Exception:
+                conexao.execute("ROLLBACK")
+                raise
+        return cursor.rowcount == 1
+
+    def liberar(self, chave, dono):
+        with self._conectar() as conexao:
+            conexao.execute("DELETE FROM travas WHERE chave = ? AND dono = ?", (chave, dono))
+
+
+class _Conexao:
+    """`with` que FECHA a conexão do sqlite3 (o with nativo só faz commit/rollback)."""
+
+    def __init__(self, conexao):
+        self.conexao = conexao
+
+    def __enter__(self):
+        return self.conexao
+
+    def __exit__(self, *erro):
+        self.conexao.close()
+
+
+class CacheRedis(CacheCompartilhado):
+    """
+    Redis (ou compatível: Valkey, KeyDB, Dragonfly...). Cada entrada é um hash
+    {valor, gravado_em} com expiração em RETENCAO; a trava é um SET NX PX.
+    O pacote `redis` só é importado aqui (quem usa SQLite não precisa dele).
+    """
+
+    # Solta a trava só se ela ainda for minha (GET + DEL atômicos no servidor)
+    _LIBERAR = "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+
+    def __init__(self, url, prefixo="brasileirao:"):
+        import redis
+        self.redis = redis.Redis.from_url(url, socket_timeout=5, socket_connect_timeout=5)
+        self.prefixo = prefixo
+        self._script_liberar = self.redis.register_script(self._LIBERAR)
+
+    def ler(self, chave):
+        valor, gravado_em = self.redis.hmget(self.prefixo + chave, "valor", "gravado_em")
+        if valor is None or gravado_em is None:
+            return None
+        return valor, float(gravado_em)
+
+    def gravar(self, chave, valor):
+        nome = self.prefixo + chave
+        with self.redis.pipeline() as pipe:
+            pipe.hset(nome, mapping={"valor": valor, "gravado_em": repr(time.time())})
+            pipe.expire(nome, RETENCAO)
+            pipe.execute()
+
+    def travar(self, chave, dono, validade=VALIDADE_TRAVA):
+        return bool(self.redis.set(f"{self.prefixo}trava:{chave}", dono, nx=True, px=int(validade * 1000)))
+
+    def liberar(self, chave, dono):
+        self._script_liberar(keys=[f"{self.prefixo}trava:{chave}"], args=[dono])
+
+
+def criar_cache(url):
+    """
+    Backend a partir da URL (variável BRASILEIRAO_CACHE_URL no dashboard):
+    sqlite:///caminho/arquivo.db, redis://... ou rediss://... Vazio/None -> None (sem cache compartilhado).
+    """
+    if not url:
+        return None
+    if url.startswith("sqlite:///"):
+        return CacheSQLite(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return CacheRedis(url)
+    raise ValueError(f"URL de cache desconhecida: {url!r} (use sqlite:///... ou redis://...)")
@@ -0,0 +1,327 @@
+# ==============================================================================
+# TESTE DE CARGA: MUITAS SESSÕES DO STREAMLIT AO MESMO TEMPO
+# ==============================================================================
+# O AppTest roda o script numa sessão só e sem servidor; aqui é o `streamlit run`
+# de verdade, com N "navegadores" falando o mesmo protocolo do front-end (websocket
+# em /_stcore/stream, BackMsg/ForwardMsg em protobuf). Por padrão:
+#   1. grava uma temporada sintética e sobe o dublê da API (api_local.py), com
+#      latência e cota configuráveis;
+#   2. sobe o app apontado para o dublê (FOOTBALL_DATA_BASE_URL) e com uma pasta de
+#      snapshots vazia, ou seja, o caminho "plano B" que vai à API;
+#   3. uma sessão de aquecimento abre todas as visões (caches frios ficam fora da conta);
+#   4. N sessões abrem juntas (com rampa) e cada uma faz K reruns trocando de visão
+#      no menu lateral, com uma pausa entre cliques.
+# O relatório traz os percentis do tempo de rerun (envio do clique até o
+# script_finished), a memória do servidor por sessão (RSS do processo, Linux) e
+# quantas requisições chegaram à "API" durante a carga.
+#
+#     python -m brasileirao.carga --sessoes 20 --reruns 5 --latencia 0.3 --saida carga.json
+#     python -m brasileirao.carga --url http://127.0.0.1:8501 --api-local http://127.0.0.1:8765/v4
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+
+from brasileirao.inicializacao import SCRIPT_PADRAO, _porta_livre
+
+MENU = "Escolha a visão:"
+PERCENTIS = (50, 90, 95, 99)
+# Rerun completo (o fragmento ao vivo também manda script_finished, mas não é clique)
+FIM_DE_RERUN = ("FINISHED_SUCCESSFULLY", "FINISHED_WITH_COMPILE_ERROR")
+
+
+def _importar_protocolo():
+    # Só quem roda o teste de carga paga o import do tornado/protos do Streamlit
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from tornado.websocket import websocket_connect
+    return BackMsg, ForwardMsg, websocket_connect
+
+
+def rss_kb(pid):
+    """Memória residente do processo em KB (None fora do Linux)."""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for linha in f:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1])
+    except OSError:
+        return None
+    return None
+
+
+def _ler_json(url, timeout=5):
+    with urllib.request.urlopen(url, timeout=timeout) as r:
+        return json.load(r)
+
+
+def _esperar_health(url, processo=None, timeout=60):
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < timeout:
+        if processo is not None and processo.poll() is not None:
+            raise RuntimeError(f"o streamlit saiu com código {processo.returncode} antes de responder")
+        try:
+            with urllib.request.urlopen(f"{url}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.1)
+    raise TimeoutError(f"o servidor não respondeu em {timeout}s")
+
+
+class SessaoCarga:
+    """Um "navegador": uma conexão websocket com o servidor e o estado dos widgets dela."""
+
+    def __init__(self, url, timeout=120):
+        self.url_ws = url.replace("http://", "ws://").replace("https://", "wss://") + "/_stcore/stream"
+        self.timeout = timeout
+        self.menu = None  # (id do widget, opções)
+        self.excecoes = []
+        self._conexao = None
+
+    async def conectar(self):
+        _, _, websocket_connect = _importar_protocolo()
+        self._conexao = await asyncio.wait_for(websocket_connect(self.url_ws, max_message_size=256 * 2**20),
+                                               self.timeout)
+
+    def fechar(self):
+        if self._conexao is not None:
+            self._conexao.close()
+            self._conexao = None
+
+    async def rerun(self, visao=None):
+        """Manda um rerun (com a visão escolhida no menu, se houver) e espera o fim; devolve os segundos."""
+        BackMsg, ForwardMsg, _ = _importar_protocolo()
+        mensagem = BackMsg()
+        mensagem.rerun_script.query_string = ""
+        mensagem.rerun_script.page_script_hash = ""
+        if visao is not None and self.menu is not None:
+            estado = mensagem.rerun_script.widget_states.widgets.add()
+            estado.id = self.menu[0]
+            estado.int_value = self.menu[1].index(visao)
+        inicio = time.perf_counter()
+        await self._conexao.write_message(mensagem.SerializeToString(), binary=True)
+        while True:
+            bruto = await asyncio.wait_for(self._conexao.read_message(), self.timeout)
+            if bruto is None:
+                raise ConnectionError("o servidor fechou o websocket")
+            recebida = ForwardMsg.FromString(bruto)
+            tipo = recebida.WhichOneof("type")
+            if tipo == "delta":
+                self._olhar_delta(recebida.delta)
+            elif tipo == "script_finished":
+                fim = ForwardMsg.ScriptFinishedStatus.Name(recebida.script_finished)
+                if fim in FIM_DE_RERUN:
+                    return time.perf_counter() - inicio
+
+    def _olhar_delta(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        elemento = delta.new_element
+        tipo = elemento.WhichOneof("type")
+        if tipo == "radio" and elemento.radio.label == MENU:
+            self.menu = (elemento.radio.id, list(elemento.radio.options))
+        elif tipo == "exception":
+            self.excecoes.append(f"{elemento.exception.type}: {elemento.exception.message}")
+
+
+async def _rodar_sessao(url, reruns, pausa, atraso, rng, tempos, falhas, abertas):
+    await asyncio.sleep(atraso)
+    sessao = SessaoCarga(url)
+    try:
+        await sessao.conectar()
+        tempos.append(("inicial", await sessao.rerun()))
+        visoes = sessao.menu[1] if sessao.menu else [None]
+        for i in range(reruns):
+            await asyncio.sleep(pausa * rng.uniform(0.5, 1.5))
+            tempos.append(("rerun", await sessao.rerun(visoes[(i + 1) % len(visoes)])))
+        # Só conta como completa (e fica aberta para a medição de memória) quem fez todos os reruns
+        abertas.append(sessao)
+        falhas.extend(sessao.excecoes)
+    except Exception as e:
+        falhas.append(f"{type(e).__name__}: {e}")
+        sessao.fechar()
+
+
+async def aquecer(url):
+    """Uma sessão passando por todas as visões: imports e caches frios ficam fora da medição."""
+    sessao = SessaoCarga(url)
+    await sessao.conectar()
+    try:
+        await sessao.rerun()
+        for visao in (sessao.menu[1] if sessao.menu else []):
+            await sessao.rerun(visao)
+        return sessao.excecoes
+    finally:
+        sessao.fechar()
+
+
+async def _carga(url, sessoes, reruns, pausa, rampa, seed, pid):
+    rng = random.Random(seed)
+    tempos, falhas, abertas, amostras = [], [], [], []
+
+    async def amostrar():
+        while True:
+            if pid is not None:
+                amostras.append(rss_kb(pid))
+            await asyncio.sleep(0.2)
+
+    amostrador = asyncio.ensure_future(amostrar())
+    try:
+        await asyncio.gather(*(
+            _rodar_sessao(url, reruns, pausa, rampa * i / max(sessoes - 1, 1), rng, tempos, falhas, abertas)
+            for i in range(sessoes)
+        ))
+        # Memória com todas as sessões ainda abertas (o session_state de cada uma vive no servidor)
+        rss_final = rss_kb(pid) if pid is not None else None
+    finally:
+        amostrador.cancel()
+        for sessao in abertas:
+            sessao.fechar()
+    pico = max([a for a in amostras if a is not None] + [rss_final or 0]) or None
+    return tempos, falhas, len(abertas), rss_final, pico
+
+
+def _percentis(segundos):
+    if not segundos:
+        return {}
+    valores = np.asarray(segundos)
+    resumo = {f"p{p}": float(np.percentile(valores, p)) for p in PERCENTIS}
+    resumo.update(n=int(len(valores)), media=float(valores.mean()), max=float(valores.max()))
+    return resumo
+
+
+def _diferenca_estatisticas(antes, depois):
+    """Requisições que chegaram ao dublê entre duas leituras de /_controle/estatisticas."""
+    por_endpoint = {}
+    for endpoint, status in depois["por_endpoint"].items():
+        for codigo, n in status.items():
+            delta = n - antes["por_endpoint"].get(endpoint, {}).get(codigo, 0)
+            if delta:
+                por_endpoint.setdefault(endpoint, {})[codigo] = delta
+    return {"requisicoes": depois["requisicoes"] - antes["requisicoes"], "por_endpoint": por_endpoint}
+
+
+def rodar_carga(url, sessoes=10, reruns=5, pausa=0.5, rampa=2.0, seed=0, pid=None, api_local=None):
+    """
+    Roda o teste contra um servidor já de pé em `url`. `pid` (processo do streamlit)
+    habilita a medição de memória; `api_local` (URL base do dublê, com /v4) habilita
+    a contagem de requisições à API. Devolve o relatório (dict).
+    """
+    controle = api_local[:-len("/v4")] + "/_controle/estatisticas" if api_local else None
+    excecoes_aquecimento = asyncio.run(aquecer(url))
+    requisicoes_aquecimento = _ler_json(controle) if controle else None
+    rss_antes = rss_kb(pid) if pid is not None else None
+
+    inicio = time.perf_counter()
+    tempos, falhas, completas, rss_final, rss_pico = asyncio.run(
+        _carga(url, sessoes, reruns, pausa, rampa, seed, pid))
+    duracao = time.perf_counter() - inicio
+
+    relatorio = {
+        "sessoes": sessoes, "reruns_por_sessao": reruns, "sessoes_completas": completas,
+        "duracao_s": duracao,
+        "rerun_inicial_s": _percentis([s for tipo, s in tempos if tipo == "inicial"]),
+        "rerun_s": _percentis([s for tipo, s in tempos if tipo == "rerun"]),
+        "falhas": falhas, "excecoes_aquecimento": excecoes_aquecimento,
+    }
+    if rss_antes is not None and rss_final is not None:
+        relatorio["memoria"] = {
+            "rss_antes_mb": rss_antes / 1024, "rss_final_mb": rss_final / 1024, "rss_pico_mb": rss_pico / 1024,
+            "por_sessao_mb": (rss_final - rss_antes) / 1024 / max(completas, 1),
+        }
+    if controle:
+        relatorio["api"] = {"aquecimento": requisicoes_aquecimento,
+                            "durante_carga": _diferenca_estatisticas(requisicoes_aquecimento, _ler_json(controle))}
+    return relatorio
+
+
+def _imprimir(relatorio):
+    print(f"Sessões: {relatorio['sessoes_completas']}/{relatorio['sessoes']} completas, "
+          f"{relatorio['reruns_por_sessao']} reruns cada, em {relatorio['duracao_s']:.1f}s")
+    for nome, chave in (("Abertura da página", "rerun_inicial_s"), ("Rerun (troca de visão)", "rerun_s")):
+        p = relatorio[chave]
+        if p:
+            print(f"{nome:<24} n={p['n']:<5} " + "  ".join(f"p{q}={p[f'p{q}'] * 1000:.0f}ms" for q in PERCENTIS)
+                  + f"  max={p['max'] * 1000:.0f}ms")
+    if "memoria" in relatorio:
+        m = relatorio["memoria"]
+        print(f"Memória do servidor: {m['rss_antes_mb']:.0f} MB -> {m['rss_final_mb']:.0f} MB "
+              f"(pico {m['rss_pico_mb']:.0f} MB), {m['por_sessao_mb']:.2f} MB por sessão")
+    if "api" in relatorio:
+        aquecimento, carga = relatorio["api"]["aquecimento"], relatorio["api"]["durante_carga"]
+        print(f"Requisições à API: {aquecimento['requisicoes']} no aquecimento, {carga['requisicoes']} durante a carga")
+        for endpoint, status in carga["por_endpoint"].items():
+            print(f"    {endpoint}: " + ", ".join(f"{codigo}={n}" for codigo, n in sorted(status.items())))
+    falhas = relatorio["falhas"] + relatorio["excecoes_aquecimento"]
+    if falhas:
+        print(f"FALHAS ({len(falhas)}): " + " | ".join(sorted(set(falhas))[:10]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do dashboard com várias sessões simultâneas.")
+    parser.add_argument("--sessoes", type=int, default=10, help="Sessões (navegadores) simultâneas.")
+    parser.add_argument("--reruns", type=int, default=5, help="Reruns (trocas de visão) por sessão.")
+    parser.add_argument("--pausa", type=float, default=0.5, help="Pausa média (s) entre os cliques de uma sessão.")
+    parser.add_argument("--rampa", type=float, default=2.0, help="Segundos para abrir todas as sessões.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", default=None, help="App já de pé (senão sobe um `streamlit run` local).")
+    parser.add_argument("--api-local", default=None,
+                        help="Com --url: base do dublê da API (…/v4) para contar as requisições.")
+    parser.add_argument("--script", default=SCRIPT_PADRAO, help="Script do Streamlit (sem --url).")
+    parser.add_argument("--gravacao", default=None,
+                        help="Gravação para o dublê (padrão: temporada sintética numa pasta temporária).")
+    parser.add_argument("--latencia", type=float, default=0.2, help="Latência (s) do dublê da API.")
+    parser.add_argument("--cota", type=int, default=10, help="Requisições por minuto do dublê (0 = sem limite).")
+    parser.add_argument("--taxa-429", type=float, default=0.0, help="Fração de 429 sorteados pelo dublê.")
+    parser.add_argument("--saida", default=None, help="Grava o relatório em JSON.")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        relatorio = rodar_carga(args.url.rstrip("/"), args.sessoes, args.reruns, args.pausa, args.rampa, args.seed,
+                                api_local=args.api_local)
+    else:
+        from brasileirao.api_local import Reproducao, ServidorApiLocal, gravar_sintetico
+        with tempfile.TemporaryDirectory() as temporaria:
+            gravacao = args.gravacao
+            if gravacao is None:
+                gravacao = os.path.join(temporaria, "gravacao")
+                gravar_sintetico(gravacao)
+            servidor_api = ServidorApiLocal(Reproducao(gravacao, seed=args.seed), latencia=args.latencia,
+                                     variacao=args.latencia / 2, cota=args.cota, taxa_429=args.taxa_429,
+                                     seed=args.seed).iniciar()
+            porta = _porta_livre()
+            ambiente = dict(os.environ, FOOTBALL_DATA_BASE_URL=servidor_api.url,
+                            BRASILEIRAO_SNAPSHOTS=os.path.join(temporaria, "snapshots"))
+            processo = subprocess.Popen(
+                [sys.executable, "-m", "streamlit", "run", args.script, "--server.headless=true",
+                 f"--server.port={porta}", "--server.address=127.0.0.1", "--browser.gatherUsageStats=false"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=ambiente,
+            )
+            try:
+                url = f"http://127.0.0.1:{porta}"
+                _esperar_health(url, processo)
+                relatorio = rodar_carga(url, args.sessoes, args.reruns, args.pausa, args.rampa, args.seed,
+                                        pid=processo.pid, api_local=servidor_api.url)
+            finally:
+                processo.terminate()
+                processo.wait(timeout=10)
+                servidor_api.parar()
+
+    _imprimir(relatorio)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    return 1 if relatorio["falhas"] or relatorio["sessoes_completas"] < relatorio["sessoes"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
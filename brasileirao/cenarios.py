@@ -0,0 +1,170 @@
+# ==============================================================================
+# SIMULADOR DE CENÁRIOS ("E SE...?") COM RECÁLCULO INCREMENTAL
+# ==============================================================================
+# O usuário escolhe o placar de jogos que ainda vão acontecer e vê o efeito na
+# tabela, nas previsões e na projeção final. Refazer process_data + forças + Monte
+# Carlo a cada placar digitado deixaria a tela arrastada, então cada cenário guarda
+# o próprio estado e cada edição só mexe no que mudou:
+#   - classificação em arrays NumPy (uma entrada por time): um placar novo soma (ou
+#     desfaz) pontos, vitórias, saldo e gols de DOIS times, e a ordem sai de um
+#     lexsort de 20 posições;
+#   - forças: refit Dixon-Coles partindo do ajuste do próprio cenário (warm start);
+#   - previsões e Monte Carlo só dos jogos que continuam sem placar.
+# Todos os cenários simulam com o mesmo número de temporadas e a MESMA semente
+# (números aleatórios comuns): a diferença entre dois cenários é efeito dos
+# placares escolhidos, não do sorteio.
+import time
+
+import numpy as np
+import pandas as pd
+
+from brasileirao import metricas
+from brasileirao.dixon_coles import AjusteDixonColes
+from brasileirao.snapshot import ajuste_do_snapshot, modelar
+
+# Menos temporadas que o snapshot (100 mil): cada edição precisa voltar em milissegundos
+N_SIMULACOES_CENARIO = 5_000
+SEMENTE_CENARIO = 2024
+COLUNAS_TABELA = ["Pontos", "Jogos", "Vitórias", "Empates", "Derrotas", "Gols Pró", "Gols Sofridos", "Saldo"]
+COLUNAS_RESUMO = ["Pos", "Pontos", "Saldo", "Pontos_Esperados", "Prob_Titulo", "Prob_Libertadores", "Prob_Z4"]
+
+
+class Cenario:
+    """
+    Um conjunto de placares hipotéticos ({ID_Jogo: (gols_casa, gols_fora)}) em cima
+    de um snapshot. Depois de cada definir()/definir_varios(), os atributos tabela,
+    forcas, previsoes, projecao e posicoes já refletem o cenário.
+    Sem df_historico, as forças usam o mesmo histórico do snapshot (base.historico):
+    o cenário sem placar nenhum bate com o Panorama.
+    """
+
+    def __init__(self, base, nome="Cenário", n_simulacoes=N_SIMULACOES_CENARIO, seed=SEMENTE_CENARIO,
+                 df_historico=None):
+        self.base = base
+        self.nome = nome
+        self.n_simulacoes = n_simulacoes
+        self.seed = seed
+        self._historico_informado = df_historico
+        self.df_historico = df_historico if df_historico is not None else base.historico
+        self.resultados = {}
+        self.segundos_ultima_edicao = 0.0
+        self._ids = pd.Index(base.tabela["ID"])
+        self._numeros = {coluna: base.tabela[coluna].to_numpy(dtype=np.int64).copy() for coluna in COLUNAS_TABELA}
+        # Quem joga cada partida agendada (posição do time nos arrays): consulta direta por ID_Jogo
+        jogos = base.agendados.set_index("ID_Jogo")
+        self._lados = pd.DataFrame({
+            "casa": self._ids.get_indexer(jogos["Home_ID"]), "fora": self._ids.get_indexer(jogos["Away_ID"]),
+        }, index=jogos.index)
+        self._ajuste = ajuste_do_snapshot(base)
+        self._recalcular()
+
+    # --------------------------------------------------------------------------
+    # Edição
+    # --------------------------------------------------------------------------
+    def definir(self, id_jogo, gols_casa, gols_fora):
+        """Placar hipotético de um jogo agendado (None em qualquer lado apaga o placar)."""
+        self.definir_varios({id_jogo: (gols_casa, gols_fora)})
+
+    def definir_varios(self, placares):
+        """Vários placares de uma vez, com um recálculo só no final."""
+        inicio = time.perf_counter()
+        mudou = False
+        for id_jogo, (gols_casa, gols_fora) in placares.items():
+            if id_jogo not in self._lados.index:
+                raise KeyError(f"jogo {id_jogo} não está entre os agendados do snapshot")
+            novo = None if gols_casa is None or gols_fora is None else (int(gols_casa), int(gols_fora))
+            antigo = self.resultados.get(id_jogo)
+            if novo == antigo:
+                continue
+            if antigo is not None:
+                self._somar(id_jogo, *antigo, sinal=-1)
+                del self.resultados[id_jogo]
+            if novo is not None:
+                self._somar(id_jogo, *novo, sinal=1)
+                self.resultados[id_jogo] = novo
+            mudou = True
+        if mudou:
+            self._recalcular()
+        self.segundos_ultima_edicao = time.perf_counter() - inicio
+        metricas.observar_tempo("cenario_edicao_segundos", self.segundos_ultima_edicao)
+
+    def limpar(self):
+        self.definir_varios({id_jogo: (None, None) for id_jogo in list(self.resultados)})
+
+    def sobre(self, base):
+        """O mesmo cenário refeito sobre um snapshot mais novo (jogos que já aconteceram saem)."""
+        novo = Cenario(base, self.nome, self.n_simulacoes, self.seed, self._historico_informado)
+        ainda_agendados = {i: p for i, p in self.resultados.items() if i in novo._lados.index}
+        if ainda_agendados:
+            novo.definir_varios(ainda_agendados)
+        return novo
+
+    def _somar(self, id_jogo, gols_casa, gols_fora, sinal):
+        """Soma (sinal=1) ou desfaz (sinal=-1) um placar na classificação: só dois times mudam."""
+        lados = self._lados.loc[id_jogo]
+        for posicao, pro, contra in ((lados["casa"], gols_casa, gols_fora), (lados["fora"], gols_fora, gols_casa)):
+            if posicao < 0:
+                continue  # Time fora da tabela (a simulação também o ignora)
+            n = self._numeros
+            n["Jogos"][posicao] += sinal
+            n["Gols Pró"][posicao] += sinal * pro
+            n["Gols Sofridos"][posicao] += sinal * contra
+            n["Saldo"][posicao] += sinal * (pro - contra)
+            if pro > contra:
+                n["Vitórias"][posicao] += sinal
+                n["Pontos"][posicao] += 3 * sinal
+            elif pro == contra:
+                n["Empates"][posicao] += sinal
+                n["Pontos"][posicao] += sinal
+            else:
+                n["Derrotas"][posicao] += sinal
+
+    # --------------------------------------------------------------------------
+    # Recálculo (tabela -> forças -> previsões -> Monte Carlo)
+    # --------------------------------------------------------------------------
+    def _recalcular(self):
+        n = self._numeros
+        # Mesmo desempate do simulador: pontos, vitórias, saldo, gols pró
+        ordem = np.lexsort((-n["Gols Pró"], -n["Saldo"], -n["Vitórias"], -n["Pontos"]))
+        tabela = self.base.tabela.set_index("ID").reindex(self._ids[ordem])
+        for coluna in COLUNAS_TABELA:
+            tabela[coluna] = n[coluna][ordem]
+        tabela["Pos"] = np.arange(1, len(tabela) + 1)
+        self.tabela = tabela.reset_index()[self.base.tabela.columns]
+
+        agendados = self.base.agendados
+        com_placar = agendados["ID_Jogo"].isin(self.resultados.keys()).to_numpy()
+        finalizados = self.base.finalizados
+        if com_placar.any():
+            hipoteticos = agendados[com_placar].copy()
+            placares = np.array([self.resultados[i] for i in hipoteticos["ID_Jogo"]], dtype=float)
+            hipoteticos["Status"] = "FINISHED"
+            hipoteticos["Gols_Home"], hipoteticos["Gols_Away"] = placares[:, 0], placares[:, 1]
+            finalizados = pd.concat([finalizados, hipoteticos])
+        self.agendados = agendados[~com_placar]
+
+        modelo = self.base.metadados.get("modelo", "dixon_coles")
+        (self.forcas, self.media_casa, self.media_fora, self.rho,
+         self.previsoes, self.projecao, self.posicoes) = modelar(
+            self.tabela, finalizados, self.agendados, n_simulacoes=self.n_simulacoes, seed=self.seed,
+            df_historico=self.df_historico, modelo=modelo, ajuste_anterior=self._ajuste,
+        )
+        if modelo == "dixon_coles" and not self.forcas.empty:
+            # A próxima edição parte deste ajuste (quase no ótimo: poucas iterações)
+            self._ajuste = AjusteDixonColes.de_forcas(self.forcas, self.media_casa, self.media_fora, self.rho)
+
+    # --------------------------------------------------------------------------
+    # Leitura
+    # --------------------------------------------------------------------------
+    def resumo(self):
+        """Uma linha por time (índice = ID): posição, pontos e saldo do cenário + a projeção."""
+        resumo = self.tabela.set_index("ID")[["Pos", "Pontos", "Saldo"]]
+        return resumo.join(self.projecao)[[c for c in COLUNAS_RESUMO if c in resumo or c in self.projecao]]
+
+
+def comparar_cenarios(cenarios, coluna="Prob_Titulo"):
+    """
+    Lado a lado: uma coluna por cenário (na ordem recebida) com o valor de `coluna`
+    (Pos, Pontos, Pontos_Esperados, Prob_Titulo, Prob_Libertadores, Prob_Z4) de cada time.
+    """
+    return pd.DataFrame({cenario.nome: cenario.resumo()[coluna] for cenario in cenarios})
@@ -0,0 +1,247 @@
+# ==============================================================================
+# MODELO DE FORÇAS POR MÁXIMA VEROSSIMILHANÇA (DIXON-COLES)
+# ==============================================================================
+# O calcular_forca_times faz médias simples por mando: no começo do campeonato é
+# puro ruído, e time que ainda não jogou em casa fica com força "1" no chute.
+# Aqui as forças saem de um ajuste de verdade:
+#
+#     gols_casa ~ Poisson(exp(mu + fator_casa + ataque[casa] + defesa[fora]))
+#     gols_fora ~ Poisson(exp(mu + ataque[fora] + defesa[casa]))
+#
+# com a correção de Dixon-Coles (rho) para os placares baixos (0x0, 1x0, 0x1,
+# 1x1), peso decaindo com o tempo (jogo de seis meses atrás vale metade) e uma
+# penalidade L2 que puxa para a média quem tem poucos jogos (e o rho para zero).
+# O gradiente é calculado na mão com NumPy (bincount) e o L-BFGS do SciPy faz o resto.
+#
+# Refit com uma rodada nova: parte dos parâmetros do ajuste anterior (warm start)
+# e converge em poucas iterações, na casa dos milissegundos.
+#
+# O resultado vira o mesmo (forcas, media_casa, media_fora) do modelo antigo
+# (mais o rho), então entra direto no prever_jogo / prever_jogos_lote.
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from brasileirao.metricas import cronometrado
+from brasileirao.modelo import TAU_MINIMO
+
+# Meia-vida do peso de um jogo (em dias)
+MEIA_VIDA_DIAS = 180
+# Força da penalidade L2 nos ataques/defesas (em log). Maior = mais puxado para a média.
+REGULARIZACAO = 4.0
+# Limites do rho (a faixa em que ele costuma cair). Não garantem tau > 0: com lambdas
+# altos o tau ainda pode zerar, e por isso ele é cortado em TAU_MINIMO (ver modelo.py)
+LIMITES_RHO = (-0.2, 0.2)
+# Penalidade no rho: com poucos jogos ele "gruda" no limite só por ruído
+REGULARIZACAO_RHO = 50.0
+
+
+@dataclass
+class AjusteDixonColes:
+    """Parâmetros ajustados (em escala log), indexados pelo ID do time."""
+    ids: np.ndarray
+    mu: float
+    fator_casa: float
+    ataque: np.ndarray
+    defesa: np.ndarray
+    rho: float
+    n_iteracoes: int = 0
+    convergiu: bool = True
+    log_verossimilhanca: float = 0.0
+
+    @property
+    def media_casa(self):
+        return float(np.exp(self.mu + self.fator_casa))
+
+    @property
+    def media_fora(self):
+        return float(np.exp(self.mu))
+
+    @property
+    def forcas(self):
+        """
+        Mesmo formato do calcular_forca_times (índice ID, multiplicadores em torno
+        de 1). No Dixon-Coles o ataque/defesa não depende do mando: as colunas de
+        Casa e Fora são iguais e o mando fica todo no media_casa/media_fora.
+        """
+        ataque, defesa = np.exp(self.ataque), np.exp(self.defesa)
+        forcas = pd.DataFrame(
+            {'Ataque_Casa': ataque, 'Ataque_Fora': ataque, 'Defesa_Casa': defesa, 'Defesa_Fora': defesa},
+            index=pd.Index(self.ids, name='ID'),
+        )
+        return forcas
+
+    def para_modelo(self):
+        """(forcas, media_casa, media_fora, rho): o que o prever_jogos_lote recebe."""
+        return self.forcas, self.media_casa, self.media_fora, self.rho
+
+    @classmethod
+    def de_forcas(cls, forcas, media_casa, media_fora, rho=0.0):
+        """Reconstrói o ajuste a partir do formato 'forcas' (ex.: o que ficou gravado no snapshot)."""
+        return cls(
+            ids=forcas.index.to_numpy(),
+            mu=float(np.log(media_fora)),
+            fator_casa=float(np.log(media_casa) - np.log(media_fora)),
+            ataque=np.log(forcas['Ataque_Casa'].to_numpy(dtype=float)),
+            defesa=np.log(forcas['Defesa_Fora'].to_numpy(dtype=float)),
+            rho=float(rho),
+        )
+
+
+def pesos_por_tempo(datas, data_referencia=None, meia_vida_dias=MEIA_VIDA_DIAS):
+    """Peso exponencial: 1 na data de referência, 0.5 uma meia-vida antes, e por aí vai."""
+    datas = pd.to_datetime(datas, utc=True)
+    if data_referencia is None:
+        data_referencia = datas.max()
+    dias = (pd.Timestamp(data_referencia).tz_convert('UTC') - datas) / pd.Timedelta(days=1)
+    dias = np.clip(np.asarray(dias, dtype=float), 0.0, None)
+    if not meia_vida_dias:
+        return np.ones_like(dias)
+    return np.exp(-np.log(2) * dias / meia_vida_dias)
+
+
+def _funcao_objetivo(theta, n_times, i_casa, i_fora, gols_casa, gols_fora, pesos, regularizacao,
+                     m00, m01, m10, m11):
+    """-log-verossimilhança ponderada + penalidade, e o gradiente (para o L-BFGS)."""
+    mu, fator_casa = theta[0], theta[1]
+    ataque = theta[2:2 + n_times]
+    defesa = theta[2 + n_times:2 + 2 * n_times]
+    rho = theta[-1]
+
+    eta_casa = mu + fator_casa + ataque[i_casa] + defesa[i_fora]
+    eta_fora = mu + ataque[i_fora] + defesa[i_casa]
+    lamb_casa, lamb_fora = np.exp(eta_casa), np.exp(eta_fora)
+
+    # Parte Poisson (sem o log(k!), que não depende dos parâmetros)
+    ll = gols_casa * eta_casa - lamb_casa + gols_fora * eta_fora - lamb_fora
+    d_eta_casa = gols_casa - lamb_casa
+    d_eta_fora = gols_fora - lamb_fora
+
+    # Correção de Dixon-Coles nos placares baixos: log(tau) e as derivadas
+    tau = np.ones_like(lamb_casa)
+    tau[m00] = 1 - lamb_casa[m00] * lamb_fora[m00] * rho
+    tau[m01] = 1 + lamb_casa[m01] * rho
+    tau[m10] = 1 + lamb_fora[m10] * rho
+    tau[m11] = 1 - rho
+    # Mesmo piso da matriz de placares: tau <= 0 daria log de negativo (NaN no L-BFGS).
+    # Onde o piso vale, o log(tau) fica constante e não entra no gradiente.
+    livre = tau > TAU_MINIMO
+    tau = np.maximum(tau, TAU_MINIMO)
+    ll = ll + np.log(tau)
+
+    d_rho = np.zeros_like(tau)
+    d_rho[m00] = -lamb_casa[m00] * lamb_fora[m00] / tau[m00]
+    d_rho[m01] = lamb_casa[m01] / tau[m01]
+    d_rho[m10] = lamb_fora[m10] / tau[m10]
+    d_rho[m11] = -1 / tau[m11]
+    d_rho *= livre
+    # d log(tau) / d eta: no 0x0 mexe nos dois lados, no 0x1 só no mandante, no 1x0 só no visitante
+    d_tau_casa = np.zeros_like(tau)
+    d_tau_fora = np.zeros_like(tau)
+    termo00 = -lamb_casa[m00] * lamb_fora[m00] * rho / tau[m00]
+    d_tau_casa[m00] = termo00
+    d_tau_fora[m00] = termo00
+    d_tau_casa[m01] = lamb_casa[m01] * rho / tau[m01]
+    d_tau_fora[m10] = lamb_fora[m10] * rho / tau[m10]
+    d_eta_casa += d_tau_casa * livre
+    d_eta_fora += d_tau_fora * livre
+
+    g_casa = pesos * d_eta_casa
+    g_fora = pesos * d_eta_fora
+    grad = np.empty_like(theta)
+    grad[0] = g_casa.sum() + g_fora.sum()
+    grad[1] = g_casa.sum()
+    grad[2:2 + n_times] = np.bincount(i_casa, g_casa, n_times) + np.bincount(i_fora, g_fora, n_times)
+    grad[2 + n_times:2 + 2 * n_times] = np.bincount(i_fora, g_casa, n_times) + np.bincount(i_casa, g_fora, n_times)
+    grad[-1] = (pesos * d_rho).sum()
+
+    # Penalidade L2 em ataque/defesa (puxa para a média) e no rho (puxa para zero); mu e fator casa livres
+    forcas_log = theta[2:2 + 2 * n_times]
+    valor = -(pesos * ll).sum() + 0.5 * regularizacao * (forcas_log ** 2).sum() + 0.5 * REGULARIZACAO_RHO * rho ** 2
+    grad = -grad
+    grad[2:2 + 2 * n_times] += regularizacao * forcas_log
+    grad[-1] += REGULARIZACAO_RHO * rho
+    return valor, grad
+
+
+@cronometrado()
+def ajustar_dixon_coles(jogos, ids_times=None, data_referencia=None, meia_vida_dias=MEIA_VIDA_DIAS,
+                        regularizacao=REGULARIZACAO, anterior=None, tolerancia=1e-7):
+    """
+    Ajusta o modelo nos jogos finalizados (colunas Home_ID, Away_ID, Gols_Home,
+    Gols_Away e Data). Pode misturar temporada atual e histórico: o peso por
+    tempo resolve quanto cada jogo conta.
+
+    - ids_times: times que precisam sair no resultado mesmo sem jogo (ficam na média);
+    - anterior: AjusteDixonColes de antes (warm start). Times novos começam na média.
+
+    Devolve um AjusteDixonColes, ou None se não houver jogo nenhum.
+    """
+    jogos = jogos.dropna(subset=['Gols_Home', 'Gols_Away'])
+    if jogos.empty:
+        return None
+
+    ids = pd.Index(np.union1d(jogos['Home_ID'].unique(), jogos['Away_ID'].unique()))
+    if ids_times is not None:
+        ids = ids.union(pd.Index(ids_times))
+    n_times = len(ids)
+    i_casa = ids.get_indexer(jogos['Home_ID'])
+    i_fora = ids.get_indexer(jogos['Away_ID'])
+    gols_casa = jogos['Gols_Home'].to_numpy(dtype=float)
+    gols_fora = jogos['Gols_Away'].to_numpy(dtype=float)
+    pesos = pesos_por_tempo(jogos['Data'], data_referencia, meia_vida_dias)
+    mascaras = (
+        (gols_casa == 0) & (gols_fora == 0), (gols_casa == 0) & (gols_fora == 1),
+        (gols_casa == 1) & (gols_fora == 0), (gols_casa == 1) & (gols_fora == 1),
+    )
+
+    # Ponto de partida: o ajuste anterior (casando por ID) ou tudo na média da liga
+    theta0 = np.zeros(2 + 2 * n_times + 1)
+    if anterior is not None:
+        theta0[0], theta0[1], theta0[-1] = anterior.mu, anterior.fator_casa, anterior.rho
+        posicoes = pd.Index(anterior.ids).get_indexer(ids)
+        conhecidos = posicoes >= 0
+        theta0[2:2 + n_times][conhecidos] = anterior.ataque[posicoes[conhecidos]]
+        theta0[2 + n_times:2 + 2 * n_times][conhecidos] = anterior.defesa[posicoes[conhecidos]]
+    else:
+        media_fora = np.average(gols_fora, weights=pesos)
+        media_casa = np.average(gols_casa, weights=pesos)
+        theta0[0] = np.log(max(media_fora, 0.1))
+        theta0[1] = np.log(max(media_casa, 0.1)) - theta0[0]
+
+    # SciPy só aqui dentro: o scipy.optimize leva ~170 ms para importar e o dashboard,
+    # que só lê o snapshot pronto, nunca chega a ajustar nada
+    from scipy.optimize import minimize
+
+    limites = [(None, None)] * (2 + 2 * n_times) + [LIMITES_RHO]
+    resultado = minimize(
+        _funcao_objetivo, theta0, jac=True, method='L-BFGS-B', bounds=limites,
+        args=(n_times, i_casa, i_fora, gols_casa, gols_fora, pesos, regularizacao, *mascaras),
+        options={'gtol': tolerancia, 'maxiter': 500},
+    )
+    theta = resultado.x
+    return AjusteDixonColes(
+        ids=ids.to_numpy(), mu=float(theta[0]), fator_casa=float(theta[1]),
+        ataque=theta[2:2 + n_times].copy(), defesa=theta[2 + n_times:2 + 2 * n_times].copy(),
+        rho=float(theta[-1]), n_iteracoes=int(resultado.nit), convergiu=bool(resultado.success),
+        log_verossimilhanca=float(-resultado.fun),
+    )
+
+
+def calcular_forca_dixon_coles(df_finalizados, df_historico=None, ids_times=None, anterior=None, **opcoes):
+    """
+    Atalho com a mesma "cara" do calcular_forca_times: devolve
+    (forcas, media_casa, media_fora, ajuste). Sem jogos, (None, 0, 0, None).
+    """
+    colunas = ['Home_ID', 'Away_ID', 'Gols_Home', 'Gols_Away', 'Data']
+    partes = [df[colunas] for df in (df_finalizados, df_historico) if df is not None and not df.empty]
+    if not partes:
+        return None, 0, 0, None
+    jogos = pd.concat(partes, ignore_index=True)
+    # A referência do decaimento é o último jogo da temporada atual (ou do histórico, no início)
+    referencia = df_finalizados['Data'].max() if not df_finalizados.empty else jogos['Data'].max()
+    ajuste = ajustar_dixon_coles(jogos, ids_times=ids_times, data_referencia=referencia, anterior=anterior, **opcoes)
+    if ajuste is None:
+        return None, 0, 0, None
+    return ajuste.forcas, ajuste.media_casa, ajuste.media_fora, ajuste
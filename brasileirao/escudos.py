@@ -0,0 +1,196 @@
+# ==============================================================================
+# CACHE LOCAL DOS ESCUDOS (MINIATURAS SERVIDAS PELO PRÓPRIO APP)
+# ==============================================================================
+# A coluna Escudo vinha com a URL crua do CDN da football-data.org: cada navegador
+# baixava os 20 escudos em tamanho cheio a cada tabela desenhada, e com o CDN lento
+# a tabela ficava "banguela". Aqui cada escudo é baixado UMA vez por servidor:
+#   - o original fica em <pasta>/originais/ (dá para gerar outros tamanhos sem baixar de novo);
+#   - as miniaturas (PNG, ver TAMANHOS) ficam em <pasta>/, que mora dentro do static/
+#     do Streamlit (server.enableStaticServing) e saem do próprio app;
+#   - o endereço leva ?v=<hash do arquivo>: com o `v`, o servidor de estáticos manda
+#     Cache-Control de 10 anos, e se o escudo mudar o endereço muda junto;
+#   - um índice em JSON guarda URL -> arquivos, então reiniciar o app não baixa nada.
+# Quem ainda não está no disco vai para um pool em segundo plano e, enquanto isso,
+# continua com a URL do CDN: CDN lento nunca segura o rerun além de `esperar` segundos.
+#
+# SVG precisa do cairosvg (opcional) para virar PNG: o servidor de estáticos do
+# Streamlit entrega .svg como text/plain. Sem ele, escudo em SVG fica na URL original.
+import base64
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from brasileirao import metricas
+
+# Nome -> lado (px) da miniatura. O dobro do tamanho na tela, para ficar nítido em tela retina:
+# "mini" é a coluna da tabela (linha de ~32px) e "grande" é o cabeçalho do Raio-X (70px)
+TAMANHOS = {"mini": 64, "grande": 160}
+# Onde o Streamlit serve o static/ (sempre abaixo do server.baseUrlPath, ver prefixo_url)
+CAMINHO_ESTATICOS = "app/static/escudos"
+# Escudo que falhou só é tentado de novo depois disso (CDN fora do ar não vira rajada de GETs)
+TENTAR_DE_NOVO_APOS = 600
+MAX_PARALELO = 8
+
+
+def prefixo_url(base_url_path=""):
+    """
+    Caminho ABSOLUTO da pasta de escudos no servidor: /<server.baseUrlPath>/app/static/escudos.
+    Um endereço relativo ("app/static/...") depende da URL da página: sem a barra
+    no final (ou atrás de um proxy com prefixo) o navegador resolve para o lugar errado.
+    """
+    partes = [parte for parte in (base_url_path or "").split("/") if parte]
+    return "/" + "/".join(partes + [CAMINHO_ESTATICOS])
+
+
+PREFIXO_URL = prefixo_url()
+
+
+def _hash(dados, tamanho=12):
+    return hashlib.sha1(dados).hexdigest()[:tamanho]
+
+
+def _gravar_atomico(caminho, dados):
+    # Quem está servindo o arquivo nunca vê um PNG pela metade
+    temporario = f"{caminho}.{threading.get_ident()}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(dados)
+    os.replace(temporario, caminho)
+
+
+def _eh_svg(url, tipo, dados):
+    return "svg" in tipo or url.lower().split("?")[0].endswith(".svg") or dados.lstrip()[:5] in (b"<?xml", b"<svg ")
+
+
+def miniaturas(dados, svg=False, tamanhos=TAMANHOS):
+    """{nome: PNG (bytes)} de um escudo, cada um cabendo num quadrado de `tamanhos[nome]` px."""
+    from PIL import Image
+
+    resultado = {}
+    for nome, lado in tamanhos.items():
+        if svg:
+            import cairosvg  # Opcional (ver o topo do arquivo): ImportError sobe para quem chamou
+            # Rasteriza direto no tamanho final (SVG não perde nitidez), mantendo a proporção
+            imagem = Image.open(io.BytesIO(cairosvg.svg2png(bytestring=dados, output_width=lado)))
+        else:
+            imagem = Image.open(io.BytesIO(dados))
+        imagem = imagem.convert("RGBA")
+        imagem.thumbnail((lado, lado), Image.LANCZOS)
+        saida = io.BytesIO()
+        imagem.save(saida, format="PNG", optimize=True)
+        resultado[nome] = saida.getvalue()
+    return resultado
+
+
+class CacheEscudos:
+    """
+    Escudos baixados uma vez e servidos como miniaturas locais. Uma instância por
+    processo (o dashboard guarda no st.cache_resource); todos os métodos podem ser
+    chamados de várias sessões ao mesmo tempo.
+    """
+
+    def __init__(self, pasta, prefixo_url=PREFIXO_URL, tamanhos=TAMANHOS, timeout=(3.05, 10),
+                 max_paralelo=MAX_PARALELO, sessao=None):
+        self.pasta = pasta
+        self.prefixo_url = prefixo_url.rstrip("/")
+        self.tamanhos = tamanhos
+        self.timeout = timeout
+        self._sessao = sessao
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_paralelo, thread_name_prefix="escudos")
+        self._pendentes = {}  # url -> Future do download
+        self._falhas = {}  # url -> instante da última falha
+        os.makedirs(os.path.join(pasta, "originais"), exist_ok=True)
+        self._caminho_indice = os.path.join(pasta, "indice.json")
+        self._indice = {}  # url -> {"chave": ..., "original": ..., "versoes": {tamanho: hash}}
+        if os.path.exists(self._caminho_indice):
+            with open(self._caminho_indice, encoding="utf-8") as f:
+                self._indice = json.load(f)
+        # Entrada cujo arquivo sumiu (pasta limpa pela metade) é baixada de novo
+        self._indice = {url: entrada for url, entrada in self._indice.items()
+                        if all(os.path.exists(self._arquivo(entrada["chave"], nome)) for nome in entrada["versoes"])}
+
+    def _arquivo(self, chave, tamanho):
+        return os.path.join(self.pasta, f"{chave}-{tamanho}.png")
+
+    def _cliente(self):
+        if self._sessao is None:
+            import requests
+            self._sessao = requests.Session()
+        return self._sessao
+
+    # --------------------------------------------------------------------------
+    # Download (nas threads do pool)
+    # --------------------------------------------------------------------------
+    def _baixar(self, url):
+        try:
+            resposta = self._cliente().get(url, timeout=self.timeout)
+            resposta.raise_for_status()
+            dados = resposta.content
+            svg = _eh_svg(url, resposta.headers.get("Content-Type", ""), dados)
+            pngs = miniaturas(dados, svg=svg, tamanhos=self.tamanhos)
+        except Exception:
+            # Rede, HTTP, imagem que o Pillow não abre ou SVG sem cairosvg: fica a URL original
+            with self._lock:
+                self._falhas[url] = time.time()
+                self._pendentes.pop(url, None)
+            metricas.contar("escudos_baixados", resultado="falha")
+            raise
+        chave = _hash(url.encode("utf-8"), 16)
+        original = os.path.join("originais", f"{chave}{'.svg' if svg else os.path.splitext(url.split('?')[0])[1]}")
+        _gravar_atomico(os.path.join(self.pasta, original), dados)
+        for nome, png in pngs.items():
+            _gravar_atomico(self._arquivo(chave, nome), png)
+        entrada = {"chave": chave, "original": original, "versoes": {nome: _hash(png) for nome, png in pngs.items()}}
+        with self._lock:
+            self._indice[url] = entrada
+            self._falhas.pop(url, None)
+            self._pendentes.pop(url, None)
+            _gravar_atomico(self._caminho_indice, json.dumps(self._indice, ensure_ascii=False).encode("utf-8"))
+        metricas.contar("escudos_baixados", resultado="ok")
+        return entrada
+
+    # --------------------------------------------------------------------------
+    # Leitura (no rerun)
+    # --------------------------------------------------------------------------
+    def enderecos(self, urls, tamanho="mini", esperar=0.5, embutir=False):
+        """
+        {url original: endereço para o navegador}. Quem já está no disco sai como
+        <prefixo_url>/<chave>-<tamanho>.png?v=<hash> (ou, com embutir=True, como data
+        URI, para quando o servidor de estáticos está desligado ou fora de alcance); quem falta é
+        pedido ao pool e a função espera até `esperar` segundos por ele. Se não chegar
+        a tempo, devolve a própria URL (o próximo rerun já pega a local).
+        """
+        urls = {u for u in urls if isinstance(u, str) and u}
+        agora = time.time()
+        futuros = []
+        with self._lock:
+            for url in urls - self._indice.keys():
+                if url in self._pendentes:
+                    futuros.append(self._pendentes[url])
+                elif agora - self._falhas.get(url, float("-inf")) >= TENTAR_DE_NOVO_APOS:
+                    self._pendentes[url] = self._pool.submit(self._baixar, url)
+                    futuros.append(self._pendentes[url])
+        if futuros and esperar > 0:
+            wait(futuros, timeout=esperar)
+        with self._lock:
+            indice = dict(self._indice)
+        resultado = {}
+        for url in urls:
+            entrada = indice.get(url)
+            if entrada is None or tamanho not in entrada["versoes"]:
+                resultado[url] = url
+            elif embutir:
+                with open(self._arquivo(entrada["chave"], tamanho), "rb") as f:
+                    resultado[url] = "data:image/png;base64," + base64.b64encode(f.read()).decode("ascii")
+            else:
+                resultado[url] = (f"{self.prefixo_url}/{entrada['chave']}-{tamanho}.png"
+                                  f"?v={entrada['versoes'][tamanho]}")
+        metricas.registrar_valor("escudos_locais", sum(1 for url in urls if resultado[url] != url))
+        return resultado
+
+    def endereco(self, url, tamanho="mini", esperar=0.5, embutir=False):
+        return self.enderecos([url], tamanho, esperar, embutir).get(url, url)
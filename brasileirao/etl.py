@@ -0,0 +1,194 @@
+# ==============================================================================
+# ETL - TRANSFORMAÇÃO DO JSON DA API EM DATAFRAMES
+# ==============================================================================
+# Tudo aqui é Python "puro" (sem Streamlit), para poder rodar tanto dentro do
+# dashboard quanto no job headless que gera o snapshot (ver snapshot.py).
+import numpy as np
+import pandas as pd
+
+from brasileirao.metricas import cronometrado
+
+def get_sigla(nome_time):
+    """
+    Função para limpar os gráficos. Em vez de "Red Bull Bragantino" (que quebra o layout),
+    eu transformo em "RBB". Se o time não estiver na lista, pego as 3 primeiras letras.
+    Isso é essencial para visualização em celular.
+    """
+    mapa = {
+        "América FC": "AME", "Athletico Paranaense": "CAP", "Atlético Mineiro": "CAM",
+        "Bahia": "BAH", "Botafogo FR": "BOT", "Corinthians": "COR",
+        "Coritiba": "CFC", "Cruzeiro": "CRU", "Cuiabá": "CUI",
+        "Flamengo": "FLA", "Fluminense FC": "FLU", "Fortaleza": "FOR",
+        "Goiás": "GOI", "Grêmio": "GRE", "Internacional": "INT",
+        "Palmeiras": "PAL", "Red Bull Bragantino": "RBB", "Santos": "SAN",
+        "São Paulo FC": "SAO", "Vasco da Gama": "VAS", "Vitória": "VIT",
+        "Juventude": "JUV", "Criciúma": "CRI", "Atlético Goianiense": "ACG"
+    }
+    # Tenta achar no dicionário, se não achar, corta a string.
+    for key, value in mapa.items():
+        if key in nome_time:
+            return value
+    return nome_time[:3].upper()
+
+def montar_registro_times(standings_raw, matches_raw):
+    """
+    Cadastro único dos clubes, montado UMA vez a partir do ID numérico da API.
+    Cada time tem nome oficial, sigla e escudo; o resto do app só carrega o ID
+    (inteiro) e consulta aqui quando precisa mostrar alguma coisa.
+    Assim o get_sigla roda 20 vezes por carga, e não duas vezes por jogo.
+    """
+    equipes = {}
+    for t in standings_raw["standings"][0]["table"]:
+        equipes[t["team"]["id"]] = t["team"]
+    # Time que só aparece na lista de jogos (ex.: antes da tabela sair) também entra
+    for jogo in matches_raw['matches']:
+        for lado in ('homeTeam', 'awayTeam'):
+            if jogo[lado]['id'] is not None:
+                equipes.setdefault(jogo[lado]['id'], jogo[lado])
+    
+    df_times = pd.DataFrame([
+        {
+            "ID": id_time,
+            "Time": equipe["name"],
+            "Sigla": get_sigla(equipe["name"]),
+            "Escudo": equipe.get("crest"),
+        } for id_time, equipe in equipes.items()
+    ]).set_index("ID").sort_index()
+    return df_times
+
+def achatar_jogos(matches_raw):
+    """
+    Lista de jogos da API -> DataFrame "cru" (só IDs, placares, data e status).
+    É a base tanto do process_data quanto do histórico de temporadas (historico.py).
+    """
+    colunas = ["ID_Jogo", "Rodada", "Data", "Status", "Home_ID", "Away_ID",
+               "Gols_Home", "Gols_Away", "Gols_Home_1T", "Gols_Away_1T"]
+    lista_jogos = []
+    for jogo in matches_raw['matches']:
+        lista_jogos.append({
+            "ID_Jogo": jogo['id'],
+            "Rodada": jogo['matchday'],
+            "Data": jogo['utcDate'],
+            "Status": jogo['status'], # Importante para saber se já acabou
+            "Home_ID": jogo['homeTeam']['id'],
+            "Away_ID": jogo['awayTeam']['id'],
+            "Gols_Home": jogo['score']['fullTime']['home'],
+            "Gols_Away": jogo['score']['fullTime']['away'],
+            # Placar do intervalo, para a análise 1º Tempo x 2º Tempo
+            "Gols_Home_1T": jogo['score']['halfTime']['home'],
+            "Gols_Away_1T": jogo['score']['halfTime']['away']
+        })
+    
+    df_jogos = pd.DataFrame(lista_jogos, columns=colunas)
+    # Jogo com time ainda indefinido (ID nulo) não serve nem para estatística nem para previsão
+    df_jogos = df_jogos.dropna(subset=['Home_ID', 'Away_ID']).astype({'Home_ID': int, 'Away_ID': int})
+    # Placar sempre como número (nulo = jogo que ainda não aconteceu)
+    colunas_gols = ["Gols_Home", "Gols_Away", "Gols_Home_1T", "Gols_Away_1T"]
+    df_jogos[colunas_gols] = df_jogos[colunas_gols].astype(float)
+    # Converto a data estranha da API para o horário do Brasil
+    df_jogos['Data'] = pd.to_datetime(df_jogos['Data'], utc=True).dt.tz_convert('America/Sao_Paulo')
+    return df_jogos
+
+@cronometrado()
+def process_data(standings_raw, matches_raw):
+    """
+    Transforma o JSON bagunçado da API em DataFrames bonitinhos do Pandas.
+    Os times andam pelas tabelas como ID inteiro (para groupby/join rápidos)
+    e os nomes/siglas viram colunas categóricas ligadas ao registro de times.
+    """
+    # 1. Tratando a Classificação
+    if 'standings' not in standings_raw:
+        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
+    
+    df_times = montar_registro_times(standings_raw, matches_raw)
+    # Mesmas categorias em todas as colunas de nome, para comparar Home com Away sem surpresa
+    cat_nomes = pd.CategoricalDtype(df_times['Time'].unique())
+    cat_siglas = pd.CategoricalDtype(df_times['Sigla'].unique())
+    
+    lista_times = standings_raw["standings"][0]["table"]
+    df_tabela = pd.DataFrame([
+        {
+            "Pos": t["position"],
+            "ID": t["team"]["id"],
+            "Pontos": t["points"],
+            "Jogos": t["playedGames"],
+            "Vitórias": t["won"],
+            "Empates": t["draw"],
+            "Derrotas": t["lost"],
+            "Gols Pró": t["goalsFor"],
+            # CORREÇÃO APLICADA: Mudei de 'Gols Contra' para 'Gols Sofridos'
+            "Gols Sofridos": t["goalsAgainst"], 
+            "Saldo": t["goalDifference"]
+        } for t in lista_times
+    ])
+    # Nome, sigla e escudo (URL para mostrar na tabela) vêm do registro, por ID
+    df_tabela.insert(1, "Escudo", df_times['Escudo'].reindex(df_tabela['ID']).to_numpy())
+    df_tabela.insert(2, "Time", pd.Categorical(df_times['Time'].reindex(df_tabela['ID']), dtype=cat_nomes))
+    df_tabela.insert(3, "Sigla", pd.Categorical(df_times['Sigla'].reindex(df_tabela['ID']), dtype=cat_siglas))
+    
+    # 2. Tratando os Jogos
+    df_jogos = achatar_jogos(matches_raw)
+    # Nomes e siglas: uma consulta vetorizada no registro para cada lado
+    for lado in ('Home', 'Away'):
+        ids = df_jogos[f'{lado}_ID']
+        df_jogos.insert(df_jogos.columns.get_loc(f'{lado}_ID') + 1, lado,
+                        pd.Categorical(df_times['Time'].reindex(ids), dtype=cat_nomes))
+    df_jogos['Sigla_Home'] = pd.Categorical(df_times['Sigla'].reindex(df_jogos['Home_ID']), dtype=cat_siglas)
+    df_jogos['Sigla_Away'] = pd.Categorical(df_times['Sigla'].reindex(df_jogos['Away_ID']), dtype=cat_siglas)
+    
+    # Separo em dois DataFrames: o que já foi (para estatística) e o que virá (para previsão)
+    df_finalizados = df_jogos[df_jogos['Status'] == 'FINISHED'].copy()
+    df_agendados = df_jogos[df_jogos['Status'] != 'FINISHED'].copy()
+    
+    # Índice "por time" montado uma vez só (ver montar_jogos_por_time)
+    df_time_jogos = montar_jogos_por_time(df_finalizados)
+    
+    return df_tabela, df_finalizados, df_agendados, df_time_jogos, df_times
+
+def montar_jogos_por_time(df_finalizados):
+    """
+    Formato "longo": cada jogo vira DUAS linhas, uma do ponto de vista de cada time
+    (gols pró/contra, 1º e 2º tempo, mando, pontos e resultado).
+    O índice é o ID do time (ordenado), então "jogos do time X" vira um .loc
+    direto em vez de varrer a tabela com str.contains a cada gráfico.
+    """
+    colunas = ['ID', 'Time', 'Adversario_ID', 'Adversario', 'Sigla_Adv', 'Rodada', 'Data', 'Mando',
+               'Gols_Pro', 'Gols_Contra', 'Gols_Pro_1T', 'Gols_Contra_1T',
+               'Gols_Pro_2T', 'Gols_Contra_2T', 'Pontos', 'Resultado']
+    # Jogo FINISHED sem placar final (a API às vezes demora a preencher) fica de fora:
+    # o to_numpy(dtype=int) transformaria o NaN em -9223372036854775808 gols
+    df_finalizados = df_finalizados.dropna(subset=['Gols_Home', 'Gols_Away'])
+    if df_finalizados.empty:
+        return pd.DataFrame(columns=colunas).set_index('ID')
+    
+    # Trato nulos do intervalo como 0 (a API às vezes não manda o placar do 1º tempo)
+    gh = df_finalizados['Gols_Home'].to_numpy(dtype=int)
+    ga = df_finalizados['Gols_Away'].to_numpy(dtype=int)
+    gh1 = df_finalizados['Gols_Home_1T'].fillna(0).to_numpy(dtype=int)
+    ga1 = df_finalizados['Gols_Away_1T'].fillna(0).to_numpy(dtype=int)
+    # .array mantém o tipo original (categórico nos nomes, fuso horário na data)
+    base = {'Rodada': df_finalizados['Rodada'].array, 'Data': df_finalizados['Data'].array}
+    
+    casa = pd.DataFrame({
+        'ID': df_finalizados['Home_ID'].array, 'Time': df_finalizados['Home'].array,
+        'Adversario_ID': df_finalizados['Away_ID'].array, 'Adversario': df_finalizados['Away'].array,
+        'Sigla_Adv': df_finalizados['Sigla_Away'].array, **base, 'Mando': 'Casa',
+        'Gols_Pro': gh, 'Gols_Contra': ga, 'Gols_Pro_1T': gh1, 'Gols_Contra_1T': ga1,
+    })
+    fora = pd.DataFrame({
+        'ID': df_finalizados['Away_ID'].array, 'Time': df_finalizados['Away'].array,
+        'Adversario_ID': df_finalizados['Home_ID'].array, 'Adversario': df_finalizados['Home'].array,
+        'Sigla_Adv': df_finalizados['Sigla_Home'].array, **base, 'Mando': 'Fora',
+        'Gols_Pro': ga, 'Gols_Contra': gh, 'Gols_Pro_1T': ga1, 'Gols_Contra_1T': gh1,
+    })
+    df = pd.concat([casa, fora], ignore_index=True)
+    df['Gols_Pro_2T'] = df['Gols_Pro'] - df['Gols_Pro_1T']
+    df['Gols_Contra_2T'] = df['Gols_Contra'] - df['Gols_Contra_1T']
+    
+    # Resultado e pontos de uma vez, sem iterrows
+    vitoria = df['Gols_Pro'] > df['Gols_Contra']
+    empate = df['Gols_Pro'] == df['Gols_Contra']
+    df['Pontos'] = np.select([vitoria, empate], [3, 1], default=0)
+    df['Resultado'] = np.select([vitoria, empate], ['V', 'E'], default='D')
+    
+    return df[colunas].sort_values(['ID', 'Data']).set_index('ID')
@@ -0,0 +1,133 @@
+# ==============================================================================
+# CONFRONTO DIRETO E FORMA RECENTE (PRÉ-CALCULADOS UMA VEZ POR SNAPSHOT)
+# ==============================================================================
+# "Como o time X vem jogando?" e "como foi X contra Y?" parecem perguntas baratas,
+# mas feitas do jeito ingênuo (filtrar o df_finalizados a cada clique) viram uma
+# varredura da temporada por consulta. Aqui as duas respostas saem prontas, a partir
+# do formato longo (time_jogos, um jogo = duas linhas), com groupby/rolling vetorizados:
+#   - confrontos: uma linha por par (time, adversário) com jogos, V/E/D, pontos e gols;
+#     dá para virar a matriz 20x20 com matriz_confrontos;
+#   - forma: para cada time e cada jogo, os números da janela dos últimos N jogos
+#     (pontos, gols, aproveitamento), a sequência atual e a "forma" em texto (VVEDV).
+# Os dois vão para o snapshot: qualquer consulta vira um .loc no índice.
+import numpy as np
+import pandas as pd
+
+from brasileirao.metricas import cronometrado
+
+# Tamanho da janela da forma (últimos N jogos)
+JANELA_FORMA = 5
+# Quanto a forma mexe na previsão (expoente do fator: 0 desliga, 1 = proporcional)
+PESO_FORMA = 0.3
+# Fator de forma nunca passa disso (5 jogos é pouca amostra: segura os exageros)
+LIMITES_FATOR = (0.8, 1.25)
+
+COLUNAS_CONFRONTO = ['Jogos', 'Vitórias', 'Empates', 'Derrotas', 'Pontos', 'Gols_Pro', 'Gols_Contra']
+COLUNAS_FORMA = ['Rodada', 'Data', 'Resultado', 'Jogos_Janela', 'Pontos_Janela', 'Gols_Pro_Janela',
+                 'Gols_Contra_Janela', 'Aproveitamento_Janela', 'Sequencia', 'Invicto', 'Sem_Vencer', 'Forma']
+
+
+@cronometrado()
+def montar_confrontos(df_time_jogos):
+    """
+    Retrospecto de cada par: DataFrame com índice (ID, Adversario_ID) e as colunas
+    de COLUNAS_CONFRONTO, sempre do ponto de vista do primeiro time do par.
+    """
+    indice = pd.MultiIndex.from_arrays([[], []], names=['ID', 'Adversario_ID'])
+    if df_time_jogos.empty:
+        return pd.DataFrame(columns=COLUNAS_CONFRONTO, index=indice, dtype=int)
+    jogos = df_time_jogos.reset_index()
+    resultado = jogos['Resultado'].to_numpy()
+    jogos = pd.DataFrame({
+        'ID': jogos['ID'].to_numpy(dtype=int), 'Adversario_ID': jogos['Adversario_ID'].to_numpy(dtype=int),
+        'Jogos': 1, 'Vitórias': (resultado == 'V').astype(int), 'Empates': (resultado == 'E').astype(int),
+        'Derrotas': (resultado == 'D').astype(int), 'Pontos': jogos['Pontos'].to_numpy(dtype=int),
+        'Gols_Pro': jogos['Gols_Pro'].to_numpy(dtype=int), 'Gols_Contra': jogos['Gols_Contra'].to_numpy(dtype=int),
+    })
+    return jogos.groupby(['ID', 'Adversario_ID'])[COLUNAS_CONFRONTO].sum().sort_index()
+
+
+def matriz_confrontos(confrontos, ids_times=None, valor='Pontos'):
+    """
+    Matriz (time x adversário) de uma coluna do confrontos: linha = time, coluna = adversário.
+    Par que ainda não se enfrentou fica NaN. Com ids_times, linhas e colunas seguem essa ordem.
+    """
+    matriz = confrontos[valor].unstack('Adversario_ID')
+    if ids_times is not None:
+        matriz = matriz.reindex(index=ids_times, columns=ids_times)
+    return matriz
+
+
+def confronto(confrontos, id_time, id_adversario):
+    """Retrospecto de id_time contra id_adversario (Series de COLUNAS_CONFRONTO, zeros se nunca jogaram)."""
+    try:
+        return confrontos.loc[(id_time, id_adversario)]
+    except KeyError:
+        return pd.Series(0, index=COLUNAS_CONFRONTO)
+
+
+@cronometrado()
+def montar_forma(df_time_jogos, janela=JANELA_FORMA):
+    """
+    Série de forma de cada time, uma linha por jogo (índice = ID, em ordem de data):
+      - *_Janela: soma dos últimos `janela` jogos (até aquele jogo, inclusive);
+      - Sequencia: quantos jogos seguidos com o mesmo resultado do último;
+      - Invicto / Sem_Vencer: jogos seguidos sem perder / sem ganhar;
+      - Forma: resultados da janela em texto, do mais antigo para o mais recente (ex.: "VVEDV").
+    """
+    if df_time_jogos.empty:
+        return pd.DataFrame(columns=COLUNAS_FORMA, index=pd.Index([], name='ID'))
+    # time_jogos já vem ordenado por (ID, Data); garanto para as janelas não misturarem a ordem
+    jogos = df_time_jogos.reset_index().sort_values(['ID', 'Data'], kind='stable').reset_index(drop=True)
+    por_time = jogos.groupby('ID', sort=False)
+
+    janela_soma = por_time[['Pontos', 'Gols_Pro', 'Gols_Contra']].rolling(janela, min_periods=1).sum()
+    janela_soma = janela_soma.reset_index(level=0, drop=True).sort_index()
+    forma = jogos[['ID', 'Rodada', 'Data', 'Resultado']].copy()
+    forma['Jogos_Janela'] = np.minimum(por_time.cumcount().to_numpy() + 1, janela)
+    forma['Pontos_Janela'] = janela_soma['Pontos'].to_numpy(dtype=int)
+    forma['Gols_Pro_Janela'] = janela_soma['Gols_Pro'].to_numpy(dtype=int)
+    forma['Gols_Contra_Janela'] = janela_soma['Gols_Contra'].to_numpy(dtype=int)
+    forma['Aproveitamento_Janela'] = forma['Pontos_Janela'] / (3 * forma['Jogos_Janela'])
+
+    # Sequências: um "bloco" novo começa quando troca o time ou o resultado;
+    # a contagem acumulada dentro do bloco é o tamanho da sequência até ali
+    novo_time = forma['ID'].ne(forma['ID'].shift())
+    bloco = (novo_time | forma['Resultado'].ne(forma['Resultado'].shift())).cumsum()
+    forma['Sequencia'] = forma.groupby(bloco).cumcount() + 1
+    perdeu, venceu = forma['Resultado'].eq('D'), forma['Resultado'].eq('V')
+    forma['Invicto'] = (~perdeu).astype(int).groupby((novo_time | perdeu).cumsum()).cumsum()
+    forma['Sem_Vencer'] = (~venceu).astype(int).groupby((novo_time | venceu).cumsum()).cumsum()
+
+    # Texto da forma: o resultado do jogo e dos janela-1 anteriores (shift dentro do time)
+    resultado_por_time = forma.groupby('ID', sort=False)['Resultado']
+    forma['Forma'] = ''
+    for atraso in range(janela - 1, -1, -1):
+        forma['Forma'] += resultado_por_time.shift(atraso).fillna('')
+    return forma.set_index('ID')[COLUNAS_FORMA]
+
+
+def forma_atual(forma):
+    """Última linha da série de cada time (a forma "de hoje"), índice = ID."""
+    return forma.groupby(level=0).tail(1)
+
+
+def fatores_forma(forma, peso=PESO_FORMA, limites=LIMITES_FATOR):
+    """
+    Multiplicadores de ataque/defesa pela forma recente, para o prever_jogo / prever_jogos_lote:
+    (gols por jogo na janela / média da liga na janela) ** peso, preso em `limites`.
+    Fator_Ataque > 1 = time marcando mais que a média; Fator_Defesa > 1 = sofrendo mais.
+    """
+    atual = forma_atual(forma)
+    if atual.empty:
+        return pd.DataFrame(columns=['Fator_Ataque', 'Fator_Defesa'], index=pd.Index([], name='ID'), dtype=float)
+    jogos = atual['Jogos_Janela'].to_numpy(dtype=float)
+    media = atual['Gols_Pro_Janela'].sum() / jogos.sum()
+    if media <= 0:
+        return pd.DataFrame({'Fator_Ataque': 1.0, 'Fator_Defesa': 1.0}, index=atual.index)
+    ataque = (atual['Gols_Pro_Janela'].to_numpy() / jogos / media) ** peso
+    defesa = (atual['Gols_Contra_Janela'].to_numpy() / jogos / media) ** peso
+    return pd.DataFrame({
+        'Fator_Ataque': np.clip(ataque, *limites),
+        'Fator_Defesa': np.clip(defesa, *limites),
+    }, index=atual.index)
@@ -0,0 +1,190 @@
+# ==============================================================================
+# CONSTRUTORES DOS GRÁFICOS (PLOTLY PURO, SEM STREAMLIT)
+# ==============================================================================
+# Os gráficos saíram do script do dashboard para cá: cada função recebe os
+# DataFrames já prontos e devolve a figura. O app só chama st.plotly_chart, e o
+# benchmark (brasileirao/benchmark.py) consegue medir o custo de montar cada um.
+#
+# Tudo em Graph Objects, sem Plotly Express: o plotly.express sozinho levava ~140 ms
+# para importar (o graph_objects o próprio Streamlit já carrega) e montava cada
+# figura bem mais devagar. Os gráficos ficaram iguais aos do px (cores, escalas,
+# hover e tamanho das bolhas), só que feitos à mão.
+import plotly.graph_objects as go
+
+# Cores das barras de probabilidade (vitória do mandante, empate, vitória do visitante)
+COR_CASA, COR_EMPATE, COR_FORA = '#27ae60', '#95a5a6', '#c0392b'
+
+
+def formatar_grafico(fig):
+    """
+    Função visual: Remove o fundo cinza padrão do Plotly e as grades excessivas.
+    Deixa o gráfico 'flutuando' no fundo escuro do app.
+    """
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',  # Remove fundo da área do gráfico
+        paper_bgcolor='rgba(0,0,0,0)', # Remove fundo da área externa
+        font=dict(color='white'),      # Força texto branco
+        xaxis=dict(showgrid=False),    # Sem grades verticais
+        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.1)'), # Grade horizontal sutil
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return fig
+
+
+def grafico_pontos(df_tabela):
+    """Barras de pontos por clube (a cor mais escura é o líder)."""
+    fig = go.Figure(go.Bar(
+        x=df_tabela['Sigla'].astype(str), y=df_tabela['Pontos'], text=df_tabela['Pontos'],
+        marker=dict(color=df_tabela['Pontos'], coloraxis='coloraxis'),
+        hovertemplate='Sigla=%{x}<br>Pontos=%{y}<extra></extra>',
+    ))
+    fig.update_layout(coloraxis=dict(colorscale="Blues", colorbar=dict(title="Pontos")),
+                      xaxis_title="Clubes (Sigla)", yaxis_title="Total de Pontos")
+    return formatar_grafico(fig)
+
+
+def grafico_eficiencia(df_tabela):
+    """Scatter Ataque x Defesa com os quadrantes e os destaques de melhor ataque/defesa."""
+    # Scatter plot: X=Ataque, Y=Defesa (Gols Sofridos)
+    # Bolha proporcional aos pontos (em área), com a maior em 20 px, como o px.scatter fazia
+    tamanho_max = max(df_tabela['Pontos'].max(), 1)
+    fig = go.Figure(go.Scatter(
+        x=df_tabela['Gols Pró'], y=df_tabela['Gols Sofridos'], text=df_tabela['Sigla'].astype(str),
+        mode='markers+text',
+        marker=dict(size=df_tabela['Pontos'], sizemode='area', sizeref=tamanho_max / 20 ** 2,
+                    color=df_tabela['Saldo'], coloraxis='coloraxis'),
+        hovertemplate=('Gols Pró=%{x}<br>Gols Sofridos=%{y}<br>Pontos=%{marker.size}<br>'
+                       'Sigla=%{text}<br>Saldo=%{marker.color}<extra></extra>'),
+    ))
+    fig.update_layout(coloraxis=dict(colorscale="RdYlGn", colorbar=dict(title="Saldo")),
+                      title="Mapa de Posicionamento Tático")
+
+    # TRUQUE VISUAL: Linhas médias para dividir os quadrantes
+    fig.add_vline(x=df_tabela['Gols Pró'].mean(), line_dash="dash", line_color="gray", annotation_text="Média Ataque")
+    fig.add_hline(y=df_tabela['Gols Sofridos'].mean(), line_dash="dash", line_color="gray", annotation_text="Média Defesa")
+
+    # TRUQUE IMPORTANTE: Inverter o eixo Y.
+    # Porque no futebol, sofrer 0 gols (topo) é melhor que sofrer 10 gols (fundo).
+    fig.update_yaxes(autorange="reversed", title="Gols Sofridos (Quanto mais no topo, melhor a defesa)")
+    fig.update_xaxes(title="Gols Feitos (Quanto mais à direita, melhor o ataque)")
+
+    # Destaques automáticos (Melhor Ataque e Melhor Defesa)
+    melhor_atk = df_tabela.loc[df_tabela['Gols Pró'].idxmax()]
+    melhor_def = df_tabela.loc[df_tabela['Gols Sofridos'].idxmin()]
+
+    # Setinhas apontando os destaques
+    fig.add_annotation(x=melhor_atk['Gols Pró'], y=melhor_atk['Gols Sofridos'], text="🔥 Melhor Ataque", showarrow=True, arrowhead=2, ax=0, ay=-40, bgcolor="#1E1E1E")
+    fig.add_annotation(x=melhor_def['Gols Pró'], y=melhor_def['Gols Sofridos'], text="🛡️ Melhor Defesa", showarrow=True, arrowhead=2, ax=0, ay=40, bgcolor="#1E1E1E")
+    return formatar_grafico(fig)
+
+
+# Altura de cada linha (um jogo) no gráfico de probabilidades em lote, em pixels
+ALTURA_JOGO_PX = 26
+
+
+def grafico_probabilidades(df_previsoes):
+    """
+    Barras empilhadas Casa/Empate/Fora de VÁRIOS jogos numa figura só (linha do
+    df_previsoes = um jogo). Antes era uma figura com 3 traces para cada jogo; aqui
+    são sempre 3 traces no total (um por resultado, com um ponto por jogo), então
+    uma rodada ou a temporada inteira custam praticamente o mesmo para montar.
+    O eixo Y é multicategoria (rodada, confronto): cada rodada vira um "bloco"
+    próprio, como small multiples, sem precisar de um subplot por rodada.
+    """
+    jogos = df_previsoes.dropna(subset=['Prob_Casa'])
+    rodadas = 'R' + jogos['Rodada'].astype(str)
+    # Siglas e nomes vêm como category no snapshot: converto antes de concatenar
+    confrontos = jogos['Sigla_Home'].astype(str) + ' x ' + jogos['Sigla_Away'].astype(str)
+    eixo_y = [rodadas.tolist(), confrontos.tolist()]
+    nomes = (jogos['Home'].astype(str) + ' x ' + jogos['Away'].astype(str)).tolist()
+
+    fig = go.Figure()
+    for coluna, nome, cor in (('Prob_Casa', 'Casa', COR_CASA), ('Prob_Empate', 'Empate', COR_EMPATE),
+                              ('Prob_Fora', 'Fora', COR_FORA)):
+        fig.add_trace(go.Bar(
+            x=jogos[coluna].to_numpy(), y=eixo_y, orientation='h', name=nome, marker_color=cor,
+            text=jogos[coluna].to_numpy(), texttemplate='%{text:.0%}', textposition='inside',
+            insidetextanchor='middle', customdata=nomes,
+            hovertemplate='%{customdata}<br>' + nome + ': %{x:.1%}<extra></extra>',
+        ))
+
+    fig.update_layout(
+        barmode='stack',
+        height=60 + ALTURA_JOGO_PX * len(jogos), # Cresce com o número de jogos (uma linha fininha cada)
+        legend=dict(orientation='h', y=1.0, yanchor='bottom', x=0),
+        uniformtext=dict(minsize=9, mode='hide'), # Percentual que não cabe na barra some, em vez de encolher
+    )
+    formatar_grafico(fig)
+    # Primeiro jogo no topo, igual à ordem da lista; eixo X sem números (o texto já mostra o %)
+    fig.update_yaxes(autorange='reversed', showgrid=False)
+    fig.update_xaxes(visible=False, range=[0, 1])
+    fig.update_layout(margin=dict(l=0, r=0, t=30, b=0))
+    return fig
+
+
+def grafico_gols_rodada(jogos_time):
+    """Gols feitos x sofridos rodada a rodada (jogos_time = fatia do df_time_jogos de um clube)."""
+    # A tabela por time já tem gols pró/contra do ponto de vista do clube: uma barra por coluna
+    rodadas = ("R" + jogos_time['Rodada'].astype(str) + " "
+               + jogos_time['Mando'].map({'Casa': '(C)', 'Fora': '(F)'}).astype(str)).tolist()
+
+    # Gráfico com barras lado a lado (barmode='group')
+    fig = go.Figure([
+        go.Bar(name=tipo, x=rodadas, y=jogos_time[coluna], marker_color=cor, legendgroup=tipo,
+               hovertemplate=f'Tipo={tipo}<br>Rodada=%{{x}}<br>Gols=%{{y}}<extra></extra>')
+        for tipo, coluna, cor in (("Gols Feitos", 'Gols_Pro', "#00539F"), ("Gols Sofridos", 'Gols_Contra', "#E74C3C"))
+    ])
+    fig.update_layout(barmode="group", legend_title_text="Tipo", xaxis_title="Rodada", yaxis_title="Gols")
+    return formatar_grafico(fig)
+
+
+def grafico_tempos(jogos_time):
+    """Gols pró/sofridos no 1º e no 2º tempo."""
+    # Os gols por tempo já vêm separados na tabela por time: é só somar as colunas
+    g1p, g1c, g2p, g2c = jogos_time[['Gols_Pro_1T', 'Gols_Contra_1T', 'Gols_Pro_2T', 'Gols_Contra_2T']].sum()
+
+    fig = go.Figure(data=[
+        go.Bar(name='Gols Pró', x=['1º Tempo', '2º Tempo'], y=[g1p, g2p], marker_color='#2ecc71'),
+        go.Bar(name='Gols Sofridos', x=['1º Tempo', '2º Tempo'], y=[g1c, g2c], marker_color='#e74c3c')
+    ])
+    fig.update_layout(barmode='group', height=300)
+    return formatar_grafico(fig)
+
+
+def grafico_radar_mando(jogos_time):
+    """Radar de aproveitamento em casa x fora."""
+    # Aproveitamento por mando num groupby só: pontos ganhos / pontos disputados
+    aprov = jogos_time.groupby('Mando')['Pontos'].agg(['sum', 'count'])
+    aprov = (aprov['sum'] / (aprov['count'] * 3) * 100).reindex(['Casa', 'Fora']).fillna(0)
+
+    ac, af = aprov['Casa'], aprov['Fora']
+    # O gráfico aranha precisa repetir o primeiro ponto no final para fechar o ciclo
+    fig = go.Figure(go.Scatterpolar(r=[ac, af, ac], theta=['Jogando em Casa', 'Visitante', 'Jogando em Casa'], fill='toself', line_color='#00539F'))
+    fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 100])), showlegend=False, height=300)
+    return formatar_grafico(fig)
+
+
+def grafico_posicoes(df_posicoes, id_time):
+    """Distribuição da posição final (em quantas simulações o clube terminou em cada lugar)."""
+    dist_pos = df_posicoes.loc[id_time]
+    fig = go.Figure(go.Bar(
+        x=dist_pos.index, y=dist_pos.to_numpy(), marker_color='#00539F',
+        hovertemplate='Posição=%{x}<br>Probabilidade=%{y}<extra></extra>',
+    ))
+    fig.update_layout(height=300, yaxis_tickformat='.0%', xaxis_title='Posição', yaxis_title='Probabilidade')
+    return formatar_grafico(fig)
+
+
+def grafico_forma(forma_time):
+    """Aproveitamento na janela móvel (últimos N jogos) rodada a rodada, com o resultado de cada jogo."""
+    cores = forma_time['Resultado'].map({'V': COR_CASA, 'E': COR_EMPATE, 'D': COR_FORA}).tolist()
+    fig = go.Figure(go.Scatter(
+        x=forma_time['Rodada'], y=forma_time['Aproveitamento_Janela'], mode='lines+markers',
+        line=dict(color='#00539F', width=3), marker=dict(color=cores, size=10),
+        customdata=forma_time[['Resultado', 'Forma']].to_numpy(),
+        hovertemplate=('Rodada=%{x}<br>Aproveitamento na janela=%{y:.0%}<br>'
+                       'Resultado=%{customdata[0]}<br>Forma=%{customdata[1]}<extra></extra>'),
+    ))
+    fig.update_layout(height=300, yaxis=dict(range=[0, 1.05], tickformat='.0%'),
+                      xaxis_title='Rodada', yaxis_title='Aproveitamento (janela)')
+    return formatar_grafico(fig)
@@ -0,0 +1,186 @@
+# ==============================================================================
+# HISTÓRICO MULTI-TEMPORADA / MULTI-COMPETIÇÃO (PARQUET PARTICIONADO)
+# ==============================================================================
+# Os jogos de cada competição e temporada ficam numa partição própria, no
+# formato "hive" (uma pasta por valor):
+#
+#     dados/historico/competicao=BSA/temporada=2023/part-0.parquet
+#     dados/historico/competicao=BSA/temporada=2024/part-0.parquet
+#     dados/historico/competicao=CDB/temporada=2024/part-0.parquet
+#
+# Na leitura, o filtro por competição/temporada é resolvido pelo NOME DAS PASTAS
+# (partições fora do filtro nem são abertas) e os filtros nas colunas descem até
+# o Parquet (predicate pushdown). Dá para ter dez temporadas guardadas e só ler
+# as duas que o modelo precisa.
+#
+# Backfill (uma requisição por competição/temporada, respeitando a cota):
+#     python -m brasileirao.historico --competicoes BSA --temporadas 2015-2024
+import argparse
+import os
+import shutil
+import tempfile
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from brasileirao.etl import achatar_jogos
+
+PASTA_HISTORICO = os.environ.get("BRASILEIRAO_HISTORICO", "dados/historico")
+
+# Esquema das partições: os valores saem do nome das pastas
+PARTICIONAMENTO = ds.partitioning(
+    pa.schema([("competicao", pa.string()), ("temporada", pa.int32())]), flavor="hive"
+)
+
+
+def temporada_do_payload(matches_raw):
+    """Ano de início da temporada de um payload de /matches (filtro pedido ou dado do jogo)."""
+    filtro = matches_raw.get("filters", {}).get("season")
+    if filtro:
+        return int(filtro)
+    for jogo in matches_raw.get("matches", []):
+        inicio = (jogo.get("season") or {}).get("startDate")
+        if inicio:
+            return int(inicio[:4])
+    return None
+
+
+def salvar_temporada(matches_raw, competicao, temporada, pasta=PASTA_HISTORICO):
+    """
+    Grava (ou regrava) a partição competição/temporada com os jogos do payload.
+    Só a partição tocada é substituída; as outras temporadas ficam intactas.
+    """
+    df = achatar_jogos(matches_raw)
+    # Parquet guarda o instante em UTC; o fuso volta na leitura
+    df["Data"] = df["Data"].dt.tz_convert("UTC")
+    # competicao/temporada NÃO vão dentro do arquivo: no formato hive elas saem do nome da pasta
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+
+    # Escrevo a partição direto (pq.write_table) numa pasta temporária e troco no fim.
+    # O write_dataset particionado fazia o pyarrow 15 abortar o processo na saída.
+    destino = os.path.join(pasta, f"competicao={competicao}", f"temporada={int(temporada)}")
+    os.makedirs(os.path.dirname(destino), exist_ok=True)
+    # Prefixo "." = o ds.dataset ignora a pasta enquanto ela não estiver pronta
+    temporaria = tempfile.mkdtemp(prefix=".tmp-", dir=os.path.dirname(destino))
+    pq.write_table(tabela, os.path.join(temporaria, "part-0.parquet"))
+    shutil.rmtree(destino, ignore_errors=True)
+    os.rename(temporaria, destino)
+    return len(df)
+
+
+def backfill(cliente, competicoes, temporadas, pasta=PASTA_HISTORICO, pular_existentes=True):
+    """
+    Baixa /competitions/{codigo}/matches?season={ano} para cada combinação e
+    grava cada uma na sua partição. Temporada que já está no disco é pulada
+    (a não ser que pular_existentes=False), então dá para rodar de novo sem gastar cota.
+    """
+    existentes = set(listar_particoes(pasta)) if pular_existentes else set()
+    pedidos = {
+        (competicao, temporada): (f"/competitions/{competicao}/matches", {"season": temporada})
+        for competicao in competicoes for temporada in temporadas
+        if (competicao, temporada) not in existentes
+    }
+    gravadas = {}
+
+    def gravar(chave, matches):
+        gravadas[chave] = salvar_temporada(matches, *chave, pasta)
+
+    # Os downloads saem em paralelo (o limitador de cota do cliente segura o ritmo) e
+    # cada temporada é gravada assim que chega: se uma falhar, as outras já estão no disco
+    cliente.get_varios(pedidos, ao_chegar=gravar)
+    return gravadas
+
+
+def listar_particoes(pasta=PASTA_HISTORICO):
+    """Lista (competição, temporada) disponíveis olhando só as pastas, sem abrir arquivo nenhum."""
+    particoes = []
+    if not os.path.isdir(pasta):
+        return particoes
+    for pasta_comp in sorted(os.listdir(pasta)):
+        if not pasta_comp.startswith("competicao="):
+            continue
+        for pasta_temp in sorted(os.listdir(os.path.join(pasta, pasta_comp))):
+            if pasta_temp.startswith("temporada="):
+                particoes.append((pasta_comp.split("=", 1)[1], int(pasta_temp.split("=", 1)[1])))
+    return particoes
+
+
+def carregar_historico(competicoes=None, temporadas=None, pasta=PASTA_HISTORICO,
+                       colunas=None, somente_finalizados=True):
+    """
+    Lê só as partições pedidas e devolve um DataFrame (mesmas colunas do
+    achatar_jogos + competicao/temporada). Sem histórico gravado, devolve vazio.
+    """
+    if not listar_particoes(pasta):
+        return achatar_jogos({"matches": []}).assign(competicao=None, temporada=None)
+
+    dataset = ds.dataset(pasta, format="parquet", partitioning=PARTICIONAMENTO)
+    filtro = None
+    if competicoes is not None:
+        filtro = ds.field("competicao").isin(list(competicoes))
+    if temporadas is not None:
+        condicao = ds.field("temporada").isin([int(t) for t in temporadas])
+        filtro = condicao if filtro is None else filtro & condicao
+    if somente_finalizados:
+        condicao = ds.field("Status") == "FINISHED"
+        filtro = condicao if filtro is None else filtro & condicao
+
+    df = dataset.to_table(columns=colunas, filter=filtro).to_pandas()
+    if "Data" in df.columns:
+        df["Data"] = df["Data"].dt.tz_convert("America/Sao_Paulo")
+    return df
+
+
+def historico_para_modelo(matches_raw, competicao="BSA", temporadas_anteriores=1, pasta=PASTA_HISTORICO):
+    """
+    Jogos finalizados das N temporadas ANTERIORES à do payload atual, só com as
+    colunas que o modelo de forças usa. É o que o snapshot passa para o
+    calcular_forca_times no começo do campeonato.
+    """
+    temporada = temporada_do_payload(matches_raw)
+    if temporada is None or temporadas_anteriores <= 0:
+        return None
+    anteriores = range(temporada - temporadas_anteriores, temporada)
+    return carregar_historico(
+        [competicao], anteriores, pasta,
+        colunas=["Home_ID", "Away_ID", "Gols_Home", "Gols_Away", "Data"],
+    )
+
+
+def _intervalo_temporadas(texto):
+    """'2015-2024' -> [2015, ..., 2024]; '2023,2024' -> [2023, 2024]."""
+    anos = []
+    for parte in texto.split(","):
+        if "-" in parte:
+            inicio, fim = parte.split("-")
+            anos.extend(range(int(inicio), int(fim) + 1))
+        else:
+            anos.append(int(parte))
+    return anos
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill do histórico de jogos por competição e temporada.")
+    parser.add_argument("--competicoes", nargs="+", default=["BSA"], help="Códigos da football-data.org.")
+    parser.add_argument("--temporadas", required=True, type=_intervalo_temporadas,
+                        help="Ex.: 2015-2024 ou 2022,2023,2024 (ano de início da temporada).")
+    parser.add_argument("--pasta", default=PASTA_HISTORICO)
+    parser.add_argument("--regravar", action="store_true", help="Baixa de novo mesmo as temporadas já gravadas.")
+    args = parser.parse_args(argv)
+
+    api_key = os.environ.get("FOOTBALL_DATA_API_KEY")
+    if not api_key:
+        parser.error("defina a variável de ambiente FOOTBALL_DATA_API_KEY")
+    # O cliente HTTP (requests) só é carregado por quem baixa: quem só lê o histórico não paga o import
+    from brasileirao.api import BASE_URL, ClienteFootballData
+    cliente = ClienteFootballData(api_key, os.environ.get("FOOTBALL_DATA_BASE_URL", BASE_URL))
+
+    gravadas = backfill(cliente, args.competicoes, args.temporadas, args.pasta, pular_existentes=not args.regravar)
+    for (competicao, temporada), n_jogos in gravadas.items():
+        print(f"{competicao} {temporada}: {n_jogos} jogos")
+    print(f"{len(gravadas)} partições gravadas em {args.pasta}")
+
+
+if __name__ == "__main__":
+    main()
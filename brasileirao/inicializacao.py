@@ -0,0 +1,182 @@
+# ==============================================================================
+# RELATÓRIO DE COLD START (IMPORTS, PRIMEIRA PINTURA, SERVIDOR PRONTO)
+# ==============================================================================
+# Réplica nova (autoscaling, deploy) = processo Python do zero: todo import é pago
+# de novo pela primeira sessão. Este relatório mede, num interpretador limpo:
+#   - quanto tempo cada pacote pesado leva para importar (python -X importtime);
+#   - a primeira execução do dashboard (imports + página inteira desenhada), com o
+#     app lendo um snapshot sintético, que é o caminho de produção;
+#   - opcionalmente (--servidor), quanto o `streamlit run` leva até responder o health check.
+#
+#     python -m brasileirao.inicializacao --saida inicializacao.json --orcamento-pintura 4
+#
+# Com --orcamento-*, o código de saída é 1 se alguma marca estourar (bom para CI e
+# para o build da imagem Docker, ver Dockerfile).
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+SCRIPT_PADRAO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "brasileiro_serie_A.py")
+# Pacotes que aparecem no relatório mesmo se forem importados por outro (dependências "de peso")
+PACOTES_PESADOS = ("streamlit", "pandas", "numpy", "pyarrow", "plotly", "plotly.express", "scipy",
+                   "scipy.stats", "scipy.optimize", "requests", "brasileirao")
+
+# Roda num interpretador novo: importa o AppTest e executa o dashboard uma vez (e um rerun)
+_CODIGO_PRIMEIRA_PINTURA = """
+import json, sys, time
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+pronto_para_rodar = time.perf_counter()
+app = AppTest.from_file(sys.argv[1], default_timeout=float(sys.argv[2]))
+app.run()
+primeira = time.perf_counter()
+app.run()
+segunda = time.perf_counter()
+from brasileirao import metricas
+print(json.dumps({
+    "streamlit_import_s": pronto_para_rodar - inicio,
+    "primeira_execucao_s": primeira - pronto_para_rodar,
+    "rerun_s": segunda - primeira,
+    "marcas_app": metricas.inicializacao(),
+    "excecoes": [str(e.value) for e in app.exception],
+}))
+"""
+
+
+def _ler_importtime(stderr):
+    """
+    Saída do -X importtime -> {modulo: segundos acumulados}. Cada linha é
+    'import time: self | cumulative | nome' (indentação no nome = profundidade).
+    """
+    tempos = {}
+    for linha in stderr.splitlines():
+        if not linha.startswith("import time:") or "cumulative" in linha:
+            continue
+        _, acumulado, nome = linha[len("import time:"):].split("|")
+        nome = nome.strip()
+        # Um módulo pode aparecer mais de uma vez (reimport em outro contexto): fico com o maior
+        tempos[nome] = max(tempos.get(nome, 0.0), int(acumulado) / 1e6)
+    return tempos
+
+
+def gerar_snapshot_sintetico(pasta, seed=0):
+    """Snapshot de uma temporada sintética (metade jogada) para o app ler como em produção."""
+    from brasileirao.sintetico import gerar_temporada
+    from brasileirao.snapshot import montar_snapshot, salvar_snapshot
+    standings, matches = gerar_temporada(seed=seed)
+    salvar_snapshot(montar_snapshot(standings, matches, n_simulacoes=20_000, seed=seed), pasta)
+    return pasta
+
+
+def medir_primeira_pintura(script=SCRIPT_PADRAO, pasta_snapshots=None, timeout=120):
+    """Executa o dashboard num processo novo (com -X importtime) e devolve as marcas de tempo."""
+    ambiente = dict(os.environ)
+    if pasta_snapshots:
+        ambiente["BRASILEIRAO_SNAPSHOTS"] = pasta_snapshots
+    inicio = time.perf_counter()
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CODIGO_PRIMEIRA_PINTURA, script, str(timeout)],
+        capture_output=True, text=True, env=ambiente, timeout=timeout * 2,
+    )
+    total = time.perf_counter() - inicio
+    if processo.returncode != 0:
+        raise RuntimeError(f"o dashboard não rodou:\n{processo.stderr[-2000:]}")
+    resultado = json.loads(processo.stdout.strip().splitlines()[-1])
+    imports = _ler_importtime(processo.stderr)
+    resultado["processo_total_s"] = total
+    resultado["imports_s"] = {nome: round(imports[nome], 4) for nome in PACOTES_PESADOS if nome in imports}
+    resultado["pesados_nao_carregados"] = [nome for nome in PACOTES_PESADOS if nome not in imports]
+    return resultado
+
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def medir_servidor(script=SCRIPT_PADRAO, pasta_snapshots=None, timeout=60):
+    """Segundos entre o `streamlit run` e o primeiro 200 no /_stcore/health."""
+    porta = _porta_livre()
+    ambiente = dict(os.environ)
+    if pasta_snapshots:
+        ambiente["BRASILEIRAO_SNAPSHOTS"] = pasta_snapshots
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", script, "--server.headless=true",
+         f"--server.port={porta}", "--server.address=127.0.0.1", "--browser.gatherUsageStats=false"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=ambiente,
+    )
+    try:
+        while time.perf_counter() - inicio < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{porta}/_stcore/health", timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - inicio
+            except OSError:
+                time.sleep(0.05)
+        raise TimeoutError(f"o servidor não respondeu em {timeout}s")
+    finally:
+        processo.terminate()
+        processo.wait(timeout=10)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Relatório de cold start do dashboard (imports e primeira pintura).")
+    parser.add_argument("--script", default=SCRIPT_PADRAO, help="Script do Streamlit.")
+    parser.add_argument("--snapshots", default=None,
+                        help="Pasta de snapshots para o app ler (padrão: gera um sintético numa pasta temporária).")
+    parser.add_argument("--servidor", action="store_true", help="Mede também o `streamlit run` até o health check.")
+    parser.add_argument("--saida", default=None, help="Grava o relatório em JSON.")
+    parser.add_argument("--orcamento-imports", type=float, default=None,
+                        help="Máximo (s) para os imports do app na primeira execução.")
+    parser.add_argument("--orcamento-pintura", type=float, default=None,
+                        help="Máximo (s) para a primeira pintura (imports + página desenhada).")
+    parser.add_argument("--orcamento-servidor", type=float, default=None,
+                        help="Máximo (s) para o servidor responder o health check (precisa de --servidor).")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as temporaria:
+        pasta = args.snapshots or gerar_snapshot_sintetico(temporaria)
+        relatorio = medir_primeira_pintura(args.script, pasta)
+        if args.servidor:
+            relatorio["servidor_pronto_s"] = medir_servidor(args.script, pasta)
+
+    marcas = relatorio["marcas_app"]
+    print(f"Imports do app (1ª execução): {marcas.get('imports', float('nan')):.3f}s")
+    print(f"Primeira pintura:             {marcas.get('primeira_pintura', float('nan')):.3f}s")
+    print(f"Rerun seguinte:               {relatorio['rerun_s']:.3f}s")
+    if "servidor_pronto_s" in relatorio:
+        print(f"Servidor pronto (health):     {relatorio['servidor_pronto_s']:.3f}s")
+    print("Imports (acumulado, s): " + ", ".join(f"{k}={v:.3f}" for k, v in relatorio["imports_s"].items()))
+    if relatorio["pesados_nao_carregados"]:
+        print("Não carregados na primeira pintura: " + ", ".join(relatorio["pesados_nao_carregados"]))
+    if relatorio["excecoes"]:
+        print("EXCEÇÕES no app: " + " | ".join(relatorio["excecoes"]))
+
+    estouros = []
+    for nome, orcamento, valor in (
+        ("imports", args.orcamento_imports, marcas.get("imports")),
+        ("primeira_pintura", args.orcamento_pintura, marcas.get("primeira_pintura")),
+        ("servidor_pronto", args.orcamento_servidor, relatorio.get("servidor_pronto_s")),
+    ):
+        if orcamento is not None and (valor is None or valor > orcamento):
+            estouros.append(f"{nome}: {valor if valor is not None else '?'}s > {orcamento}s")
+    relatorio["orcamento_estourado"] = estouros
+
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(relatorio, f, ensure_ascii=False, indent=2)
+    if estouros:
+        print("ORÇAMENTO ESTOURADO:\n  - " + "\n  - ".join(estouros))
+    return 1 if estouros or relatorio["excecoes"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+# ==============================================================================
+# EXECUÇÃO EM LOTE (VÁRIAS COMPETIÇÕES, SEM STREAMLIT)
+# ==============================================================================
+# Para o job noturno: classificação, forças, previsões e projeção de uma ou várias
+# competições, gravadas em CSV/JSON/Parquet, sem subir processo de interface.
+#
+#     python -m brasileirao --competicoes BSA PL PD --formatos csv parquet --saida dados/lote
+#
+# A busca na API fica no processo principal (um cliente só, então o token bucket
+# segura a cota de TODAS as competições juntas). O processamento de cada competição
+# (ETL -> forças -> previsões -> Monte Carlo, o mesmo montar_snapshot do dashboard)
+# vai para um pool de processos: cada competição ocupa um núcleo.
+#
+# Com --entrada, os payloads são lidos do disco (<entrada>/<codigo>/standings.json
+# e matches.json) em vez da API: dá para rodar o lote sem chave e sem rede.
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from brasileirao.api import BASE_URL, ClienteFootballData, buscar_competicao
+from brasileirao.historico import PASTA_HISTORICO, historico_para_modelo
+from brasileirao.snapshot import MODELOS, montar_snapshot
+
+FORMATOS = ("csv", "json", "parquet")
+
+
+def carregar_payloads(pasta, codigo):
+    """(standings_raw, matches_raw) gravados em <pasta>/<codigo>/ (mesmo formato da API)."""
+    with open(os.path.join(pasta, codigo, "standings.json"), encoding="utf-8") as f:
+        standings = json.load(f)
+    with open(os.path.join(pasta, codigo, "matches.json"), encoding="utf-8") as f:
+        matches = json.load(f)
+    return standings, matches
+
+
+def buscar_payloads(codigos, cliente=None, pasta_entrada=None, temporada=None):
+    """
+    Payloads de todas as competições: {codigo: (standings, matches) ou a exceção}.
+    Da API, as competições saem em paralelo dividindo o mesmo cliente (e a mesma cota);
+    uma competição que falha (403 fora do plano, 404...) não derruba as outras.
+    """
+    def buscar(codigo):
+        try:
+            if pasta_entrada:
+                return carregar_payloads(pasta_entrada, codigo)
+            return buscar_competicao(cliente, codigo, temporada)
+        except Exception as erro:
+            return erro
+
+    with ThreadPoolExecutor(max_workers=max(1, len(codigos))) as pool:
+        return dict(zip(codigos, pool.map(buscar, codigos)))
+
+
+def processar_competicao(codigo, standings_raw, matches_raw, n_simulacoes=20_000, modelo="dixon_coles",
+                         temporadas_anteriores=1, pasta_historico=PASTA_HISTORICO, seed=None):
+    """
+    Roda o pipeline de uma competição e devolve as tabelas de saída, já "planas"
+    (ID como coluna, nomes como texto), prontas para CSV/JSON/Parquet.
+    Função de módulo (e não closure) porque vai para o pool de processos.
+    """
+    df_historico = historico_para_modelo(matches_raw, codigo, temporadas_anteriores, pasta_historico)
+    snapshot = montar_snapshot(standings_raw, matches_raw, n_simulacoes=n_simulacoes, seed=seed,
+                               df_historico=df_historico, modelo=modelo)
+    nomes = snapshot.times[['Time', 'Sigla']]
+
+    previsoes = snapshot.agendados.join(snapshot.previsoes)
+    previsoes = previsoes[['ID_Jogo', 'Rodada', 'Data', 'Home_ID', 'Home', 'Away_ID', 'Away', 'Lambda_Casa',
+                           'Lambda_Fora', 'Prob_Casa', 'Prob_Empate', 'Prob_Fora']].sort_values(['Rodada', 'Data'])
+    tabelas = {
+        "classificacao": snapshot.tabela,
+        "forcas": nomes.join(snapshot.forcas, how='right').reset_index(),
+        "previsoes": previsoes,
+        "projecao": nomes.join(snapshot.projecao, how='right').sort_values(
+            'Pontos_Esperados', ascending=False).reset_index(),
+    }
+    for nome, df in tabelas.items():
+        # Categorias viram texto: o CSV/JSON não ligam, mas o Parquet guardaria o dicionário inteiro
+        colunas = df.select_dtypes('category').columns
+        tabelas[nome] = df.astype({c: str for c in colunas}).reset_index(drop=True)
+    return {"versao": snapshot.versao, "modelo": modelo, "rho": snapshot.metadados.get("rho", 0.0),
+            "tabelas": tabelas}
+
+
+def gravar_tabelas(tabelas, pasta, formatos=FORMATOS):
+    """Grava cada tabela em cada formato (<pasta>/<tabela>.<formato>). Devolve os caminhos."""
+    os.makedirs(pasta, exist_ok=True)
+    caminhos = []
+    for nome, df in tabelas.items():
+        for formato in formatos:
+            caminho = os.path.join(pasta, f"{nome}.{formato}")
+            if formato == "csv":
+                df.to_csv(caminho, index=False)
+            elif formato == "json":
+                df.to_json(caminho, orient="records", date_format="iso", force_ascii=False, indent=1)
+            elif formato == "parquet":
+                df.to_parquet(caminho, index=False)
+            else:
+                raise ValueError(f"formato desconhecido: {formato}")
+            caminhos.append(caminho)
+    return caminhos
+
+
+def rodar_lote(payloads, pasta_saida, formatos=FORMATOS, n_processos=None, **opcoes):
+    """
+    Processa as competições (em paralelo se n_processos > 1) e grava as saídas em
+    <pasta_saida>/<codigo>/. Devolve o resumo (também gravado em resumo.json).
+    """
+    resumo = {"gerado_em": datetime.now(timezone.utc).isoformat(timespec="seconds"), "competicoes": {}}
+    validos = {codigo: p for codigo, p in payloads.items() if not isinstance(p, Exception)}
+    for codigo, erro in payloads.items():
+        if isinstance(erro, Exception):
+            resumo["competicoes"][codigo] = {"erro": f"busca: {erro}"}
+
+    inicio = time.perf_counter()
+    if n_processos and n_processos > 1 and len(validos) > 1:
+        with ProcessPoolExecutor(max_workers=min(n_processos, len(validos))) as pool:
+            futuros = {codigo: pool.submit(processar_competicao, codigo, s, m, **opcoes)
+                       for codigo, (s, m) in validos.items()}
+            resultados = {}
+            for codigo, futuro in futuros.items():
+                try:
+                    resultados[codigo] = futuro.result()
+                except Exception as erro:
+                    resultados[codigo] = erro
+    else:
+        resultados = {}
+        for codigo, (s, m) in validos.items():
+            try:
+                resultados[codigo] = processar_competicao(codigo, s, m, **opcoes)
+            except Exception as erro:
+                resultados[codigo] = erro
+
+    for codigo, resultado in resultados.items():
+        if isinstance(resultado, Exception):
+            resumo["competicoes"][codigo] = {"erro": f"processamento: {resultado!r}"}
+            continue
+        arquivos = gravar_tabelas(resultado["tabelas"], os.path.join(pasta_saida, codigo), formatos)
+        resumo["competicoes"][codigo] = {
+            "versao": resultado["versao"], "modelo": resultado["modelo"], "rho": resultado["rho"],
+            "linhas": {nome: len(df) for nome, df in resultado["tabelas"].items()},
+            "arquivos": [os.path.relpath(a, pasta_saida) for a in arquivos],
+        }
+    resumo["duracao_s"] = round(time.perf_counter() - inicio, 3)
+
+    os.makedirs(pasta_saida, exist_ok=True)
+    with open(os.path.join(pasta_saida, "resumo.json"), "w", encoding="utf-8") as f:
+        json.dump(resumo, f, ensure_ascii=False, indent=2)
+    return resumo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Classificação, forças, previsões e projeção de várias competições (sem Streamlit).")
+    parser.add_argument("--competicoes", nargs="+", default=["BSA"], help="Códigos da football-data.org.")
+    parser.add_argument("--temporada", type=int, default=None, help="Temporada (padrão: a atual).")
+    parser.add_argument("--saida", default="dados/lote", help="Pasta de saída (uma subpasta por competição).")
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=["csv"], help="Formatos de saída.")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(),
+                        help="Competições processadas ao mesmo tempo (1 = sem pool).")
+    parser.add_argument("--simulacoes", type=int, default=20_000, help="Temporadas do Monte Carlo por competição.")
+    parser.add_argument("--modelo", choices=MODELOS, default="dixon_coles", help="Modelo de forças.")
+    parser.add_argument("--historico", default=PASTA_HISTORICO, help="Pasta do histórico particionado.")
+    parser.add_argument("--temporadas-anteriores", type=int, default=1,
+                        help="Quantas temporadas passadas entram nas forças (0 desliga).")
+    parser.add_argument("--entrada", default=None,
+                        help="Lê <entrada>/<codigo>/standings.json e matches.json em vez de chamar a API.")
+    parser.add_argument("--seed", type=int, default=None, help="Semente do Monte Carlo (saída reprodutível).")
+    args = parser.parse_args(argv)
+
+    cliente = None
+    if not args.entrada:
+        api_key = os.environ.get("FOOTBALL_DATA_API_KEY")
+        if not api_key:
+            parser.error("defina a variável de ambiente FOOTBALL_DATA_API_KEY (ou use --entrada)")
+        cliente = ClienteFootballData(api_key, os.environ.get("FOOTBALL_DATA_BASE_URL", BASE_URL))
+
+    payloads = buscar_payloads(args.competicoes, cliente, args.entrada, args.temporada)
+    resumo = rodar_lote(
+        payloads, args.saida, formatos=args.formatos, n_processos=args.processos,
+        n_simulacoes=args.simulacoes, modelo=args.modelo, temporadas_anteriores=args.temporadas_anteriores,
+        pasta_historico=args.historico, seed=args.seed,
+    )
+
+    falhas = 0
+    for codigo, info in resumo["competicoes"].items():
+        if "erro" in info:
+            falhas += 1
+            print(f"{codigo}: ERRO ({info['erro']})")
+        else:
+            linhas = ", ".join(f"{nome}={n}" for nome, n in info["linhas"].items())
+            print(f"{codigo}: versão {info['versao']} ({linhas})")
+    print(f"Saída em {args.saida} ({resumo['duracao_s']:.1f}s)")
+    # Código de saída != 0 para o cron/CI perceber que alguma competição falhou
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+# ==============================================================================
+# INSTRUMENTAÇÃO DOS CAMINHOS QUENTES (TEMPOS, CONTADORES, TAMANHOS)
+# ==============================================================================
+# Quando uma página fica lenta em produção, a pergunta é sempre "lento ONDE?":
+# na API, na conversão do JSON, no modelo ou no Plotly. Aqui fica um registro
+# único por processo (compartilhado por todas as sessões do Streamlit) com:
+#   - histogramas de tempo (medir / @cronometrado) por etapa;
+#   - contadores (acerto/falha de cache, respostas 304 da API...);
+#   - valores observados (tamanho do payload em bytes...);
+#   - os últimos reruns do dashboard, com o tempo de cada etapa dentro deles.
+#
+# Saídas: texto no formato do Prometheus (exportar_prometheus, servido por
+# iniciar_servidor_metricas) e uma linha de log JSON por rerun (logger
+# "brasileirao.metricas"; BRASILEIRAO_LOG_METRICAS=1 liga a saída no stderr).
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("brasileirao.metricas")
+
+# Limites dos baldes do histograma, em segundos (parecidos com os padrões do Prometheus)
+BALDES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Quantos reruns recentes ficam guardados para o painel
+RERUNS_GUARDADOS = 200
+PREFIXO = "brasileirao_"
+
+
+def _chave(nome, rotulos):
+    return nome, tuple(sorted((k, str(v)) for k, v in rotulos.items()))
+
+
+class _Histograma:
+    __slots__ = ("baldes", "soma", "contagem", "maximo")
+
+    def __init__(self):
+        self.baldes = [0] * len(BALDES)
+        self.soma = 0.0
+        self.contagem = 0
+        self.maximo = 0.0
+
+    def observar(self, valor):
+        for i, limite in enumerate(BALDES):
+            if valor <= limite:
+                self.baldes[i] += 1
+                break
+        self.soma += valor
+        self.contagem += 1
+        self.maximo = max(self.maximo, valor)
+
+
+class RegistroMetricas:
+    """Registro em memória, protegido por lock (várias sessões escrevem ao mesmo tempo)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tempos = {}
+        self._contadores = {}
+        self._valores = {}
+        self._reruns = deque(maxlen=RERUNS_GUARDADOS)
+        # Etapas medidas dentro do rerun em andamento (uma lista por thread/sessão)
+        self._local = threading.local()
+
+    # --- escrita -------------------------------------------------------------
+    def observar_tempo(self, nome, segundos, **rotulos):
+        with self._lock:
+            self._tempos.setdefault(_chave(nome, rotulos), _Histograma()).observar(segundos)
+        etapas = getattr(self._local, "etapas", None)
+        if etapas is not None:
+            etapas.append((nome, rotulos, segundos))
+
+    def contar(self, nome, valor=1, **rotulos):
+        with self._lock:
+            chave = _chave(nome, rotulos)
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def registrar_valor(self, nome, valor, **rotulos):
+        """Último valor + soma/contagem (ex.: tamanho do payload em bytes)."""
+        with self._lock:
+            atual = self._valores.setdefault(_chave(nome, rotulos), {"ultimo": 0, "soma": 0, "contagem": 0})
+            atual["ultimo"] = valor
+            atual["soma"] += valor
+            atual["contagem"] += 1
+
+    @contextmanager
+    def medir(self, nome, **rotulos):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar_tempo(nome, time.perf_counter() - inicio, **rotulos)
+
+    # --- reruns do dashboard -------------------------------------------------
+    def iniciar_rerun(self):
+        self._local.etapas = []
+        self._local.inicio = time.perf_counter()
+
+    def rerun_em_andamento(self):
+        """True se a thread atual está dentro de um rerun aberto (entre iniciar e finalizar)."""
+        return getattr(self._local, "inicio", None) is not None
+
+    def finalizar_rerun(self, **rotulos):
+        """Fecha o rerun da thread atual, guarda o detalhamento e solta uma linha de log JSON."""
+        inicio = getattr(self._local, "inicio", None)
+        if inicio is None:
+            return None
+        total = time.perf_counter() - inicio
+        etapas = self._local.etapas
+        self._local.etapas = self._local.inicio = None
+
+        registro = {
+            "evento": "rerun",
+            "em": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "total_s": round(total, 6),
+            **rotulos,
+            "etapas": [
+                {"nome": nome, **rot, "segundos": round(segundos, 6)} for nome, rot, segundos in etapas
+            ],
+        }
+        self.observar_tempo("rerun_segundos", total, **rotulos)
+        with self._lock:
+            self._reruns.append(registro)
+        logger.info(json.dumps(registro, ensure_ascii=False))
+        return registro
+
+    # --- leitura -------------------------------------------------------------
+    def reruns(self):
+        with self._lock:
+            return list(self._reruns)
+
+    def resumo(self):
+        """Tudo num dicionário simples (JSON-serializável), para o painel e para exportar."""
+        with self._lock:
+            tempos = [
+                {"nome": nome, **dict(rotulos), "contagem": h.contagem, "soma_s": round(h.soma, 6),
+                 "media_s": round(h.soma / h.contagem, 6) if h.contagem else 0.0, "max_s": round(h.maximo, 6)}
+                for (nome, rotulos), h in sorted(self._tempos.items())
+            ]
+            contadores = [{"nome": nome, **dict(rotulos), "valor": v}
+                          for (nome, rotulos), v in sorted(self._contadores.items())]
+            valores = [{"nome": nome, **dict(rotulos), **v} for (nome, rotulos), v in sorted(self._valores.items())]
+        return {"tempos": tempos, "contadores": contadores, "valores": valores}
+
+    def exportar_json(self):
+        return json.dumps({**self.resumo(), "reruns": self.reruns()}, ensure_ascii=False, indent=2)
+
+    def exportar_prometheus(self):
+        """Formato texto 0.0.4 do Prometheus (o que um scrape em /metrics espera)."""
+        linhas = []
+        with self._lock:
+            tempos = sorted(self._tempos.items())
+            contadores = sorted(self._contadores.items())
+            valores = sorted(self._valores.items())
+
+        vistos = set()
+        for (nome, rotulos), h in tempos:
+            metrica = f"{PREFIXO}{nome}"
+            if metrica not in vistos:
+                linhas.append(f"# TYPE {metrica} histogram")
+                vistos.add(metrica)
+            acumulado = 0
+            for limite, n in zip(BALDES, h.baldes):
+                acumulado += n
+                linhas.append(f"{metrica}_bucket{_rotulos(rotulos, le=limite)} {acumulado}")
+            linhas.append(f"{metrica}_bucket{_rotulos(rotulos, le='+Inf')} {h.contagem}")
+            linhas.append(f"{metrica}_sum{_rotulos(rotulos)} {h.soma:.6f}")
+            linhas.append(f"{metrica}_count{_rotulos(rotulos)} {h.contagem}")
+        for (nome, rotulos), valor in contadores:
+            metrica = f"{PREFIXO}{nome}_total"
+            if metrica not in vistos:
+                linhas.append(f"# TYPE {metrica} counter")
+                vistos.add(metrica)
+            linhas.append(f"{metrica}{_rotulos(rotulos)} {valor}")
+        for (nome, rotulos), v in valores:
+            metrica = f"{PREFIXO}{nome}"
+            if metrica not in vistos:
+                linhas.append(f"# TYPE {metrica} gauge")
+                vistos.add(metrica)
+            linhas.append(f"{metrica}{_rotulos(rotulos)} {v['ultimo']}")
+        return "\n".join(linhas) + "\n"
+
+    def limpar(self):
+        with self._lock:
+            self._tempos.clear()
+            self._contadores.clear()
+            self._valores.clear()
+            self._reruns.clear()
+
+
+def _escapar_rotulo(valor):
+    # Formato de texto 0.0.4 do Prometheus: \\, \" e \n. Sem isso, uma chave de cache
+    # com aspas (ou quebra de linha) invalidava o /metrics inteiro
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _rotulos(rotulos, **extras):
+    pares = list(rotulos) + [(k, v) for k, v in extras.items()]
+    if not pares:
+        return ""
+    texto = ",".join(f'{k}="{_escapar_rotulo(v)}"' for k, v in pares)
+    return "{" + texto + "}"
+
+
+# Registro padrão do processo: é o que o pacote e o app usam
+REGISTRO = RegistroMetricas()
+medir = REGISTRO.medir
+observar_tempo = REGISTRO.observar_tempo
+contar = REGISTRO.contar
+registrar_valor = REGISTRO.registrar_valor
+
+# Marcas de cold start já registradas neste processo (etapa -> segundos)
+_INICIALIZACAO = {}
+_lock_inicializacao = threading.Lock()
+
+
+def registrar_inicializacao(etapa, segundos):
+    """
+    Tempo de cold start (imports, primeira pintura...). Só a PRIMEIRA marca de cada
+    etapa no processo vale: nas execuções seguintes os módulos já estão carregados e
+    o número não diz nada. Vira o gauge inicializacao_segundos{etapa=...} e uma linha
+    de log JSON. Devolve True se foi registrada agora.
+    """
+    with _lock_inicializacao:
+        if etapa in _INICIALIZACAO:
+            return False
+        _INICIALIZACAO[etapa] = segundos
+    registrar_valor("inicializacao_segundos", round(segundos, 6), etapa=etapa)
+    logger.info(json.dumps({"evento": "inicializacao", "etapa": etapa, "segundos": round(segundos, 6)}))
+    return True
+
+
+def inicializacao():
+    """Marcas de cold start deste processo ({etapa: segundos})."""
+    with _lock_inicializacao:
+        return dict(_INICIALIZACAO)
+
+
+def cronometrado(nome=None, **rotulos):
+    """Decorator: cada chamada da função entra no histograma `nome` (padrão: <função>_segundos)."""
+    def decorador(funcao):
+        metrica = nome or f"{funcao.__name__}_segundos"
+
+        @functools.wraps(funcao)
+        def embrulho(*args, **kwargs):
+            with REGISTRO.medir(metrica, **rotulos):
+                return funcao(*args, **kwargs)
+        return embrulho
+    return decorador
+
+
+def configurar_log_json():
+    """Liga as linhas de log JSON no stderr se BRASILEIRAO_LOG_METRICAS estiver definida."""
+    if os.environ.get("BRASILEIRAO_LOG_METRICAS") and not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+class _HandlerMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics":
+            corpo, tipo = REGISTRO.exportar_prometheus(), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?")[0] == "/metrics.json":
+            corpo, tipo = REGISTRO.exportar_json(), "application/json; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        dados = corpo.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, formato, *args):
+        # Scrape a cada 15s não precisa poluir o log do container
+        pass
+
+
+def iniciar_servidor_metricas(porta, endereco="127.0.0.1"):
+    """
+    Sobe /metrics (Prometheus) e /metrics.json numa thread daemon. O Streamlit não
+    deixa pendurar rotas próprias no servidor dele, por isso a porta separada.
+    Por padrão só escuta na própria máquina: as métricas não têm autenticação, então
+    abrir para fora (endereco="0.0.0.0") tem que ser escolha de quem sobe o app.
+    """
+    servidor = ThreadingHTTPServer((endereco, int(porta)), _HandlerMetricas)
+    threading.Thread(target=servidor.serve_forever, name="servidor-metricas", daemon=True).start()
+    return servidor
@@ -0,0 +1,189 @@
+# ==============================================================================
+# MODELAGEM ESTATÍSTICA (FORÇAS + POISSON)
+# ==============================================================================
+import numpy as np
+import pandas as pd
+
+from brasileirao.metricas import cronometrado
+
+# Piso do fator tau do Dixon-Coles. O LIMITES_RHO não basta: com lambdas altos o tau
+# do 0x0 (1 - lamb_casa * lamb_fora * rho) ou do 0x1/1x0 (1 + lamb * rho, rho < 0)
+# passa de zero mesmo com o rho no limite (1 - 3.2 * 2.0 * 0.2 = -0.28)
+TAU_MINIMO = 1e-6
+
+def _media_ponderada(jogos, chave, coluna):
+    """Média de 'coluna' por time ('chave'), usando a coluna Peso de cada jogo."""
+    soma = (jogos[coluna] * jogos['Peso']).groupby(jogos[chave]).sum()
+    return soma / jogos.groupby(chave)['Peso'].sum()
+
+@cronometrado()
+def calcular_forca_times(df_finalizados, df_historico=None, peso_historico=0.5):
+    """
+    Calcula o 'Power Ranking' de Ataque e Defesa.
+    Se a média da liga é 1.0 gol/jogo e o Flamengo faz 2.0, a força de ataque dele é 2.0.
+    O índice do DataFrame de forças é o ID do time (ver montar_registro_times).
+    
+    Com df_historico (jogos finalizados de temporadas anteriores, lidos do
+    historico.py), o passado entra na média com peso menor (peso_historico).
+    Assim o modelo não começa do zero em abril.
+    """
+    colunas = ['Home_ID', 'Away_ID', 'Gols_Home', 'Gols_Away']
+    partes = []
+    if not df_finalizados.empty:
+        partes.append(df_finalizados[colunas].assign(Peso=1.0))
+    if df_historico is not None and not df_historico.empty:
+        partes.append(df_historico[colunas].assign(Peso=peso_historico))
+    if not partes: return None, 0, 0
+    jogos = pd.concat(partes, ignore_index=True)
+    
+    # Médias gerais do campeonato
+    peso_total = jogos['Peso'].sum()
+    media_gols_mandante = (jogos['Gols_Home'] * jogos['Peso']).sum() / peso_total
+    media_gols_visitante = (jogos['Gols_Away'] * jogos['Peso']).sum() / peso_total
+    
+    # Médias de cada time
+    # Agrupo pelo ID inteiro do time (bem mais barato que agrupar por texto)
+    home_stats = _media_ponderada(jogos, 'Home_ID', 'Gols_Home')
+    away_stats = _media_ponderada(jogos, 'Away_ID', 'Gols_Away')
+    home_def = _media_ponderada(jogos, 'Home_ID', 'Gols_Away') # Quanto toma em casa
+    away_def = _media_ponderada(jogos, 'Away_ID', 'Gols_Home') # Quanto toma fora
+    
+    # DataFrame final com os multiplicadores de força
+    forcas = pd.DataFrame({
+        'Ataque_Casa': home_stats / media_gols_mandante,
+        'Ataque_Fora': away_stats / media_gols_visitante,
+        'Defesa_Casa': home_def / media_gols_visitante,
+        'Defesa_Fora': away_def / media_gols_mandante
+    }).fillna(1) # Se der erro de divisão por zero, assume força média (1)
+    forcas.index.name = 'ID'
+    
+    return forcas, media_gols_mandante, media_gols_visitante
+
+def calcular_pmf_poisson(lambdas, max_gols=10, corrigir_cauda=True):
+    """
+    Poisson vetorizado em NumPy puro: recebe um vetor de lambdas e devolve uma
+    matriz (n_jogos x max_gols+1) com P(0 gols), P(1 gol), ..., P(max_gols gols).
+    Com corrigir_cauda=True a última coluna vira "max_gols OU MAIS", assim a
+    massa que ficaria de fora do corte entra no último balde e cada linha soma 1.
+    """
+    lambdas = np.asarray(lambdas, dtype=float).reshape(-1, 1)
+    gols = np.arange(max_gols + 1)
+    # log(k!) acumulado, sem chamar factorial um por um
+    log_fatorial = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, max_gols + 1)))))
+    # Faço em log para não estourar com lambdas grandes (lambda^k / k!)
+    log_lambdas = np.log(np.where(lambdas > 0, lambdas, 1.0))
+    pmf = np.exp(gols * log_lambdas - lambdas - log_fatorial)
+    # Lambda zero (time que não fez gol nenhum) = 100% de chance de 0 gols
+    pmf[lambdas.ravel() <= 0, 1:] = 0.0
+    if corrigir_cauda:
+        pmf[:, -1] = np.clip(1.0 - pmf[:, :-1].sum(axis=1), 0.0, None)
+    return pmf
+
+def _matriz_placares(lamb_casa, lamb_fora, max_gols=10, corrigir_cauda=True, rho=0.0):
+    """Matriz de placares (n_jogos x max_gols+1 x max_gols+1) a partir dos vetores de lambda."""
+    pmf_casa = calcular_pmf_poisson(lamb_casa, max_gols, corrigir_cauda)
+    pmf_fora = calcular_pmf_poisson(lamb_fora, max_gols, corrigir_cauda)
+
+    # Produto externo das duas PMFs para cada jogo
+    placares = pmf_casa[:, :, None] * pmf_fora[:, None, :]
+    if rho:
+        # Correção de Dixon-Coles: só redistribui entre os placares baixos, sem mudar a soma...
+        total = placares.sum(axis=(1, 2))
+        placares[:, 0, 0] *= np.maximum(1 - lamb_casa * lamb_fora * rho, TAU_MINIMO)
+        placares[:, 0, 1] *= np.maximum(1 + lamb_casa * rho, TAU_MINIMO)
+        placares[:, 1, 0] *= np.maximum(1 + lamb_fora * rho, TAU_MINIMO)
+        placares[:, 1, 1] *= np.maximum(1 - rho, TAU_MINIMO)
+        # ...a não ser que algum tau tenha batido no piso: aí volto cada jogo para a soma original
+        corrigido = placares.sum(axis=(1, 2))
+        fator = np.divide(total, corrigido, out=np.ones_like(total), where=corrigido > 0)
+        placares *= fator[:, None, None]
+    return placares
+
+def _resultados(placares):
+    """(Prob_Casa, Prob_Empate, Prob_Fora): abaixo da diagonal = mandante fez mais gols; diagonal = empate."""
+    prob_casa = np.tril(placares, k=-1).sum(axis=(1, 2))
+    prob_empate = np.trace(placares, axis1=1, axis2=2)
+    prob_fora = np.triu(placares, k=1).sum(axis=(1, 2))
+    return prob_casa, prob_empate, prob_fora
+
+@cronometrado()
+def prever_jogos_lote(df_jogos, forcas, media_casa, media_fora, max_gols=10, corrigir_cauda=True, rho=0.0,
+                      fatores_forma=None):
+    """
+    Versão em lote do prever_jogo: em vez de 72 chamadas de poisson.pmf por jogo,
+    monto os vetores de lambda de TODOS os jogos de uma vez a partir do 'forcas'
+    (casando pelas colunas Home_ID/Away_ID) e calculo tudo com NumPy.
+    A temporada inteira (~380 jogos) sai em milissegundos.
+    Com rho != 0 (modelo Dixon-Coles, ver dixon_coles.py) os placares 0x0, 1x0,
+    0x1 e 1x1 recebem a correção de dependência entre os dois lados.
+    Com fatores_forma (ver forma.fatores_forma), o lambda de cada lado ainda é
+    multiplicado pela forma recente do ataque de um e da defesa do outro.
+
+    Retorna:
+      - DataFrame (mesmo índice do df_jogos) com Lambda_Casa, Lambda_Fora,
+        Prob_Casa, Prob_Empate e Prob_Fora (NaN se algum time não tem dados);
+      - array (n_jogos x max_gols+1 x max_gols+1) com a matriz de placares,
+        onde placares[i, g_casa, g_fora] é a probabilidade do placar exato.
+    """
+    colunas = ['Lambda_Casa', 'Lambda_Fora', 'Prob_Casa', 'Prob_Empate', 'Prob_Fora']
+    if forcas is None or df_jogos.empty:
+        vazio = pd.DataFrame(np.nan, index=df_jogos.index, columns=colunas)
+        return vazio, np.zeros((len(df_jogos), max_gols + 1, max_gols + 1))
+
+    # Um reindex por lado já alinha as forças com cada jogo (time sem dados vira NaN)
+    casa = forcas.reindex(df_jogos['Home_ID'].to_numpy())
+    fora = forcas.reindex(df_jogos['Away_ID'].to_numpy())
+
+    # Lambda = Gols Esperados (mesma fórmula do prever_jogo, só que para o vetor todo)
+    lamb_casa = casa['Ataque_Casa'].to_numpy() * fora['Defesa_Fora'].to_numpy() * media_casa
+    lamb_fora = fora['Ataque_Fora'].to_numpy() * casa['Defesa_Casa'].to_numpy() * media_fora
+    if fatores_forma is not None:
+        # Time sem forma calculada (ainda não jogou) fica neutro (fator 1)
+        forma_casa = fatores_forma.reindex(df_jogos['Home_ID'].to_numpy()).fillna(1.0)
+        forma_fora = fatores_forma.reindex(df_jogos['Away_ID'].to_numpy()).fillna(1.0)
+        lamb_casa = lamb_casa * forma_casa['Fator_Ataque'].to_numpy() * forma_fora['Fator_Defesa'].to_numpy()
+        lamb_fora = lamb_fora * forma_fora['Fator_Ataque'].to_numpy() * forma_casa['Fator_Defesa'].to_numpy()
+    validos = ~(np.isnan(lamb_casa) | np.isnan(lamb_fora))
+
+    # Matriz de placares de cada jogo (time sem dados: lambda 0 e matriz zerada)
+    placares = _matriz_placares(np.where(validos, lamb_casa, 0.0), np.where(validos, lamb_fora, 0.0),
+                                max_gols, corrigir_cauda, rho)
+    placares[~validos] = 0.0
+    prob_casa, prob_empate, prob_fora = _resultados(placares)
+
+    df_prev = pd.DataFrame({
+        'Lambda_Casa': lamb_casa,
+        'Lambda_Fora': lamb_fora,
+        'Prob_Casa': np.where(validos, prob_casa, np.nan),
+        'Prob_Empate': np.where(validos, prob_empate, np.nan),
+        'Prob_Fora': np.where(validos, prob_fora, np.nan),
+    }, index=df_jogos.index)
+    return df_prev, placares
+
+@cronometrado()
+def prever_jogo(id_casa, id_fora, forcas, media_casa, media_fora, rho=0.0, fatores_forma=None):
+    """
+    Usa a Distribuição de Poisson.
+    Cruza o Ataque do Mandante com a Defesa do Visitante para achar os Gols Esperados (Lambda).
+    Usa as mesmas contas do prever_jogos_lote (placares de 0x0 até 5x5), mas
+    sem montar DataFrame: para um jogo só, o pandas custava mais que a conta.
+    Os times entram pelo ID da API, igual ao índice do 'forcas'.
+    Aceita direto o que sai do ajuste Dixon-Coles (ajuste.para_modelo()).
+    fatores_forma (opcional, ver forma.fatores_forma) pondera pela forma recente:
+    é só mais uma consulta por ID, do mesmo jeito que as forças.
+    """
+    if forcas is None or id_casa not in forcas.index or id_fora not in forcas.index:
+        return 0, 0, 0 # Não tenho dados suficientes
+
+    lamb_casa = forcas.at[id_casa, 'Ataque_Casa'] * forcas.at[id_fora, 'Defesa_Fora'] * media_casa
+    lamb_fora = forcas.at[id_fora, 'Ataque_Fora'] * forcas.at[id_casa, 'Defesa_Casa'] * media_fora
+    if fatores_forma is not None:
+        lamb_casa *= _fator(fatores_forma, id_casa, 'Fator_Ataque') * _fator(fatores_forma, id_fora, 'Fator_Defesa')
+        lamb_fora *= _fator(fatores_forma, id_fora, 'Fator_Ataque') * _fator(fatores_forma, id_casa, 'Fator_Defesa')
+    placares = _matriz_placares(np.array([lamb_casa]), np.array([lamb_fora]), max_gols=5, corrigir_cauda=False, rho=rho)
+    prob_casa, prob_empate, prob_fora = _resultados(placares)
+    return prob_casa[0], prob_empate[0], prob_fora[0]
+
+def _fator(fatores_forma, id_time, coluna):
+    """Fator de forma do time (1 = neutro se ele ainda não tem forma calculada)."""
+    return fatores_forma.at[id_time, coluna] if id_time in fatores_forma.index else 1.0
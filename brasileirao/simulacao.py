@@ -0,0 +1,217 @@
+# ==============================================================================
+# SIMULADOR DE MONTE CARLO DA TEMPORADA
+# ==============================================================================
+# Em vez da regra de três (Pontos/Jogos * jogos restantes), eu sorteio TODOS os
+# jogos que faltam a partir das probabilidades de Poisson e repito isso 100 mil
+# vezes. No fim conto em que posição cada time terminou em cada temporada simulada.
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from brasileirao.metricas import cronometrado
+
+# Pesos da chave de desempate do Brasileirão: Pontos > Vitórias > Saldo > Gols Pró.
+# Cada critério fica numa "casa decimal" própria, então uma soma só já ordena tudo.
+PESO_PONTOS = 1e8
+PESO_VITORIAS = 1e6
+PESO_SALDO = 1e3
+PESO_GOLS = 1.0
+
+# Quantas temporadas cada bloco simula (controla o uso de memória)
+TAMANHO_BLOCO = 10_000
+
+# Resolução do sorteio: cada jogo vira uma tabela de 2^14 "fatias" de probabilidade
+BITS_SORTEIO = 14
+
+# Os 4 números que um time leva de cada jogo (pontos, vitória, gols pró e contra)
+# vão empacotados num int64 só, 16 bits para cada. Assim somo tudo de uma vez.
+DESLOC_PONTOS, DESLOC_VITORIAS, DESLOC_GP, DESLOC_GC = 48, 32, 16, 0
+MASCARA = 0xFFFF
+
+
+def _tipo_codigo(n_gols):
+    """
+    Menor inteiro que guarda o código do placar (gols_casa * n_gols + gols_fora).
+    Até max_gols = 15 (16 x 16 placares) cabe em uint8; acima disso vai para uint16.
+    """
+    n_codigos = n_gols * n_gols
+    if n_codigos <= 2 ** 8:
+        return np.uint8
+    if n_codigos <= 2 ** 16:
+        return np.uint16
+    raise ValueError(f"Matriz de placares grande demais para o sorteio: {n_gols} x {n_gols} (máximo 256 x 256)")
+
+
+def _validar_placares(placares, df_jogos):
+    """
+    Cada jogo precisa de uma matriz de placares sem valor negativo (nem NaN) e com
+    alguma probabilidade: senão o sorteio quebraria lá dentro do NumPy (divisão por
+    zero no cdf, np.repeat com contagem negativa) sem dizer qual jogo.
+    """
+    massa = placares.reshape(len(placares), int(np.prod(placares.shape[1:])))
+    with np.errstate(invalid='ignore'):
+        ruins = ~np.isfinite(massa).all(axis=1) | (massa < 0).any(axis=1) | ~(massa.sum(axis=1) > 0)
+    if ruins.any():
+        jogo = df_jogos.iloc[int(np.flatnonzero(ruins)[0])]
+        nome = f"ID_Jogo {jogo['ID_Jogo']}" if 'ID_Jogo' in jogo else f"{jogo['Home_ID']} x {jogo['Away_ID']}"
+        raise ValueError(f"Matriz de placares inválida para o jogo {nome} (negativa, NaN ou sem probabilidade); "
+                         f"{int(ruins.sum())} jogo(s) com problema")
+
+
+def _montar_sorteio(placares):
+    """
+    Transforma a matriz de placares de cada jogo numa tabela de consulta:
+    tabela[jogo, fatia] = código do placar (gols_casa * n + gols_fora).
+    Sortear um placar vira só pegar um inteiro aleatório e olhar na tabela.
+    """
+    n_jogos = placares.shape[0]
+    n_fatias = 2 ** BITS_SORTEIO
+    cdf = np.cumsum(placares.reshape(n_jogos, -1), axis=1)
+    cdf /= cdf[:, -1:]
+    # Quantas fatias cada placar ocupa (cada linha soma exatamente n_fatias)
+    limites = np.rint(cdf * n_fatias).astype(np.int64)
+    fatias_por_placar = np.diff(limites, axis=1, prepend=0)
+    codigos = np.tile(np.arange(cdf.shape[1], dtype=_tipo_codigo(placares.shape[1])), n_jogos)
+    return np.repeat(codigos, fatias_por_placar.ravel()).reshape(n_jogos, n_fatias)
+
+
+def _montar_valores(n_gols):
+    """
+    Para cada código de placar, o valor empacotado que o mandante (linha 0)
+    e o visitante (linha 1) levam daquele jogo.
+    """
+    codigos = np.arange(n_gols * n_gols)
+    gc, gf = codigos // n_gols, codigos % n_gols
+    valores = np.zeros((2, codigos.size), dtype=np.int64)
+    for lado, (pro, contra) in enumerate(((gc, gf), (gf, gc))):
+        vitoria = (pro > contra).astype(np.int64)
+        pontos = 3 * vitoria + (pro == contra)
+        valores[lado, codigos] = (
+            (pontos << DESLOC_PONTOS) | (vitoria << DESLOC_VITORIAS)
+            | (pro.astype(np.int64) << DESLOC_GP) | (contra.astype(np.int64) << DESLOC_GC)
+        )
+    return valores
+
+
+def _simular_bloco(tabela_sorteio, valores, idx_casa, idx_fora, chave_base, pontos_base, n_sims, semente):
+    """
+    Simula um bloco de temporadas e devolve só os agregados (contagem de posições
+    e soma dos pontos), para não trafegar arrays gigantes entre processos.
+    """
+    rng = np.random.default_rng(semente)
+    n_jogos = tabela_sorteio.shape[0]
+    n_times = chave_base.size
+
+    # Trabalho com os jogos nas LINHAS (jogo x simulação): pegar linhas inteiras é só copiar memória
+    # Um inteiro de 14 bits por jogo -> código do placar sorteado
+    # (converto antes e desloco no lugar: sai uma cópia a menos do que fazer o >> em uint16)
+    fatia = np.frombuffer(rng.bytes(2 * n_sims * n_jogos), dtype=np.uint16).reshape(n_jogos, n_sims)
+    fatia = fatia.astype(np.int32)
+    fatia >>= 16 - BITS_SORTEIO
+    fatia += (np.arange(n_jogos, dtype=np.int32) * tabela_sorteio.shape[1])[:, None]
+    placar = np.take(tabela_sorteio, fatia)
+
+    # Somo jogo a jogo direto na linha de cada time: montar a matriz (2 * jogos x simulações)
+    # em int64 e fazer um reduceat nela era mais lento (não cabe no cache) e gastava ~60 MB por bloco
+    soma = np.zeros((n_times, n_sims), dtype=np.int64)
+    valores_casa, valores_fora = valores
+    contrib = np.empty(n_sims, dtype=np.int64)
+    for jogo, (casa, fora) in enumerate(zip(idx_casa, idx_fora)):
+        # Índice em intp: de outro tipo, o np.take converte tudo de novo por dentro
+        codigo = placar[jogo].astype(np.intp)
+        np.take(valores_casa, codigo, out=contrib)
+        soma[casa] += contrib
+        np.take(valores_fora, codigo, out=contrib)
+        soma[fora] += contrib
+    soma = soma.T
+
+    pontos = pontos_base + ((soma >> DESLOC_PONTOS) & MASCARA)
+    vitorias = (soma >> DESLOC_VITORIAS) & MASCARA
+    gols_pro = (soma >> DESLOC_GP) & MASCARA
+    gols_contra = (soma >> DESLOC_GC) & MASCARA
+
+    chave = (
+        chave_base + pontos * PESO_PONTOS + vitorias * PESO_VITORIAS
+        + (gols_pro - gols_contra) * PESO_SALDO + gols_pro * PESO_GOLS
+    )
+    # Empate em todos os critérios: sorteio (o ruído é menor que 1, não mexe no resto)
+    chave += rng.random((n_sims, n_times)) * 0.5
+
+    # ordem[s, k] = índice do time que terminou na posição k na simulação s
+    ordem = np.argsort(-chave, axis=1)
+    contagem = np.bincount(
+        (ordem * n_times + np.arange(n_times)).ravel(), minlength=n_times * n_times
+    ).reshape(n_times, n_times)
+    return contagem, pontos.sum(axis=0)
+
+
+@cronometrado()
+def simular_temporada(df_tabela, df_jogos, placares, n_simulacoes=100_000, n_processos=None,
+                      seed=None, vagas_libertadores=6, vagas_rebaixamento=4):
+    """
+    Monte Carlo da temporada inteira.
+
+    Recebe a tabela atual (df_tabela, com a coluna ID), os jogos que faltam
+    (df_jogos, com Home_ID/Away_ID) e a matriz de placares de cada jogo que sai
+    do prever_jogos_lote. Os times são casados pelo ID inteiro da API.
+    Com n_processos > 1 os blocos de simulação são espalhados num pool de processos.
+
+    Retorna:
+      - DataFrame (índice = ID) com Pontos_Esperados, Prob_Titulo,
+        Prob_Libertadores e Prob_Z4;
+      - DataFrame (ID x Posição 1..20) com a probabilidade de cada posição final.
+    """
+    times = pd.Index(df_tabela['ID'])
+    n_times = len(times)
+
+    idx_casa = times.get_indexer(df_jogos['Home_ID'])
+    idx_fora = times.get_indexer(df_jogos['Away_ID'])
+    # Jogo com time fora da tabela (API ainda não atualizou a classificação...) não entra na conta
+    validos = (idx_casa >= 0) & (idx_fora >= 0)
+    idx_casa, idx_fora = idx_casa[validos], idx_fora[validos]
+    placares = np.asarray(placares, dtype=float)[validos]
+    n_jogos = len(idx_casa)
+    _validar_placares(placares, df_jogos[validos])
+
+    n_gols = placares.shape[1]
+    if n_jogos:
+        tabela_sorteio = _montar_sorteio(placares)
+    else:
+        tabela_sorteio = np.zeros((0, 2 ** BITS_SORTEIO), _tipo_codigo(n_gols))
+    valores = _montar_valores(n_gols)
+
+    pontos_base = df_tabela['Pontos'].to_numpy(dtype=np.int64)
+    chave_base = (
+        df_tabela['Vitórias'].to_numpy(dtype=float) * PESO_VITORIAS
+        + df_tabela['Saldo'].to_numpy(dtype=float) * PESO_SALDO
+        + df_tabela['Gols Pró'].to_numpy(dtype=float) * PESO_GOLS
+    )
+
+    # Divido as simulações em blocos, cada um com sua própria semente independente
+    tamanhos = [TAMANHO_BLOCO] * (n_simulacoes // TAMANHO_BLOCO)
+    if n_simulacoes % TAMANHO_BLOCO:
+        tamanhos.append(n_simulacoes % TAMANHO_BLOCO)
+    sementes = np.random.SeedSequence(seed).spawn(len(tamanhos))
+    fixos = (tabela_sorteio, valores, idx_casa, idx_fora, chave_base, pontos_base)
+    args = [fixos + (n, s) for n, s in zip(tamanhos, sementes)]
+
+    if n_processos and n_processos > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=n_processos) as pool:
+            resultados = list(pool.map(_simular_bloco, *zip(*args)))
+    else:
+        resultados = [_simular_bloco(*a) for a in args]
+
+    contagem = sum(r[0] for r in resultados)
+    soma_pontos = sum(r[1] for r in resultados)
+
+    df_posicoes = pd.DataFrame(
+        contagem / n_simulacoes, index=times, columns=pd.RangeIndex(1, n_times + 1, name='Posição')
+    )
+    df_resumo = pd.DataFrame({
+        'Pontos_Esperados': soma_pontos / n_simulacoes,
+        'Prob_Titulo': df_posicoes[1],
+        'Prob_Libertadores': df_posicoes.iloc[:, :vagas_libertadores].sum(axis=1),
+        'Prob_Z4': df_posicoes.iloc[:, n_times - vagas_rebaixamento:].sum(axis=1),
+    }, index=times)
+    return df_resumo, df_posicoes
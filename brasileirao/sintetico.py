@@ -0,0 +1,208 @@
+# ==============================================================================
+# GERADOR DE TEMPORADAS SINTÉTICAS (PAYLOADS NO FORMATO DA FOOTBALL-DATA.ORG)
+# ==============================================================================
+# Para medir desempenho (e testar o pipeline) sem depender da API nem da cota.
+# Os payloads têm o mesmo formato de /competitions/{codigo}/standings e
+# /competitions/{codigo}/matches, então passam direto pelo process_data.
+#
+# Os placares não são aleatórios "de qualquer jeito": cada clube tem uma força de
+# ataque e de defesa, o mandante tem vantagem e os gols saem de uma Poisson. Assim
+# o modelo de forças e o simulador trabalham com dados parecidos com os reais.
+# O tamanho é livre: 20 clubes = 380 jogos; 102 clubes = 10.302 jogos.
+import datetime as dt
+
+import numpy as np
+
+# Clubes com nome de verdade (o get_sigla reconhece); depois deles o gerador inventa
+NOMES_TIMES = [
+    "Flamengo", "Palmeiras", "Cruzeiro", "Botafogo FR", "São Paulo FC", "Fluminense FC",
+    "Grêmio", "Internacional", "Corinthians", "Bahia", "Vasco da Gama", "Atlético Mineiro",
+    "Fortaleza", "Red Bull Bragantino", "Santos", "Vitória", "Juventude", "Criciúma",
+    "Athletico Paranaense", "Cuiabá", "Atlético Goianiense", "América FC", "Coritiba", "Goiás",
+]
+PRIMEIRO_ID = 1760
+MEDIA_GOLS_CASA, MEDIA_GOLS_FORA = 1.45, 1.05
+# Fração dos gols que sai no 1º tempo (no Brasileirão fica perto de 45%)
+FRACAO_PRIMEIRO_TEMPO = 0.45
+
+
+def _equipe(indice):
+    """Dicionário de time no formato da API (o mesmo que vem em homeTeam/awayTeam)."""
+    id_time = PRIMEIRO_ID + indice
+    if indice < len(NOMES_TIMES):
+        nome = NOMES_TIMES[indice]
+    else:
+        nome = f"Clube Sintético {indice:03d}"
+    return {
+        "id": id_time, "name": nome, "shortName": nome, "tla": nome[:3].upper(),
+        "crest": f"https://crests.football-data.org/{id_time}.png",
+    }
+
+
+def _tabela_de_jogos(n_times):
+    """Turno e returno pelo método do círculo: lista de rodadas, cada uma com pares (casa, fora)."""
+    if n_times % 2:
+        raise ValueError("o gerador precisa de um número par de times")
+    ordem = list(range(n_times))
+    turno = []
+    for rodada in range(n_times - 1):
+        pares = [(ordem[i], ordem[n_times - 1 - i]) for i in range(n_times // 2)]
+        # Alterno o mando para ninguém jogar o turno inteiro em casa
+        if rodada % 2:
+            pares = [(fora, casa) for casa, fora in pares]
+        turno.append(pares)
+        ordem = [ordem[0], ordem[-1]] + ordem[1:-1]
+    returno = [[(fora, casa) for casa, fora in pares] for pares in turno]
+    return turno + returno
+
+
+def gerar_temporada(n_times=20, rodadas_jogadas=None, temporada=2024, competicao="BSA",
+                    seed=None, indices_times=None, forcas=None):
+    """
+    Gera (standings_raw, matches_raw) de uma temporada de pontos corridos.
+
+    - rodadas_jogadas: quantas rodadas já terminaram (padrão: metade do campeonato);
+    - indices_times: quais clubes do "universo" jogam (ver gerar_temporadas);
+    - forcas: array (n_clubes_do_universo, 2) com ataque/defesa de cada clube.
+    """
+    rng = np.random.default_rng(seed)
+    if indices_times is None:
+        indices_times = list(range(n_times))
+    n_times = len(indices_times)
+    if forcas is None:
+        forcas = rng.lognormal(0.0, 0.2, size=(max(indices_times) + 1, 2))
+    equipes = [_equipe(i) for i in indices_times]
+
+    rodadas = _tabela_de_jogos(n_times)
+    if rodadas_jogadas is None:
+        rodadas_jogadas = len(rodadas) // 2
+
+    pares = np.array([par for pares_rodada in rodadas for par in pares_rodada])
+    numero_rodada = np.repeat(np.arange(1, len(rodadas) + 1), n_times // 2)
+    universo = np.asarray(indices_times)[pares]
+    # lambda = média da liga x ataque de quem chuta x defesa (fragilidade) de quem toma
+    lambda_casa = MEDIA_GOLS_CASA * forcas[universo[:, 0], 0] / forcas[universo[:, 1], 1]
+    lambda_fora = MEDIA_GOLS_FORA * forcas[universo[:, 1], 0] / forcas[universo[:, 0], 1]
+    gols_casa = rng.poisson(lambda_casa)
+    gols_fora = rng.poisson(lambda_fora)
+    gols_casa_1t = rng.binomial(gols_casa, FRACAO_PRIMEIRO_TEMPO)
+    gols_fora_1t = rng.binomial(gols_fora, FRACAO_PRIMEIRO_TEMPO)
+    finalizado = numero_rodada <= rodadas_jogadas
+
+    # Rodada no fim de semana, jogos espalhados entre sábado 18h e domingo 22h (UTC)
+    inicio = dt.datetime(temporada, 4, 13, 18, 0, tzinfo=dt.timezone.utc)
+    deslocamento = rng.integers(0, 28, size=len(pares)) * 1800
+    inicio_temporada = inicio.date().isoformat()
+    temporada_api = {"id": temporada, "startDate": inicio_temporada, "endDate": f"{temporada}-12-08",
+                     "currentMatchday": min(rodadas_jogadas + 1, len(rodadas))}
+    competicao_api = {"id": 2013, "name": "Campeonato Brasileiro Série A", "code": competicao, "type": "LEAGUE"}
+
+    matches = []
+    for k, (casa, fora) in enumerate(pares):
+        data = inicio + dt.timedelta(days=7 * (int(numero_rodada[k]) - 1), seconds=int(deslocamento[k]))
+        if finalizado[k]:
+            gc, gf, gc1, gf1 = int(gols_casa[k]), int(gols_fora[k]), int(gols_casa_1t[k]), int(gols_fora_1t[k])
+            vencedor = "HOME_TEAM" if gc > gf else "AWAY_TEAM" if gf > gc else "DRAW"
+            status = "FINISHED"
+        else:
+            gc = gf = gc1 = gf1 = vencedor = None
+            status = "TIMED"
+        matches.append({
+            "area": {"id": 2032, "name": "Brazil", "code": "BRA"},
+            "competition": competicao_api,
+            "season": temporada_api,
+            "id": temporada * 10_000 + k,
+            "utcDate": data.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "status": status,
+            "matchday": int(numero_rodada[k]),
+            "stage": "REGULAR_SEASON",
+            "group": None,
+            "lastUpdated": data.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "homeTeam": equipes[casa],
+            "awayTeam": equipes[fora],
+            "score": {
+                "winner": vencedor, "duration": "REGULAR",
+                "fullTime": {"home": gc, "away": gf},
+                "halfTime": {"home": gc1, "away": gf1},
+            },
+        })
+
+    standings = {
+        "filters": {"season": str(temporada)},
+        "competition": competicao_api,
+        "season": temporada_api,
+        "standings": [{"stage": "REGULAR_SEASON", "type": "TOTAL", "group": None,
+                       "table": _classificacao(equipes, pares, gols_casa, gols_fora, finalizado)}],
+    }
+    matches_raw = {
+        "filters": {"season": str(temporada)},
+        "resultSet": {"count": len(matches), "played": int(finalizado.sum())},
+        "competition": competicao_api,
+        "matches": matches,
+    }
+    return standings, matches_raw
+
+
+def _classificacao(equipes, pares, gols_casa, gols_fora, finalizado):
+    """Monta a tabela (pontos, vitórias, saldo...) a partir dos jogos finalizados, já ordenada."""
+    n_times = len(equipes)
+    casa, fora = pares[finalizado, 0], pares[finalizado, 1]
+    gc, gf = gols_casa[finalizado], gols_fora[finalizado]
+
+    def somar(pesos_casa, pesos_fora):
+        return np.bincount(casa, pesos_casa, n_times) + np.bincount(fora, pesos_fora, n_times)
+
+    jogos = somar(np.ones(len(casa)), np.ones(len(casa))).astype(int)
+    vitorias = somar(gc > gf, gf > gc).astype(int)
+    empates = somar(gc == gf, gc == gf).astype(int)
+    gols_pro = somar(gc, gf).astype(int)
+    gols_contra = somar(gf, gc).astype(int)
+    pontos = 3 * vitorias + empates
+    saldo = gols_pro - gols_contra
+
+    # Critérios do Brasileirão: pontos, vitórias, saldo, gols pró
+    ordem = np.lexsort((-gols_pro, -saldo, -vitorias, -pontos))
+    return [
+        {
+            "position": posicao, "team": equipes[i], "playedGames": int(jogos[i]), "form": None,
+            "won": int(vitorias[i]), "draw": int(empates[i]), "lost": int(jogos[i] - vitorias[i] - empates[i]),
+            "points": int(pontos[i]), "goalsFor": int(gols_pro[i]), "goalsAgainst": int(gols_contra[i]),
+            "goalDifference": int(saldo[i]),
+        } for posicao, i in enumerate(ordem, start=1)
+    ]
+
+
+def gerar_temporadas(n_temporadas, temporada_final=2024, n_times=20, rodadas_jogadas=None,
+                     competicao="BSA", seed=None, rebaixados=4):
+    """
+    Várias temporadas seguidas da mesma liga, com sobe-e-desce: os `rebaixados`
+    últimos de cada ano saem e entram clubes novos. As forças dos clubes variam
+    pouco de um ano para o outro (como na vida real).
+
+    Retorna uma lista [(temporada, standings_raw, matches_raw), ...] em ordem
+    cronológica. Só a última temporada fica pela metade (rodadas_jogadas); as
+    anteriores vêm completas.
+    """
+    rng = np.random.default_rng(seed)
+    n_universo = n_times + rebaixados * n_temporadas
+    forcas = rng.lognormal(0.0, 0.2, size=(n_universo, 2))
+    participantes = list(range(n_times))
+    proximo = n_times
+
+    temporadas = []
+    for ano in range(temporada_final - n_temporadas + 1, temporada_final + 1):
+        ultima = ano == temporada_final
+        standings, matches = gerar_temporada(
+            rodadas_jogadas=rodadas_jogadas if ultima else 2 * (n_times - 1),
+            temporada=ano, competicao=competicao, seed=rng.integers(2 ** 32),
+            indices_times=participantes, forcas=forcas,
+        )
+        temporadas.append((ano, standings, matches))
+
+        # Sobe-e-desce para o ano seguinte
+        rebaixados_ano = {t["team"]["id"] - PRIMEIRO_ID for t in standings["standings"][0]["table"][-rebaixados:]}
+        participantes = [i for i in participantes if i not in rebaixados_ano]
+        participantes += list(range(proximo, proximo + rebaixados))
+        proximo += rebaixados
+        forcas *= rng.lognormal(0.0, 0.05, size=forcas.shape)
+    return temporadas
@@ -0,0 +1,334 @@
+# ==============================================================================
+# SNAPSHOT ANALÍTICO (JOB HEADLESS + LEITURA MEMORY-MAPPED)
+# ==============================================================================
+# Antes, cada rerun do Streamlit (até um clique no menu) refazia process_data e
+# calcular_forca_times em cima do JSON cru. Agora um job separado faz TODO o
+# processamento uma vez e grava o resultado em Arrow (formato colunar), numa pasta
+# versionada. O dashboard só abre esses arquivos com memory-map: a leitura é
+# praticamente instantânea e várias sessões/processos dividem a mesma cópia na
+# memória (o sistema operacional compartilha as páginas do arquivo).
+#
+# Uso (cron, CI, container auxiliar...):
+#     python -m brasileirao.snapshot --pasta dados/snapshots
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+
+from brasileirao.metricas import cronometrado
+
+# O dashboard importa este módulo só para LER o snapshot (pandas + pyarrow). ETL,
+# modelos, forma, histórico e simulador são importados dentro das funções que montam
+# um snapshot novo: quem só lê não paga o import de scipy & cia.
+
+# Arquivo que aponta para a versão mais recente (troca atômica com os.replace)
+ARQUIVO_ATUAL = "ATUAL"
+# Quantas versões antigas ficam no disco (quem ainda está lendo uma delas não quebra)
+VERSOES_MANTIDAS = 3
+# Tabelas que viram um arquivo .arrow cada
+TABELAS = ("tabela", "finalizados", "agendados", "time_jogos", "times",
+           "forcas", "previsoes", "projecao", "posicoes", "confrontos", "forma", "historico")
+
+
+@dataclass
+class Snapshot:
+    """Tudo que o dashboard precisa para desenhar as páginas, já calculado."""
+    versao: str
+    gerado_em: str
+    tabela: pd.DataFrame
+    finalizados: pd.DataFrame
+    agendados: pd.DataFrame
+    time_jogos: pd.DataFrame
+    times: pd.DataFrame
+    forcas: pd.DataFrame
+    previsoes: pd.DataFrame
+    projecao: pd.DataFrame
+    posicoes: pd.DataFrame
+    # Confronto direto por par de times e série de forma de cada time (ver forma.py)
+    confrontos: pd.DataFrame = field(default_factory=pd.DataFrame)
+    forma: pd.DataFrame = field(default_factory=pd.DataFrame)
+    # Jogos das temporadas anteriores que entraram nas forças (historico_para_modelo): quem
+    # refaz o modelo em cima do snapshot (cenários, modo ao vivo) usa exatamente os mesmos
+    historico: pd.DataFrame = field(default_factory=pd.DataFrame)
+    media_casa: float = 0.0
+    media_fora: float = 0.0
+    metadados: dict = field(default_factory=dict)
+
+
+def _resumo_historico(df_historico):
+    """Hash do conteúdo do histórico (None sem histórico): histórico recarregado/corrigido = versão nova."""
+    if df_historico is None or df_historico.empty:
+        return None
+    linhas = pd.util.hash_pandas_object(df_historico, index=False).to_numpy().tobytes()
+    colunas = json.dumps([str(c) for c in df_historico.columns]).encode("utf-8")
+    return hashlib.sha256(colunas + linhas).hexdigest()[:16]
+
+
+def calcular_versao(standings_raw, matches_raw, modelo="dixon_coles", df_historico=None, n_simulacoes=100_000,
+                    seed=None):
+    """
+    A versão é o hash de TUDO que entra no snapshot: payload da API, modelo, histórico
+    e parâmetros do Monte Carlo. Mesmas entradas = mesma versão (não regrava à toa);
+    mudou qualquer uma delas (até só o histórico), a versão muda junto.
+    """
+    conteudo = json.dumps([standings_raw, matches_raw, modelo, _resumo_historico(df_historico), n_simulacoes, seed],
+                          sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()[:16]
+
+
+# Modelos de força disponíveis: "dixon_coles" (máxima verossimilhança, padrão) ou "medias" (o antigo)
+MODELOS = ("dixon_coles", "medias")
+
+
+def modelar(df_tabela, df_finalizados, df_agendados, n_simulacoes=100_000, seed=None, df_historico=None,
+            modelo="dixon_coles", ajuste_anterior=None):
+    """
+    A parte "modelo" do snapshot: forças -> previsões -> Monte Carlo, em cima das
+    tabelas já processadas. Separada do montar_snapshot para o modo ao vivo
+    (ao_vivo.py) refazer só isso quando um jogo termina, sem passar pelo ETL.
+
+    Retorna (forcas, media_casa, media_fora, rho, df_previsoes, projecao, posicoes).
+    """
+    from brasileirao.dixon_coles import calcular_forca_dixon_coles
+    from brasileirao.modelo import calcular_forca_times, prever_jogos_lote
+    from brasileirao.simulacao import simular_temporada
+
+    rho = 0.0
+    if modelo == "dixon_coles":
+        ids_times = df_tabela['ID'] if not df_tabela.empty else None
+        forcas, media_casa, media_fora, ajuste = calcular_forca_dixon_coles(
+            df_finalizados, df_historico, ids_times=ids_times, anterior=ajuste_anterior)
+        rho = ajuste.rho if ajuste is not None else 0.0
+    else:
+        forcas, media_casa, media_fora = calcular_forca_times(df_finalizados, df_historico)
+
+    colunas_forca = ['Ataque_Casa', 'Ataque_Fora', 'Defesa_Casa', 'Defesa_Fora']
+    if forcas is None:
+        # Campeonato ainda não começou: sem força, sem previsão e sem projeção
+        forcas = pd.DataFrame(columns=colunas_forca, index=pd.Index([], name='ID'), dtype=float)
+        df_previsoes, _ = prever_jogos_lote(df_agendados, None, media_casa, media_fora)
+        projecao, posicoes = pd.DataFrame(index=pd.Index([], name='ID')), pd.DataFrame()
+    else:
+        df_previsoes, _ = prever_jogos_lote(df_agendados, forcas, media_casa, media_fora, rho=rho)
+        # Time que ainda não jogou em casa/fora não tem força calculada: assume força média (1)
+        # (no Dixon-Coles todo time da tabela já sai do ajuste, puxado para a média)
+        forcas_completas = forcas.reindex(df_tabela['ID']).fillna(1)
+        _, placares = prever_jogos_lote(df_agendados, forcas_completas, media_casa, media_fora, rho=rho)
+        projecao, posicoes = simular_temporada(df_tabela, df_agendados, placares,
+                                               n_simulacoes=n_simulacoes, seed=seed)
+    return forcas, media_casa, media_fora, rho, df_previsoes, projecao, posicoes
+
+
+@cronometrado()
+def montar_snapshot(standings_raw, matches_raw, n_simulacoes=100_000, seed=None, df_historico=None,
+                    modelo="dixon_coles", ajuste_anterior=None):
+    """
+    Roda o pipeline inteiro (ETL -> forças -> previsões -> Monte Carlo) em cima
+    do JSON da API e devolve um Snapshot. Não depende de Streamlit.
+    df_historico (opcional, ver historico.historico_para_modelo) alimenta as
+    forças com as temporadas anteriores. ajuste_anterior (Dixon-Coles do snapshot
+    anterior, ver ajuste_do_snapshot) só serve de ponto de partida para o refit.
+    """
+    from brasileirao.etl import process_data
+    from brasileirao.forma import montar_confrontos, montar_forma
+
+    df_tabela, df_finalizados, df_agendados, df_time_jogos, df_times = process_data(standings_raw, matches_raw)
+    forcas, media_casa, media_fora, rho, df_previsoes, projecao, posicoes = modelar(
+        df_tabela, df_finalizados, df_agendados, n_simulacoes=n_simulacoes, seed=seed,
+        df_historico=df_historico, modelo=modelo, ajuste_anterior=ajuste_anterior,
+    )
+
+    return Snapshot(
+        versao=calcular_versao(standings_raw, matches_raw, modelo, df_historico, n_simulacoes, seed),
+        gerado_em=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        tabela=df_tabela, finalizados=df_finalizados, agendados=df_agendados,
+        time_jogos=df_time_jogos, times=df_times, forcas=forcas, previsoes=df_previsoes,
+        projecao=projecao, posicoes=posicoes,
+        confrontos=montar_confrontos(df_time_jogos), forma=montar_forma(df_time_jogos),
+        historico=df_historico if df_historico is not None else pd.DataFrame(),
+        media_casa=float(media_casa), media_fora=float(media_fora),
+        metadados={"n_simulacoes": n_simulacoes, "seed": seed, "modelo": modelo, "rho": rho},
+    )
+
+
+def ajuste_do_snapshot(snapshot):
+    """Parâmetros Dixon-Coles guardados num snapshot (para o warm start do próximo). None se não der."""
+    if snapshot is None or snapshot.metadados.get("modelo") != "dixon_coles" or snapshot.forcas.empty:
+        return None
+    from brasileirao.dixon_coles import AjusteDixonColes
+    return AjusteDixonColes.de_forcas(snapshot.forcas, snapshot.media_casa, snapshot.media_fora,
+                                      snapshot.metadados.get("rho", 0.0))
+
+
+def versao_atual(pasta_base):
+    """Lê o ponteiro ATUAL. Devolve None se o job ainda não gerou nenhum snapshot."""
+    try:
+        with open(os.path.join(pasta_base, ARQUIVO_ATUAL), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def salvar_snapshot(snapshot, pasta_base):
+    """
+    Grava cada DataFrame como Arrow IPC SEM compressão (é isso que permite o
+    memory-map zero-copy na leitura) numa pasta nova, e só no fim troca o
+    ponteiro ATUAL. Quem estiver lendo a versão antiga nunca vê arquivo pela metade.
+    Pasta da versão já existente não é regravada: a versão cobre todas as entradas
+    (ver calcular_versao), então o conteúdo seria o mesmo.
+    """
+    os.makedirs(pasta_base, exist_ok=True)
+    destino = os.path.join(pasta_base, snapshot.versao)
+    if not os.path.isdir(destino):
+        temporaria = tempfile.mkdtemp(prefix=".tmp-", dir=pasta_base)
+        for nome in TABELAS:
+            tabela_arrow = _tabela_arrow(getattr(snapshot, nome))
+            with pa.OSFile(os.path.join(temporaria, f"{nome}.arrow"), "wb") as arquivo:
+                with pa.ipc.new_file(arquivo, tabela_arrow.schema) as escritor:
+                    escritor.write_table(tabela_arrow)
+        with open(os.path.join(temporaria, "manifesto.json"), "w", encoding="utf-8") as f:
+            json.dump(_manifesto(snapshot), f, ensure_ascii=False, indent=2)
+        os.rename(temporaria, destino)
+
+    ponteiro_tmp = os.path.join(pasta_base, f".{ARQUIVO_ATUAL}.tmp")
+    with open(ponteiro_tmp, "w", encoding="utf-8") as f:
+        f.write(snapshot.versao)
+    os.replace(ponteiro_tmp, os.path.join(pasta_base, ARQUIVO_ATUAL))
+
+    _limpar_versoes_antigas(pasta_base, snapshot.versao)
+    return destino
+
+
+def _tabela_arrow(df):
+    # Nomes de coluna do Arrow precisam ser texto (as posições 1..20 são inteiras)
+    return pa.Table.from_pandas(df.rename(columns=str), preserve_index=True)
+
+
+def _manifesto(snapshot):
+    return {
+        "versao": snapshot.versao,
+        "gerado_em": snapshot.gerado_em,
+        "media_casa": snapshot.media_casa,
+        "media_fora": snapshot.media_fora,
+        "metadados": snapshot.metadados,
+    }
+
+
+def _montar(manifesto, tabelas):
+    """Snapshot a partir do manifesto + tabelas lidas do Arrow (disco ou bytes)."""
+    # As posições voltam a ser inteiras (1..20), como saem do simulador
+    if not tabelas["posicoes"].empty:
+        tabelas["posicoes"].columns = pd.RangeIndex(1, tabelas["posicoes"].shape[1] + 1, name="Posição")
+    return Snapshot(
+        versao=manifesto["versao"], gerado_em=manifesto["gerado_em"],
+        media_casa=manifesto["media_casa"], media_fora=manifesto["media_fora"],
+        metadados=manifesto.get("metadados", {}), **tabelas,
+    )
+
+
+def snapshot_para_bytes(snapshot):
+    """
+    O snapshot inteiro num bloco de bytes, para guardar fora do disco local (cache
+    compartilhado, ver cache_compartilhado.py): 8 bytes com o tamanho do manifesto,
+    o manifesto em JSON (com o tamanho de cada tabela) e as tabelas em Arrow IPC.
+    """
+    partes = {}
+    for nome in TABELAS:
+        tabela_arrow = _tabela_arrow(getattr(snapshot, nome))
+        destino = pa.BufferOutputStream()
+        with pa.ipc.new_stream(destino, tabela_arrow.schema) as escritor:
+            escritor.write_table(tabela_arrow)
+        partes[nome] = destino.getvalue().to_pybytes()
+    manifesto = {**_manifesto(snapshot), "tabelas": {nome: len(b) for nome, b in partes.items()}}
+    manifesto = json.dumps(manifesto, ensure_ascii=False).encode("utf-8")
+    return len(manifesto).to_bytes(8, "big") + manifesto + b"".join(partes.values())
+
+
+def snapshot_de_bytes(dados):
+    """Inverso do snapshot_para_bytes (as tabelas são lidas sem cópia do buffer)."""
+    tamanho = int.from_bytes(dados[:8], "big")
+    manifesto = json.loads(dados[8:8 + tamanho].decode("utf-8"))
+    buffer, inicio, tabelas = pa.py_buffer(dados), 8 + tamanho, {}
+    for nome, n in manifesto.pop("tabelas").items():
+        tabela_arrow = pa.ipc.open_stream(buffer.slice(inicio, n)).read_all()
+        tabelas[nome] = tabela_arrow.to_pandas(split_blocks=True)
+        inicio += n
+    return _montar(manifesto, tabelas)
+
+
+def _limpar_versoes_antigas(pasta_base, versao_mantida):
+    """Apaga as versões mais velhas, deixando as VERSOES_MANTIDAS mais recentes."""
+    versoes = [
+        os.path.join(pasta_base, nome) for nome in os.listdir(pasta_base)
+        if not nome.startswith(".") and os.path.isdir(os.path.join(pasta_base, nome))
+    ]
+    versoes.sort(key=os.path.getmtime, reverse=True)
+    for pasta in versoes[VERSOES_MANTIDAS:]:
+        if os.path.basename(pasta) != versao_mantida:
+            shutil.rmtree(pasta, ignore_errors=True)
+
+
+def _ler_arrow(caminho):
+    """Abre o arquivo com memory-map: os buffers do Arrow apontam direto para o disco/page cache."""
+    with pa.memory_map(caminho, "r") as mapa:
+        tabela_arrow = pa.ipc.open_file(mapa).read_all()
+    # split_blocks evita juntar colunas num bloco só (o que forçaria cópia)
+    return tabela_arrow.to_pandas(split_blocks=True)
+
+
+@cronometrado()
+def carregar_snapshot(pasta_base, versao=None):
+    """Abre o snapshot (o ATUAL, se a versão não for informada). None se não existir."""
+    versao = versao or versao_atual(pasta_base)
+    if versao is None:
+        return None
+    pasta = os.path.join(pasta_base, versao)
+    with open(os.path.join(pasta, "manifesto.json"), encoding="utf-8") as f:
+        manifesto = json.load(f)
+
+    # Snapshot gravado antes de uma tabela existir (confrontos/forma/historico) abre com ela vazia
+    tabelas = {nome: _ler_arrow(os.path.join(pasta, f"{nome}.arrow"))
+               for nome in TABELAS if os.path.exists(os.path.join(pasta, f"{nome}.arrow"))}
+    return _montar(manifesto, tabelas)
+
+
+def main(argv=None):
+    from brasileirao.historico import PASTA_HISTORICO, historico_para_modelo
+
+    parser = argparse.ArgumentParser(description="Gera o snapshot analítico do Brasileirão (sem Streamlit).")
+    parser.add_argument("--pasta", default=os.environ.get("BRASILEIRAO_SNAPSHOTS", "dados/snapshots"),
+                        help="Pasta base dos snapshots versionados.")
+    parser.add_argument("--competicao", default="BSA", help="Código da competição na football-data.org.")
+    parser.add_argument("--simulacoes", type=int, default=100_000, help="Temporadas do Monte Carlo.")
+    parser.add_argument("--modelo", choices=MODELOS, default="dixon_coles", help="Modelo de forças.")
+    parser.add_argument("--historico", default=PASTA_HISTORICO, help="Pasta do histórico particionado.")
+    parser.add_argument("--temporadas-anteriores", type=int, default=1,
+                        help="Quantas temporadas passadas entram nas forças (0 desliga).")
+    args = parser.parse_args(argv)
+
+    api_key = os.environ.get("FOOTBALL_DATA_API_KEY")
+    if not api_key:
+        parser.error("defina a variável de ambiente FOOTBALL_DATA_API_KEY")
+    # requests só entra no job: o dashboard importa este módulo só para ler o snapshot
+    from brasileirao.api import BASE_URL, ClienteFootballData, buscar_competicao
+    cliente = ClienteFootballData(api_key, os.environ.get("FOOTBALL_DATA_BASE_URL", BASE_URL))
+    standings, matches = buscar_competicao(cliente, args.competicao)
+
+    df_historico = historico_para_modelo(matches, args.competicao, args.temporadas_anteriores, args.historico)
+    # O snapshot anterior (se houver) vira o ponto de partida do ajuste: refit em poucas iterações
+    anterior = ajuste_do_snapshot(carregar_snapshot(args.pasta))
+    snapshot = montar_snapshot(standings, matches, n_simulacoes=args.simulacoes, df_historico=df_historico,
+                               modelo=args.modelo, ajuste_anterior=anterior)
+    destino = salvar_snapshot(snapshot, args.pasta)
+    print(f"Snapshot {snapshot.versao} gravado em {destino}")
+
+
+if __name__ == "__main__":
+    main()
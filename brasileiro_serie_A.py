@@ -1,10 +1,22 @@
-import requests 
+# Relógio do cold start: a primeira execução do script no processo paga todos os imports
+import time
+INICIO_SCRIPT = time.perf_counter()
+
+import functools
+import os
 import pandas as pd  
 import streamlit as st  
-import plotly.express as px 
-import plotly.graph_objects as go 
-from scipy.stats import poisson 
-import numpy as np
+
+from brasileirao import metricas
+from brasileirao.graficos import (
+    grafico_eficiencia, grafico_forma, grafico_gols_rodada, grafico_pontos, grafico_posicoes, grafico_probabilidades,
+    grafico_radar_mando, grafico_tempos,
+)
+
+# Cronômetro do rerun inteiro: cada clique gera um registro com o tempo de cada etapa
+metricas.REGISTRO.iniciar_rerun()
+# Só conta na primeira vez (nas outras os módulos já estão em sys.modules)
+metricas.registrar_inicializacao("imports", time.perf_counter() - INICIO_SCRIPT)
 
 # ==============================================================================
 # 1. CONFIGURAÇÃO INICIAL DA PÁGINA
@@ -73,365 +85,707 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 # MINHAS CONSTANTES
-# Minha chave da API (cuidado para não vazar se for publicar no GitHub público!)
-API_KEY = "7856a7ea3e43439685e366312e552301" 
-BASE_URL = "https://api.football-data.org/v4"
-# O cabeçalho que a API exige para saber quem eu sou
-HEADERS = {"X-Auth-Token": API_KEY}
+# Minha chave da API: só pela variável de ambiente (chave no código vaza quando o repositório é público).
+# Sem chave, o app ainda lê o snapshot do job (ou o dublê local, ver brasileirao/api_local.py).
+API_KEY = os.environ.get("FOOTBALL_DATA_API_KEY")
+# Dá para apontar para o dublê local (python -m brasileirao.api_local servir) e testar sem gastar a cota
+BASE_URL = os.environ.get("FOOTBALL_DATA_BASE_URL", "https://api.football-data.org/v4")
+# Onde o job headless (python -m brasileirao.snapshot) grava os snapshots versionados
+PASTA_SNAPSHOTS = os.environ.get("BRASILEIRAO_SNAPSHOTS", "dados/snapshots")
+# Painel de desempenho escondido: só aparece com ?admin=<token> na URL (sem token definido, não aparece nunca)
+ADMIN_TOKEN = os.environ.get("BRASILEIRAO_ADMIN_TOKEN")
+# Porta do /metrics (Prometheus). Sem a variável, o servidor de métricas não sobe.
+PORTA_METRICAS = os.environ.get("BRASILEIRAO_METRICAS_PORTA")
+# Por padrão só a própria máquina enxerga o /metrics; num container, quem raspa de fora
+# precisa de BRASILEIRAO_METRICAS_ENDERECO=0.0.0.0 (escolha explícita: não tem autenticação)
+ENDERECO_METRICAS = os.environ.get("BRASILEIRAO_METRICAS_ENDERECO", "127.0.0.1")
+# Modo ao vivo (placar e tabelas atualizados durante os jogos, ver brasileirao/ao_vivo.py).
+# Só liga quando FOOTBALL_DATA_API_KEY está definida; BRASILEIRAO_AO_VIVO=0 desliga mesmo com ela.
+AO_VIVO = bool(API_KEY) and os.environ.get("BRASILEIRAO_AO_VIVO", "1") != "0"
+# Cache compartilhado entre réplicas (ver brasileirao/cache_compartilhado.py): sqlite:///... ou redis://...
+CACHE_URL = os.environ.get("BRASILEIRAO_CACHE_URL")
+# Validade dos dados da API. Com cache compartilhado, o cache de cada processo vira só
+# uma camada curta na frente dele (1 minuto), e quem vai à API é uma réplica só.
+TTL_API = 3600
+TTL_LOCAL = 60 if CACHE_URL else TTL_API
+# Escudos baixados uma vez e servidos pelo próprio app em miniatura (ver brasileirao/escudos.py).
+# Moram no static/ ao lado do script (.streamlit/config.toml liga o enableStaticServing).
+# BRASILEIRAO_ESCUDOS_LOCAIS=0 volta para as URLs do CDN. BRASILEIRAO_ESCUDOS_EMBUTIDOS=1 manda as
+# miniaturas dentro da página (data URI), para proxy que reescreve o caminho sem o Streamlit saber.
+ESCUDOS_LOCAIS = os.environ.get("BRASILEIRAO_ESCUDOS_LOCAIS", "1") != "0"
+ESCUDOS_EMBUTIDOS = os.environ.get("BRASILEIRAO_ESCUDOS_EMBUTIDOS") == "1"
+PASTA_ESCUDOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "escudos")
 
 # ==============================================================================
 # 2. FUNÇÕES AJUDANTES (HELPERS)
 # ==============================================================================
-def get_sigla(nome_time):
+# Os gráficos (e o formatar_grafico, que tira o fundo cinza do Plotly) moram em
+# brasileirao/graficos.py: aqui o app só escolhe ONDE cada um aparece.
+
+# Montar a figura (Plotly Express valida cada propriedade) custa dezenas de ms; já
+# serializar uma figura pronta custa 1-2 ms. Como os dados só mudam quando sai um
+# snapshot novo, a figura fica em cache pela versão do snapshot + o que a diferencia
+# (clube escolhido, horizonte das previsões...). Os DataFrames entram com "_" no
+# nome para o Streamlit não gastar tempo fazendo hash deles: a versão já identifica os dados.
+@st.cache_resource(max_entries=128)
+def figura_em_cache(versao, nome, chave, _construtor, _args):
+    metricas.contar("cache_falhas", funcao="figura_em_cache")
+    with metricas.medir("grafico_montar_segundos", grafico=nome):
+        return _construtor(*_args)
+
+def mostrar_grafico(construtor, *args, chave=None):
     """
-    Função para limpar os gráficos. Em vez de "Red Bull Bragantino" (que quebra o layout),
-    eu transformo em "RBB". Se o time não estiver na lista, pego as 3 primeiras letras.
-    Isso é essencial para visualização em celular.
+    Pega a figura do cache (ou monta, na primeira vez da versão) e manda para a tela,
+    cronometrando as duas partes separadas: montar (só nas falhas de cache) e
+    st.plotly_chart (figura -> JSON -> navegador). `chave` diferencia chamadas do
+    mesmo construtor com dados diferentes dentro do mesmo snapshot.
     """
-    mapa = {
-        "América FC": "AME", "Athletico Paranaense": "CAP", "Atlético Mineiro": "CAM",
-        "Bahia": "BAH", "Botafogo FR": "BOT", "Corinthians": "COR",
-        "Coritiba": "CFC", "Cruzeiro": "CRU", "Cuiabá": "CUI",
-        "Flamengo": "FLA", "Fluminense FC": "FLU", "Fortaleza": "FOR",
-        "Goiás": "GOI", "Grêmio": "GRE", "Internacional": "INT",
-        "Palmeiras": "PAL", "Red Bull Bragantino": "RBB", "Santos": "SAN",
-        "São Paulo FC": "SAO", "Vasco da Gama": "VAS", "Vitória": "VIT",
-        "Juventude": "JUV", "Criciúma": "CRI", "Atlético Goianiense": "ACG"
-    }
-    # Tenta achar no dicionário, se não achar, corta a string.
-    for key, value in mapa.items():
-        if key in nome_time:
-            return value
-    return nome_time[:3].upper()
+    nome = construtor.__name__
+    metricas.contar("cache_chamadas", funcao="figura_em_cache")
+    fig = figura_em_cache(snapshot.versao, nome, chave, construtor, args)
+    with metricas.medir("plotly_chart_segundos", grafico=nome):
+        st.plotly_chart(fig, use_container_width=True)
 
-def formatar_grafico(fig):
+def fragmento(funcao=None, **opcoes):
     """
-    Função visual: Remove o fundo cinza padrão do Plotly e as grades excessivas.
-    Deixa o gráfico 'flutuando' no fundo escuro do app.
+    st.fragment com registro no painel de desempenho: um clique num widget de dentro
+    do fragmento reexecuta SÓ a função (o resto da página fica como está). Como o topo
+    do script não roda nesses reruns parciais, o cronômetro do rerun abre e fecha aqui.
+    As opções (run_every...) vão direto para o st.fragment.
     """
-    fig.update_layout(
-        plot_bgcolor='rgba(0,0,0,0)',  # Remove fundo da área do gráfico
-        paper_bgcolor='rgba(0,0,0,0)', # Remove fundo da área externa
-        font=dict(color='white'),      # Força texto branco
-        xaxis=dict(showgrid=False),    # Sem grades verticais
-        yaxis=dict(showgrid=True, gridcolor='rgba(255,255,255,0.1)'), # Grade horizontal sutil
-        margin=dict(l=20, r=20, t=40, b=20)
-    )
-    return fig
+    if funcao is None:
+        return functools.partial(fragmento, **opcoes)
+
+    @functools.wraps(funcao)
+    def embrulho(*args, **kwargs):
+        if metricas.REGISTRO.rerun_em_andamento():
+            # Primeira execução, dentro do rerun completo: entra no registro dele
+            return funcao(*args, **kwargs)
+        metricas.REGISTRO.iniciar_rerun()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            metricas.REGISTRO.finalizar_rerun(pagina="fragmento", fragmento=funcao.__name__)
+    return st.fragment(embrulho, **opcoes)
+
+# Servidor do /metrics: um só por processo, não importa quantas sessões abram
+@st.cache_resource
+def servidor_metricas():
+    metricas.configurar_log_json()
+    if PORTA_METRICAS:
+        return metricas.iniciar_servidor_metricas(PORTA_METRICAS, ENDERECO_METRICAS)
+    return None
+
+def painel_admin():
+    """Painel escondido na barra lateral com os tempos de cada etapa, cache e exportação."""
+    resumo = metricas.REGISTRO.resumo()
+    reruns = metricas.REGISTRO.reruns()
+    with st.sidebar.expander("⚙️ Desempenho (admin)", expanded=True):
+        if reruns:
+            totais = pd.Series([r['total_s'] for r in reruns])
+            c1, c2 = st.columns(2)
+            c1.metric("Último rerun", f"{totais.iloc[-1] * 1000:.0f} ms")
+            c2.metric("p95 (últimos)", f"{totais.quantile(0.95) * 1000:.0f} ms")
+            st.line_chart(totais * 1000, height=120)
+            st.caption("Etapas do último rerun")
+            st.dataframe(pd.DataFrame(reruns[-1]['etapas']), hide_index=True, use_container_width=True)
+
+        # Acerto de cache = chamadas que NÃO caíram dentro da função cacheada
+        contadores = pd.DataFrame(resumo['contadores'])
+        if not contadores.empty and 'funcao' in contadores:
+            cache = contadores[contadores['nome'].isin(['cache_chamadas', 'cache_falhas'])]
+            cache = cache.pivot_table(index='funcao', columns='nome', values='valor', aggfunc='sum', fill_value=0)
+            cache = cache.reindex(columns=['cache_chamadas', 'cache_falhas'], fill_value=0)
+            cache['acertos'] = cache['cache_chamadas'] - cache['cache_falhas']
+            st.caption("Cache (por função)")
+            st.dataframe(cache, use_container_width=True)
+
+        st.caption("Tempos acumulados no processo")
+        st.dataframe(pd.DataFrame(resumo['tempos']), hide_index=True, use_container_width=True)
+        if resumo['valores']:
+            st.caption("Tamanhos (bytes)")
+            st.dataframe(pd.DataFrame(resumo['valores']), hide_index=True, use_container_width=True)
+
+        st.download_button("Baixar JSON", metricas.REGISTRO.exportar_json(), "metricas.json", "application/json")
+        st.download_button("Baixar Prometheus", metricas.REGISTRO.exportar_prometheus(), "metrics.txt", "text/plain")
+        if st.button("Zerar métricas"):
+            metricas.REGISTRO.limpar()
+
+# Um cache de escudos por processo: o download de cada escudo acontece uma vez só,
+# não importa quantas sessões abram a tabela ao mesmo tempo
+@st.cache_resource
+def cache_escudos():
+    from brasileirao.escudos import CacheEscudos, prefixo_url
+    # Endereço absoluto, já com o server.baseUrlPath (app atrás de um caminho como /brasileirao)
+    return CacheEscudos(PASTA_ESCUDOS, prefixo_url=prefixo_url(st.get_option("server.baseUrlPath")))
+
+def escudos_locais(urls, tamanho="mini"):
+    """{URL do CDN: endereço local}. Escudo que ainda não chegou continua com a URL do CDN."""
+    if not ESCUDOS_LOCAIS:
+        return {url: url for url in urls}
+    # Sem o servidor de estáticos ligado, a miniatura vai embutida (data URI): continua sem ir ao CDN
+    embutir = ESCUDOS_EMBUTIDOS or not st.get_option("server.enableStaticServing")
+    return cache_escudos().enderecos(urls, tamanho, embutir=embutir)
 
 # ==============================================================================
 # 3. EXTRAÇÃO DE DADOS (ETL - EXTRACT, TRANSFORM, LOAD)
 # ==============================================================================
+# A transformação (process_data) e a modelagem (forças/Poisson) moram no pacote
+# brasileirao/, sem Streamlit. Aqui fica só o que é do dashboard: cache e leitura.
+# O cliente HTTP (pool de conexões + ETags guardadas) é um só para o app inteiro.
+# O @st.cache_resource garante que todas as sessões e reruns reaproveitam a mesma instância.
+@st.cache_resource
+def get_cliente_api():
+    # requests + cliente só são carregados no plano B (sem snapshot): com o job rodando,
+    # o dashboard nem importa o módulo da API
+    from brasileirao.api import ClienteFootballData
+    return ClienteFootballData(API_KEY, BASE_URL)
+
+# Cache de fora do processo (um por processo, mas os dados moram no SQLite/Redis).
+# Sem BRASILEIRAO_CACHE_URL, nem o módulo é importado e tudo fica como antes.
+@st.cache_resource
+def cache_compartilhado():
+    if not CACHE_URL:
+        return None
+    from brasileirao.cache_compartilhado import criar_cache
+    return criar_cache(CACHE_URL)
+
 # O @st.cache_data é vital! Ele salva o resultado na memória por 1 hora (3600s).
 # Sem isso, cada clique recarregaria a API e eu estouraria meu limite de requisições.
-@st.cache_data(ttl=3600)
+# Quando o cache expira, o cliente manda GET condicional: se nada mudou, volta 304 sem corpo.
+@st.cache_data(ttl=TTL_LOCAL)
+@metricas.cronometrado()
 def get_data_from_api():
+    # Só roda quando o cache não tem o dado: cada execução aqui é uma falha de cache
+    metricas.contar("cache_falhas", funcao="get_data_from_api")
+    from brasileirao.api import buscar_competicao
+    cliente = get_cliente_api()
+
+    def buscar():
+        # Classificação, lista de jogos (passados e futuros) e cadastro dos clubes,
+        # todos AO MESMO TEMPO: a carga fria demora o da requisição mais lenta, não a soma
+        return list(buscar_competicao(cliente, "BSA"))
+
+    cache = cache_compartilhado()
     try:
-        # Pego a classificação atual
-        standings = requests.get(f"{BASE_URL}/competitions/BSA/standings", headers=HEADERS).json()
-        # Pego a lista de todos os jogos (passados e futuros)
-        matches = requests.get(f"{BASE_URL}/competitions/BSA/matches", headers=HEADERS).json()
+        # Com cache compartilhado, quando a cópia vence só UMA réplica vai à API;
+        # as outras continuam servindo a cópia velha até a nova chegar
+        standings, matches = cache.obter("api:BSA", TTL_API, buscar) if cache else buscar()
         return standings, matches
     except Exception as e:
         st.error(f"Deu ruim na conexão com a API: {e}")
         return None, None
 
-def process_data(standings_raw, matches_raw):
+# O snapshot é gerado fora do dashboard (python -m brasileirao.snapshot) e aberto
+# aqui com memory-map. O cache_resource guarda UMA cópia por versão para todas as
+# sessões; quando o job grava uma versão nova, o ponteiro muda e a próxima
+# interação já abre a nova.
+@st.cache_resource(max_entries=2)
+def abrir_snapshot(versao):
+    metricas.contar("cache_falhas", funcao="abrir_snapshot")
+    # pyarrow só entra quando existe snapshot para abrir (e uma vez por versão, graças ao cache)
+    from brasileirao.snapshot import carregar_snapshot
+    return carregar_snapshot(PASTA_SNAPSHOTS, versao)
+
+# Plano B: se o job ainda não rodou, monto o mesmo snapshot aqui dentro, a partir da API.
+# Também fica em cache (o mesmo TTL da API), então o processamento roda uma vez por carga.
+@st.cache_resource(ttl=TTL_LOCAL, show_spinner="Processando os dados do campeonato...")
+def snapshot_ao_vivo():
+    metricas.contar("cache_falhas", funcao="snapshot_ao_vivo")
+    metricas.contar("cache_chamadas", funcao="get_data_from_api")
+    standings, matches = get_data_from_api()
+    if not standings or not matches:
+        return None
+    # Temporada passada (se o histórico foi baixado) entra nas forças: só essa partição é lida
+    from brasileirao.historico import historico_para_modelo
+    from brasileirao.snapshot import calcular_versao, montar_snapshot, snapshot_de_bytes, snapshot_para_bytes
+    df_historico = historico_para_modelo(matches, "BSA")
+
+    def processar():
+        return montar_snapshot(standings, matches, df_historico=df_historico)
+
+    cache = cache_compartilhado()
+    if cache is None:
+        return processar()
+    # Chave = versão (payload + histórico): a primeira réplica processa, as outras só leem o Arrow pronto
+    versao = calcular_versao(standings, matches, df_historico=df_historico)
+    return cache.obter(f"snapshot:BSA:{versao}", TTL_API, processar,
+                       snapshot_para_bytes, snapshot_de_bytes)
+
+# Modo ao vivo: UM monitor por processo. Ele consulta só os jogos de ontem a amanhã,
+# a cada minuto durante as janelas de jogo e bem espaçado fora delas, e aplica só os
+# jogos que mudaram em cima do snapshot completo (sem refazer o ETL da temporada).
+@st.cache_resource
+def monitor_ao_vivo():
+    from brasileirao.ao_vivo import MonitorAoVivo
+    return MonitorAoVivo(get_cliente_api(), "BSA", cache=cache_compartilhado())
+
+def carregar_snapshot_completo():
+    # Import aqui dentro (não no topo): o módulo só é lido quando a primeira página pede dados
+    from brasileirao.snapshot import versao_atual
+    versao = versao_atual(PASTA_SNAPSHOTS)
+    if versao is not None:
+        metricas.contar("cache_chamadas", funcao="abrir_snapshot")
+        return abrir_snapshot(versao)
+    metricas.contar("cache_chamadas", funcao="snapshot_ao_vivo")
+    snapshot = snapshot_ao_vivo()
+    if snapshot is None:
+        # Não deixo a falha da API presa no cache: a próxima interação tenta de novo
+        snapshot_ao_vivo.clear()
+        get_data_from_api.clear()
+    return snapshot
+
+@metricas.cronometrado()
+def carregar_dados():
+    snapshot = carregar_snapshot_completo()
+    if AO_VIVO and snapshot is not None:
+        # Só vai à API se já deu a hora da próxima consulta; senão devolve o que já tem
+        snapshot = monitor_ao_vivo().atualizar(snapshot)
+    return snapshot
+
+def placar_ao_vivo(versao_na_tela):
     """
-    Transforma o JSON bagunçado da API em DataFrames bonitinhos do Pandas.
+    Fragmento que roda sozinho (run_every = intervalo do monitor): mostra os jogos
+    rolando e, se chegou delta novo (outra versão), recarrega a página inteira.
     """
-    # 1. Tratando a Classificação
-    if 'standings' not in standings_raw:
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-    
-    lista_times = standings_raw["standings"][0]["table"]
-    df_tabela = pd.DataFrame([
-        {
-            "Pos": t["position"],
-            # ADICIONEI ISSO: Pegando a URL do escudo para mostrar na tabela
-            "Escudo": t["team"]["crest"], 
-            "Time": t["team"]["name"],
-            "Sigla": get_sigla(t["team"]["name"]), # Já crio a sigla aqui
-            "Pontos": t["points"],
-            "Jogos": t["playedGames"],
-            "Vitórias": t["won"],
-            "Empates": t["draw"],
-            "Derrotas": t["lost"],
-            "Gols Pró": t["goalsFor"],
-            # CORREÇÃO APLICADA: Mudei de 'Gols Contra' para 'Gols Sofridos'
-            "Gols Sofridos": t["goalsAgainst"], 
-            "Saldo": t["goalDifference"]
-        } for t in lista_times
-    ])
-    
-    # 2. Tratando os Jogos
-    lista_jogos = []
-    for jogo in matches_raw['matches']:
-        lista_jogos.append({
-            "Rodada": jogo['matchday'],
-            "Data": jogo['utcDate'],
-            "Status": jogo['status'], # Importante para saber se já acabou
-            "Home": jogo['homeTeam']['name'],
-            "Away": jogo['awayTeam']['name'],
-            "Sigla_Home": get_sigla(jogo['homeTeam']['name']),
-            "Sigla_Away": get_sigla(jogo['awayTeam']['name']),
-            "Gols_Home": jogo['score']['fullTime']['home'],
-            "Gols_Away": jogo['score']['fullTime']['away']
-        })
-    
-    df_jogos = pd.DataFrame(lista_jogos)
-    # Converto a data estranha da API para o horário do Brasil
-    df_jogos['Data'] = pd.to_datetime(df_jogos['Data']).dt.tz_convert('America/Sao_Paulo')
-    
-    # Separo em dois DataFrames: o que já foi (para estatística) e o que virá (para previsão)
-    df_finalizados = df_jogos[df_jogos['Status'] == 'FINISHED'].copy()
-    df_agendados = df_jogos[df_jogos['Status'] != 'FINISHED'].copy()
-    
-    return df_tabela, df_finalizados, df_agendados
+    snapshot_novo = carregar_dados()
+    if snapshot_novo is not None and snapshot_novo.versao != versao_na_tela:
+        st.rerun()
+    if snapshot_novo is None:
+        return
+    rolando = snapshot_novo.agendados[snapshot_novo.agendados['Status'].isin(["IN_PLAY", "PAUSED"])]
+    if not rolando.empty:
+        placares = " · ".join(
+            f"{j.Sigla_Home} {j.Gols_Home:.0f} x {j.Gols_Away:.0f} {j.Sigla_Away}"
+            + (" (intervalo)" if j.Status == "PAUSED" else "")
+            for j in rolando.fillna({'Gols_Home': 0, 'Gols_Away': 0}).itertuples()
+        )
+        st.markdown(f"🔴 **AO VIVO:** {placares}")
 
 # ==============================================================================
-# 4. MODELAGEM ESTATÍSTICA
+# 4. VISÕES DO PANORAMA (UMA FUNÇÃO POR ABA)
 # ==============================================================================
-def calcular_forca_times(df_finalizados):
-    """
-    Calcula o 'Power Ranking' de Ataque e Defesa.
-    Se a média da liga é 1.0 gol/jogo e o Flamengo faz 2.0, a força de ataque dele é 2.0.
-    """
-    if df_finalizados.empty: return None, 0, 0
-    
-    # Médias gerais do campeonato
-    media_gols_mandante = df_finalizados['Gols_Home'].mean()
-    media_gols_visitante = df_finalizados['Gols_Away'].mean()
-    
-    # Médias de cada time
-    home_stats = df_finalizados.groupby('Home')['Gols_Home'].mean()
-    away_stats = df_finalizados.groupby('Away')['Gols_Away'].mean()
-    home_def = df_finalizados.groupby('Home')['Gols_Away'].mean() # Quanto toma em casa
-    away_def = df_finalizados.groupby('Away')['Gols_Home'].mean() # Quanto toma fora
-    
-    # DataFrame final com os multiplicadores de força
-    forcas = pd.DataFrame({
-        'Ataque_Casa': home_stats / media_gols_mandante,
-        'Ataque_Fora': away_stats / media_gols_visitante,
-        'Defesa_Casa': home_def / media_gols_visitante,
-        'Defesa_Fora': away_def / media_gols_mandante
-    }).fillna(1) # Se der erro de divisão por zero, assume força média (1)
-    
-    return forcas, media_gols_mandante, media_gols_visitante
+# Cada aba é uma função que recebe o snapshot. Assim dá para executar SÓ a aba que
+# está aberta: o st.tabs desenhava (e calculava) as quatro em todo rerun, e o
+# navegador só escondia três delas. Aba nova = função nova + uma linha no dicionário.
 
-def prever_jogo(time_casa, time_fora, forcas, media_casa, media_fora):
-    """
-    Usa a Distribuição de Poisson.
-    Cruza o Ataque do Mandante com a Defesa do Visitante para achar os Gols Esperados (Lambda).
-    """
-    if forcas is None or time_casa not in forcas.index or time_fora not in forcas.index:
-        return 0, 0, 0 # Não tenho dados suficientes
-        
-    # Lambda = Gols Esperados
-    lamb_casa = forcas.at[time_casa, 'Ataque_Casa'] * forcas.at[time_fora, 'Defesa_Fora'] * media_casa
-    lamb_fora = forcas.at[time_fora, 'Ataque_Fora'] * forcas.at[time_casa, 'Defesa_Casa'] * media_fora
-    
-    # Simulo placares de 0x0 até 5x5
-    prob_vitoria_casa, prob_empate, prob_vitoria_fora = 0, 0, 0
-    for g_casa in range(6):
-        for g_fora in range(6):
-            # Qual a probabilidade estatística desse placar exato acontecer?
-            prob = poisson.pmf(g_casa, lamb_casa) * poisson.pmf(g_fora, lamb_fora)
-            
-            # Somo as probabilidades nos potes certos
-            if g_casa > g_fora: prob_vitoria_casa += prob
-            elif g_casa == g_fora: prob_empate += prob
-            else: prob_vitoria_fora += prob
-                
-    return prob_vitoria_casa, prob_empate, prob_vitoria_fora
+# --- ABA DA TABELA ---
+def aba_classificacao(snapshot):
+    """Aba 'Classificação & Pontos': barras de pontos + tabela com escudos."""
+    df_tabela = snapshot.tabela
+    st.subheader("Pontuação Atual")
+    st.caption("Abaixo, visualizamos rapidamente quem está acumulando mais pontos. A cor mais escura indica o líder.")
+
+    # Gráfico de barras simples
+    mostrar_grafico(grafico_pontos, df_tabela)
+
+    st.markdown("### 📋 Tabela Detalhada")
+    st.markdown("Dados brutos oficiais para conferência.")
+
+    # TABELA COM ESCUDOS (AQUI A MÁGICA ACONTECE)
+    # Seleciono colunas específicas e ordeno
+    cols_exibir = ['Escudo', 'Time', 'Pontos', 'Jogos', 'Vitórias', 'Empates', 'Derrotas', 'Saldo']
+    tabela_exibir = df_tabela.set_index("Pos")[cols_exibir]
+    # Miniatura servida pelo próprio app no lugar do escudo em tamanho cheio vindo do CDN
+    tabela_exibir = tabela_exibir.assign(Escudo=tabela_exibir['Escudo'].map(escudos_locais(tabela_exibir['Escudo'])))
+    st.dataframe(
+        tabela_exibir, 
+        use_container_width=True,
+        column_config={
+            "Escudo": st.column_config.ImageColumn("Escudo", width="small"), # Renderiza imagem
+            "Pontos": st.column_config.ProgressColumn("Pontos", format="%d", min_value=0, max_value=114) # Barra de progresso
+        }
+    )
+
+# --- ABA DO SCATTER PLOT (AQUELE DOS QUADRANTES) ---
+def aba_eficiencia(snapshot):
+    """Aba do scatter Ataque x Defesa (quadrantes)."""
+    df_tabela = snapshot.tabela
+    st.subheader("🎯 Matriz de Eficiência: Ataque vs. Defesa")
+    # STORYTELLING: Explico como ler o gráfico ANTES de mostrar o gráfico.
+    # Explicação crucial para o usuário entender o eixo Y invertido.
+    st.markdown(
+        """
+        **Como ler este gráfico estratégico:**
+        Imagine este gráfico como um mapa de qualidade.
+
+        * ➡️ **Eixo Horizontal (Direita):** Poder de Fogo. Quanto mais à direita, mais gols o time faz.
+        * ⬆️ **Eixo Vertical (Topo):** Solidez Defensiva. Quanto mais no topo, **MENOS** gols o time sofreu (melhor defesa).
+
+        **Os 4 Perfis de Times:**
+        1.  ↗️ **Elite (Canto Superior Direito):** O sonho de todo técnico. Ataque forte e defesa que não vaza.
+        2.  ↖️ **Retranqueiros (Canto Superior Esquerdo):** Defesa forte (topo), mas ataque inoperante (esquerda).
+        3.  ↘️ **Kamikazes (Canto Inferior Direito):** Fazem muitos gols, mas levam muitos. Jogos emocionantes e perigosos.
+        4.  ↙️ **Zona Crítica (Canto Inferior Esquerdo):** Ataque fraco e defesa peneira. Candidatos ao Z4.
+        """
+    )
+
+    # Scatter com quadrantes, eixo Y invertido e destaques de melhor ataque/defesa
+    mostrar_grafico(grafico_eficiencia, df_tabela)
+
+# Previsões ponderadas pela forma recente: mesmas forças do snapshot, com o lambda de
+# cada lado multiplicado pelo fator de forma (ver brasileirao/forma.py). Uma vez por versão.
+@st.cache_resource(max_entries=4)
+def previsoes_com_forma(versao, _snapshot):
+    from brasileirao.forma import fatores_forma
+    from brasileirao.modelo import prever_jogos_lote
+    previsoes, _ = prever_jogos_lote(
+        _snapshot.agendados, _snapshot.forcas, _snapshot.media_casa, _snapshot.media_fora,
+        rho=_snapshot.metadados.get("rho", 0.0), fatores_forma=fatores_forma(_snapshot.forma),
+    )
+    return previsoes
+
+# --- ABA DAS PREVISÕES (POISSON) ---
+def aba_previsoes(snapshot):
+    """Aba 'Previsões IA': probabilidades de todos os jogos agendados (Poisson/Dixon-Coles)."""
+    df_agendados = snapshot.agendados
+    st.subheader(" 🧮​ O que diz a Matemática?")
+    st.markdown(
+        """
+        Utilizamos um modelo estatístico chamado **Distribuição de Poisson**. 
+        Ele cruza a força de ataque do mandante com a fragilidade defensiva do visitante (e vice-versa) 
+        para calcular a probabilidade percentual de cada resultado nos próximos jogos.
+        As forças saem de um ajuste de **máxima verossimilhança (Dixon-Coles)**: jogos recentes pesam mais
+        e a correção para placares baixos (0x0, 1x1...) deixa a chance de empate mais realista.
+        """
+    )
+
+    if not df_agendados.empty:
+        com_forma = st.toggle(
+            "Ponderar pela forma recente (últimos 5 jogos)", key="previsoes_forma",
+            help="Quem vem marcando (ou sofrendo) mais que a média nos últimos jogos ganha (ou perde) um pouco de força.",
+        )
+        # TODOS os jogos agendados já vêm previstos no snapshot (motor em lote)
+        previsoes = previsoes_com_forma(snapshot.versao, snapshot) if com_forma else snapshot.previsoes
+        with metricas.medir("previsoes_join_segundos"):
+            df_previsoes = df_agendados.join(previsoes).sort_values(['Rodada', 'Data'])
+
+        # Um gráfico só para todos os jogos do horizonte escolhido (3 traces no total,
+        # em vez de uma figura por jogo), agrupado por rodada
+        horizonte = st.radio(
+            "Mostrar as barras de:", ["Próxima rodada", "Próximas 5 rodadas", "Resto do campeonato"],
+            horizontal=True,
+        )
+        rodadas_mostradas = {"Próxima rodada": 1, "Próximas 5 rodadas": 5, "Resto do campeonato": None}[horizonte]
+        df_grafico = df_previsoes
+        if rodadas_mostradas is not None:
+            primeira = df_previsoes['Rodada'].min()
+            df_grafico = df_previsoes[df_previsoes['Rodada'] < primeira + rodadas_mostradas]
+        mostrar_grafico(grafico_probabilidades, df_grafico, chave=(horizonte, com_forma))
+        st.caption("Verde = vitória do mandante, cinza = empate, vermelho = vitória do visitante. "
+                   "Jogos de times sem dados suficientes ficam de fora.")
+
+        # E a tabela completa com a previsão de todos os jogos que faltam
+        st.markdown("### 📅 Todos os Jogos Restantes")
+        st.caption("Probabilidades calculadas de uma vez para a lista inteira de jogos agendados.")
+        st.dataframe(
+            df_previsoes[['Rodada', 'Data', 'Home', 'Away', 'Prob_Casa', 'Prob_Empate', 'Prob_Fora']],
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Data": st.column_config.DatetimeColumn("Data", format="DD/MM HH:mm"),
+                "Prob_Casa": st.column_config.ProgressColumn("Casa", format="%.2f", min_value=0, max_value=1),
+                "Prob_Empate": st.column_config.ProgressColumn("Empate", format="%.2f", min_value=0, max_value=1),
+                "Prob_Fora": st.column_config.ProgressColumn("Fora", format="%.2f", min_value=0, max_value=1),
+            }
+        )
+    else:
+        st.info("Sem jogos agendados no momento.")
+
+# --- ABA DA PROJEÇÃO (MONTE CARLO) ---
+def aba_projecao(snapshot):
+    """Aba 'Projeção Final': resultado do Monte Carlo para os 20 clubes."""
+    df_times = snapshot.times
+    st.subheader("🎲 Simulação de Monte Carlo do Campeonato")
+    st.markdown(
+        """
+        Sorteamos o placar de **todos os jogos que faltam** usando o modelo de Poisson e repetimos
+        isso **100 mil vezes**. A porcentagem abaixo é em quantas dessas temporadas simuladas
+        o time terminou campeão, no G-6 (Libertadores) ou no Z-4.
+        """
+    )
+    df_resumo = snapshot.projecao
+    if df_resumo.empty:
+        st.info("Ainda não temos jogos finalizados para simular o campeonato.")
+    else:
+        st.dataframe(
+            df_resumo.join(df_times['Time']).set_index('Time').sort_values('Pontos_Esperados', ascending=False),
+            use_container_width=True,
+            column_config={
+                "Pontos_Esperados": st.column_config.NumberColumn("Pontos (média)", format="%.1f"),
+                "Prob_Titulo": st.column_config.ProgressColumn("Título", format="%.3f", min_value=0, max_value=1),
+                "Prob_Libertadores": st.column_config.ProgressColumn("Libertadores", format="%.3f", min_value=0, max_value=1),
+                "Prob_Z4": st.column_config.ProgressColumn("Z-4", format="%.3f", min_value=0, max_value=1),
+            }
+        )
+
+# Ordem do dicionário = ordem das abas na tela
+ABAS_PANORAMA = {
+    "Classificação & Pontos": aba_classificacao,
+    "Matriz de Eficiência (Scatter)": aba_eficiencia,
+    "Previsões IA": aba_previsoes,
+    "Projeção Final": aba_projecao,
+}
+
+@fragmento
+def panorama_geral(snapshot):
+    st.title("📊 Análise Tática do Brasileirão")
+    st.markdown("Bem-vindo ao centro de inteligência. Aqui analisamos o campeonato de forma macro.")
+
+    # Seletor no lugar das abas para não ficar tudo empilhado numa página quilométrica.
+    # Como estamos dentro de um fragmento, trocar de aba (ou mexer no horizonte das
+    # previsões) reexecuta só esta função, sem passar de novo pelo resto do script.
+    titulo_aba = st.radio(
+        "Aba:", list(ABAS_PANORAMA), horizontal=True, key="aba_panorama", label_visibility="collapsed"
+    )
+    aba = ABAS_PANORAMA[titulo_aba]
+    with metricas.medir("aba_segundos", aba=aba.__name__):
+        aba(snapshot)
 
 # ==============================================================================
-# 5. CONSTRUÇÃO DO DASHBOARD (FRONT-END)
+# 5. SIMULADOR DE CENÁRIOS ("E SE...?")
 # ==============================================================================
+# O usuário escolhe placares dos jogos que faltam e vê o efeito na tabela e na
+# projeção. O motor fica em brasileirao/cenarios.py (cada placar mexe só nos dois
+# times do jogo e refaz forças + Monte Carlo do cenário); aqui é só a tela. Os
+# cenários são da sessão (st.session_state): cada usuário tem os seus.
+MAX_CENARIOS = 4
+METRICAS_CENARIO = {
+    "Chance de título": "Prob_Titulo",
+    "Chance de Libertadores": "Prob_Libertadores",
+    "Risco de Z-4": "Prob_Z4",
+    "Pontos esperados": "Pontos_Esperados",
+    "Posição hoje": "Pos",
+}
+
+def cenarios_da_sessao(snapshot):
+    """{nome: Cenario} da sessão. 'Atual' (sem placar nenhum) é a referência e nunca é editado."""
+    from brasileirao.cenarios import Cenario
+    cenarios = st.session_state.setdefault("cenarios", {})
+    if not cenarios:
+        cenarios["Atual"] = Cenario(snapshot, "Atual")
+        cenarios["Cenário 1"] = Cenario(snapshot, "Cenário 1")
+    elif cenarios["Atual"].base.versao != snapshot.versao:
+        # Chegou snapshot novo (job ou modo ao vivo): refaço os cenários em cima dele.
+        # Placar de jogo que já aconteceu sai do cenário (agora vale o resultado real)
+        for nome in list(cenarios):
+            cenarios[nome] = cenarios[nome].sobre(snapshot)
+    return cenarios
 
-# Passo 1: Chamo a API
-dados_classificacao, dados_jogos = get_data_from_api()
+def _limpar_editores(nome):
+    # O data_editor guarda as edições no session_state: sem apagar, ele reaplicaria
+    # os placares antigos no próximo rerun
+    for chave in [c for c in st.session_state if str(c).startswith(f"editor_cenario:{nome}:")]:
+        del st.session_state[chave]
+
+def novo_cenario(copiar_de=None):
+    from brasileirao.cenarios import Cenario
+    cenarios = st.session_state["cenarios"]
+    numero = 1
+    while f"Cenário {numero}" in cenarios:
+        numero += 1
+    nome = f"Cenário {numero}"
+    _limpar_editores(nome)
+    cenario = Cenario(cenarios["Atual"].base, nome)
+    if copiar_de is not None:
+        cenario.definir_varios(cenarios[copiar_de].resultados)
+    cenarios[nome] = cenario
+    st.session_state["cenario_ativo"] = nome
+
+def apagar_cenario(nome):
+    cenarios = st.session_state["cenarios"]
+    del cenarios[nome]
+    _limpar_editores(nome)
+    st.session_state["cenario_ativo"] = next(n for n in cenarios if n != "Atual")
+
+def limpar_cenario(nome):
+    st.session_state["cenarios"][nome].limpar()
+    _limpar_editores(nome)
+
+@fragmento
+def simulador_cenarios(snapshot):
+    st.title("🔮 Simulador de Cenários: E se...?")
+    st.markdown(
+        "Escolha o placar dos próximos jogos e veja na hora como ficam a tabela e as chances de cada time. "
+        "Monte vários cenários (ex.: *o líder tropeça* x *o líder vence tudo*) e compare lado a lado."
+    )
+    if snapshot.agendados.empty:
+        st.info("Sem jogos agendados: não sobrou nada para simular.")
+        return
+
+    cenarios = cenarios_da_sessao(snapshot)
+    editaveis = [nome for nome in cenarios if nome != "Atual"]
+    if st.session_state.get("cenario_ativo") not in editaveis:
+        st.session_state["cenario_ativo"] = editaveis[0]
+
+    # --- ESCOLHA DO CENÁRIO ---
+    c1, c2, c3, c4, c5 = st.columns([3, 1, 1, 1, 1], vertical_alignment="bottom")
+    nome = c1.selectbox("Cenário em edição:", editaveis, key="cenario_ativo")
+    cheio = len(editaveis) >= MAX_CENARIOS
+    c2.button("➕ Novo", on_click=novo_cenario, disabled=cheio, use_container_width=True)
+    c3.button("📄 Duplicar", on_click=novo_cenario, args=(nome,), disabled=cheio, use_container_width=True)
+    c4.button("🧹 Limpar", on_click=limpar_cenario, args=(nome,), use_container_width=True)
+    c5.button("🗑️ Apagar", on_click=apagar_cenario, args=(nome,), disabled=len(editaveis) == 1,
+              use_container_width=True)
+    cenario = cenarios[nome]
+
+    # --- EDITOR DE PLACARES (UMA RODADA POR VEZ) ---
+    rodadas = sorted(snapshot.agendados['Rodada'].dropna().unique())
+    rodada = st.select_slider("Rodada:", rodadas, key="cenario_rodada", format_func=lambda r: f"{r:.0f}ª")
+    jogos = snapshot.agendados[snapshot.agendados['Rodada'] == rodada]
+    placares = [cenario.resultados.get(id_jogo, (None, None)) for id_jogo in jogos['ID_Jogo']]
+    df_edicao = pd.DataFrame({
+        'Mandante': jogos['Home'].to_numpy(),
+        'Gols_Casa': pd.array([p[0] for p in placares], dtype="Int64"),
+        'Gols_Fora': pd.array([p[1] for p in placares], dtype="Int64"),
+        'Visitante': jogos['Away'].to_numpy(),
+    }, index=pd.Index(jogos['ID_Jogo'].to_numpy(), name='ID_Jogo'))
+    st.caption("Digite os dois lados do placar; apagar um dos números tira o jogo do cenário.")
+    editado = st.data_editor(
+        df_edicao, key=f"editor_cenario:{nome}:{rodada}", hide_index=True, use_container_width=True,
+        disabled=['Mandante', 'Visitante'],
+        column_config={
+            "Gols_Casa": st.column_config.NumberColumn("Gols Casa", min_value=0, max_value=20, step=1),
+            "Gols_Fora": st.column_config.NumberColumn("Gols Fora", min_value=0, max_value=20, step=1),
+        },
+    )
+    # Só o que mudou vai para o motor (um recálculo para todos os placares novos)
+    mudancas = {}
+    for id_jogo, gols_casa, gols_fora in zip(editado.index, editado['Gols_Casa'], editado['Gols_Fora']):
+        placar = None if pd.isna(gols_casa) or pd.isna(gols_fora) else (int(gols_casa), int(gols_fora))
+        if placar != cenario.resultados.get(id_jogo):
+            mudancas[id_jogo] = placar or (None, None)
+    if mudancas:
+        cenario.definir_varios(mudancas)
+        st.caption(f"⚡ Cenário recalculado em {cenario.segundos_ultima_edicao * 1000:.0f} ms "
+                   f"({cenario.n_simulacoes:,} temporadas simuladas).".replace(",", "."))
+
+    # Previsões dos jogos da rodada que seguem sem placar, com as forças DO CENÁRIO
+    sem_placar = cenario.agendados[cenario.agendados['Rodada'] == rodada]
+    if not sem_placar.empty and not cenario.previsoes.empty:
+        with st.expander("🧮 Previsões dos jogos sem placar (com as forças do cenário)"):
+            st.dataframe(
+                sem_placar.join(cenario.previsoes)[['Home', 'Prob_Casa', 'Prob_Empate', 'Prob_Fora', 'Away']],
+                use_container_width=True, hide_index=True,
+                column_config={
+                    "Prob_Casa": st.column_config.ProgressColumn("Casa", format="%.2f", min_value=0, max_value=1),
+                    "Prob_Empate": st.column_config.ProgressColumn("Empate", format="%.2f", min_value=0, max_value=1),
+                    "Prob_Fora": st.column_config.ProgressColumn("Fora", format="%.2f", min_value=0, max_value=1),
+                },
+            )
+
+    # --- TABELA DO CENÁRIO ---
+    st.markdown(f"### 📋 Tabela e Projeção: {nome}")
+    st.caption(f"{len(cenario.resultados)} placar(es) definido(s). "
+               "'Δ Pos' compara com a tabela de hoje (positivo = subiu).")
+    resumo = cenario.resumo().join(cenarios["Atual"].resumo()['Pos'].rename('Pos_Atual'))
+    resumo['Delta_Pos'] = resumo['Pos_Atual'] - resumo['Pos']
+    resumo = resumo.join(snapshot.times['Time']).set_index('Time').sort_values('Pos')
+    st.dataframe(
+        resumo.drop(columns='Pos_Atual'),
+        use_container_width=True,
+        column_config={
+            "Delta_Pos": st.column_config.NumberColumn("Δ Pos", format="%+d"),
+            "Pontos_Esperados": st.column_config.NumberColumn("Pontos (média)", format="%.1f"),
+            "Prob_Titulo": st.column_config.ProgressColumn("Título", format="%.3f", min_value=0, max_value=1),
+            "Prob_Libertadores": st.column_config.ProgressColumn("Libertadores", format="%.3f", min_value=0, max_value=1),
+            "Prob_Z4": st.column_config.ProgressColumn("Z-4", format="%.3f", min_value=0, max_value=1),
+        },
+    )
+
+    # --- COMPARAÇÃO LADO A LADO ---
+    st.markdown("### ⚖️ Cenários Lado a Lado")
+    st.caption("Todos os cenários usam os mesmos sorteios: a diferença entre as colunas vem dos placares escolhidos.")
+    rotulo = st.radio("Comparar:", list(METRICAS_CENARIO), horizontal=True, key="cenario_metrica")
+    from brasileirao.cenarios import comparar_cenarios
+    coluna = METRICAS_CENARIO[rotulo]
+    comparacao = comparar_cenarios(cenarios.values(), coluna).join(snapshot.times['Time']).set_index('Time')
+    comparacao = comparacao.sort_values(list(comparacao.columns), ascending=coluna == "Pos")
+    if coluna.startswith("Prob_"):
+        formato = {nome_cenario: st.column_config.ProgressColumn(nome_cenario, format="%.3f", min_value=0, max_value=1)
+                   for nome_cenario in comparacao.columns}
+    else:
+        formato = {nome_cenario: st.column_config.NumberColumn(nome_cenario, format="%.1f" if coluna == "Pontos_Esperados" else "%d")
+                   for nome_cenario in comparacao.columns}
+    st.dataframe(comparacao, use_container_width=True, column_config=formato)
+
+# ==============================================================================
+# 6. CONSTRUÇÃO DO DASHBOARD (FRONT-END)
+# ==============================================================================
+
+servidor_metricas()
+
+# Passo 1: Abro o snapshot (já limpo, com forças, previsões e projeção calculadas)
+snapshot = carregar_dados()
+# Qual página foi desenhada (vai junto no registro do rerun)
+opcao_menu = None
 
 # Passo 2: Verifico se veio dado. Se a API falhar, não quebro o site.
-if dados_classificacao and dados_jogos:
-    # Passo 3: Limpo os dados
-    df_tabela, df_finalizados, df_agendados = process_data(dados_classificacao, dados_jogos)
-    # Passo 4: Calculo as forças para a IA
-    forcas, media_casa, media_fora = calcular_forca_times(df_finalizados)
+if snapshot is not None:
+    # Passo 3: Pego os DataFrames prontos (nada é recalculado a cada clique)
+    df_tabela, df_finalizados, df_agendados = snapshot.tabela, snapshot.finalizados, snapshot.agendados
+    df_time_jogos, df_times = snapshot.time_jogos, snapshot.times
+    # Passo 4: Forças e previsões da IA também já vêm do snapshot
+    forcas, media_casa, media_fora = snapshot.forcas, snapshot.media_casa, snapshot.media_fora
 
     # --- BARRA LATERAL (SIDEBAR) ---
     st.sidebar.title("Navegação")
     # Aqui defino o menu que troca o conteúdo da página principal
-    opcao_menu = st.sidebar.radio("Escolha a visão:", ["Panorama Geral", "Raio-X Cruzeiro"])
+    opcao_menu = st.sidebar.radio("Escolha a visão:", ["Panorama Geral", "Raio-X por Clube", "Simulador de Cenários"])
+    if opcao_menu == "Raio-X por Clube" and not df_tabela.empty:
+        # O Raio-X funciona para qualquer clube; o Cruzeiro continua sendo o padrão 💙
+        # As opções são os IDs; o registro de times traduz para o nome na tela
+        lista_clubes = df_times.loc[df_tabela['ID']].sort_values('Time').index.tolist()
+        padrao = next((i for i, id_time in enumerate(lista_clubes) if 'Cruzeiro' in df_times.at[id_time, 'Time']), 0)
+        time_escolhido = st.sidebar.selectbox(
+            "Escolha o clube:", lista_clubes, index=padrao, format_func=lambda id_time: df_times.at[id_time, 'Time']
+        )
+        nome_escolhido = df_times.at[time_escolhido, 'Time']
     st.sidebar.info("Dica: As siglas nos gráficos facilitam a leitura no celular.")
 
+    # Placar ao vivo no topo: o intervalo do fragmento acompanha o calendário
+    # (1 minuto durante os jogos, até a próxima janela fora deles)
+    if AO_VIVO:
+        fragmento(placar_ao_vivo, run_every=monitor_ao_vivo().intervalo())(snapshot.versao)
+
     # ==========================================================================
     # VISÃO 1: PANORAMA GERAL DO CAMPEONATO
     # ==========================================================================
     if opcao_menu == "Panorama Geral":
-        st.title("📊 Análise Tática do Brasileirão")
-        st.markdown("Bem-vindo ao centro de inteligência. Aqui analisamos o campeonato de forma macro.")
-        
-        # Crio abas para não ficar tudo empilhado numa página quilométrica
-        aba1, aba2, aba3 = st.tabs(["Classificação & Pontos", "Matriz de Eficiência (Scatter)", "Previsões IA"])
-        
-        # --- ABA DA TABELA ---
-        with aba1:
-            st.subheader("Pontuação Atual")
-            st.caption("Abaixo, visualizamos rapidamente quem está acumulando mais pontos. A cor mais escura indica o líder.")
-            
-            # Gráfico de barras simples
-            fig_pontos = px.bar(df_tabela, x="Sigla", y="Pontos", color="Pontos", text="Pontos", color_continuous_scale="Blues")
-            fig_pontos.update_layout(xaxis_title="Clubes (Sigla)", yaxis_title="Total de Pontos")
-            # Aplicando a formatação limpa (Função Nova)
-            st.plotly_chart(formatar_grafico(fig_pontos), use_container_width=True)
-            
-            st.markdown("### 📋 Tabela Detalhada")
-            st.markdown("Dados brutos oficiais para conferência.")
-            
-            # TABELA COM ESCUDOS (AQUI A MÁGICA ACONTECE)
-            # Seleciono colunas específicas e ordeno
-            cols_exibir = ['Escudo', 'Time', 'Pontos', 'Jogos', 'Vitórias', 'Empates', 'Derrotas', 'Saldo']
-            st.dataframe(
-                df_tabela.set_index("Pos")[cols_exibir], 
-                use_container_width=True,
-                column_config={
-                    "Escudo": st.column_config.ImageColumn("Escudo", width="small"), # Renderiza imagem
-                    "Pontos": st.column_config.ProgressColumn("Pontos", format="%d", min_value=0, max_value=114) # Barra de progresso
-                }
-            )
-            
-        # --- ABA DO SCATTER PLOT (AQUELE DOS QUADRANTES) ---
-        with aba2:
-            st.subheader("🎯 Matriz de Eficiência: Ataque vs. Defesa")
-            # STORYTELLING: Explico como ler o gráfico ANTES de mostrar o gráfico.
-            # Explicação crucial para o usuário entender o eixo Y invertido.
-            st.markdown(
-                """
-                **Como ler este gráfico estratégico:**
-                Imagine este gráfico como um mapa de qualidade.
-                
-                * ➡️ **Eixo Horizontal (Direita):** Poder de Fogo. Quanto mais à direita, mais gols o time faz.
-                * ⬆️ **Eixo Vertical (Topo):** Solidez Defensiva. Quanto mais no topo, **MENOS** gols o time sofreu (melhor defesa).
-                
-                **Os 4 Perfis de Times:**
-                1.  ↗️ **Elite (Canto Superior Direito):** O sonho de todo técnico. Ataque forte e defesa que não vaza.
-                2.  ↖️ **Retranqueiros (Canto Superior Esquerdo):** Defesa forte (topo), mas ataque inoperante (esquerda).
-                3.  ↘️ **Kamikazes (Canto Inferior Direito):** Fazem muitos gols, mas levam muitos. Jogos emocionantes e perigosos.
-                4.  ↙️ **Zona Crítica (Canto Inferior Esquerdo):** Ataque fraco e defesa peneira. Candidatos ao Z4.
-                """
-            )
-            
-            # Scatter plot: X=Ataque, Y=Defesa (Gols Sofridos)
-            # ATENÇÃO: Aqui usei a coluna corrigida "Gols Sofridos"
-            fig_scatter = px.scatter(
-                df_tabela, x="Gols Pró", y="Gols Sofridos", text="Sigla", size="Pontos", 
-                color="Saldo", color_continuous_scale="RdYlGn", title="Mapa de Posicionamento Tático"
-            )
-            
-            # TRUQUE VISUAL: Linhas médias para dividir os quadrantes
-            fig_scatter.add_vline(x=df_tabela['Gols Pró'].mean(), line_dash="dash", line_color="gray", annotation_text="Média Ataque")
-            fig_scatter.add_hline(y=df_tabela['Gols Sofridos'].mean(), line_dash="dash", line_color="gray", annotation_text="Média Defesa")
-            
-            # TRUQUE IMPORTANTE: Inverter o eixo Y. 
-            # Porque no futebol, sofrer 0 gols (topo) é melhor que sofrer 10 gols (fundo).
-            fig_scatter.update_yaxes(autorange="reversed", title="Gols Sofridos (Quanto mais no topo, melhor a defesa)")
-            fig_scatter.update_xaxes(title="Gols Feitos (Quanto mais à direita, melhor o ataque)")
-            
-            # Destaques automáticos (Melhor Ataque e Melhor Defesa)
-            melhor_atk = df_tabela.loc[df_tabela['Gols Pró'].idxmax()]
-            # Aqui também atualizei para buscar o mínimo em "Gols Sofridos"
-            melhor_def = df_tabela.loc[df_tabela['Gols Sofridos'].idxmin()]
-            
-            # Setinhas apontando os destaques
-            fig_scatter.add_annotation(x=melhor_atk['Gols Pró'], y=melhor_atk['Gols Sofridos'], text="🔥 Melhor Ataque", showarrow=True, arrowhead=2, ax=0, ay=-40, bgcolor="#1E1E1E")
-            fig_scatter.add_annotation(x=melhor_def['Gols Pró'], y=melhor_def['Gols Sofridos'], text="🛡️ Melhor Defesa", showarrow=True, arrowhead=2, ax=0, ay=40, bgcolor="#1E1E1E")
-            
-            # Aplicando a formatação limpa (Função Nova)
-            st.plotly_chart(formatar_grafico(fig_scatter), use_container_width=True)
-            
-        # --- ABA DAS PREVISÕES (POISSON) ---
-        with aba3:
-            st.subheader(" 🧮​ O que diz a Matemática?")
-            st.markdown(
-                """
-                Utilizamos um modelo estatístico chamado **Distribuição de Poisson**. 
-                Ele cruza a força de ataque do mandante com a fragilidade defensiva do visitante (e vice-versa) 
-                para calcular a probabilidade percentual de cada resultado nos próximos jogos.
-                """
-            )
-            
-            if not df_agendados.empty:
-                # Cores para a legenda HTML e para as barras
-                cor_home, cor_draw, cor_away = '#27ae60', '#95a5a6', '#c0392b'
-
-                # Pego os próximos 5 jogos
-                for _, row in df_agendados.sort_values('Rodada').head(5).iterrows():
-                    # Chamo a função de previsão
-                    ph, pe, pf = prever_jogo(row['Home'], row['Away'], forcas, media_casa, media_fora)
-                    
-                    if ph > 0: # Se o cálculo funcionou
-                        st.markdown(f"**{row['Home']} (Casa) x {row['Away']} (Fora)** - Rodada {row['Rodada']}")
-                        
-                        # --- LEGENDA PERSONALIZADA EM HTML (SOLUÇÃO DOS QUADRADINHOS) ---
-                        # Isso garante que as 3 cores apareçam sempre e o texto fique legível
-                        legenda_html = f"""
-                        <div style="display: flex; gap: 15px; font-size: 14px; margin-bottom: 5px;">
-                            <span style="color:{cor_home}">■ <b>{row['Sigla_Home']}</b> {ph:.0%}</span>
-                            <span style="color:{cor_draw}">■ <b>Empate</b> {pe:.0%}</span>
-                            <span style="color:{cor_away}">■ <b>{row['Sigla_Away']}</b> {pf:.0%}</span>
-                        </div>
-                        """
-                        st.markdown(legenda_html, unsafe_allow_html=True)
-
-                        # --- GRÁFICO SLIM (BARRAS FINAS) ---
-                        fig_prob = go.Figure()
-                        # Vitória Casa
-                        fig_prob.add_trace(go.Bar(
-                            x=[ph], orientation='h', marker_color=cor_home, hoverinfo='x+name', name=row['Sigla_Home']
-                        ))
-                        # Empate
-                        fig_prob.add_trace(go.Bar(
-                            x=[pe], orientation='h', marker_color=cor_draw, hoverinfo='x+name', name='Empate'
-                        ))
-                        # Vitória Fora
-                        fig_prob.add_trace(go.Bar(
-                            x=[pf], orientation='h', marker_color=cor_away, hoverinfo='x+name', name=row['Sigla_Away']
-                        ))
-                        
-                        # Configuração para remover tudo e deixar só a barra fina
-                        fig_prob.update_layout(
-                            barmode='stack', 
-                            height=30, # Barra bem fininha e elegante
-                            margin=dict(l=0,r=0,t=0,b=0), # Sem margens extras
-                            showlegend=False, # Esconde a legenda do Plotly (já fizemos a nossa em HTML)
-                            xaxis=dict(visible=False), # Esconde números do eixo X
-                            yaxis=dict(visible=False), # Esconde eixo Y
-                            plot_bgcolor='rgba(0,0,0,0)',
-                            paper_bgcolor='rgba(0,0,0,0)'
-                        )
-                        st.plotly_chart(fig_prob, use_container_width=True)
-                        st.divider()
-            else:
-                st.info("Sem jogos agendados no momento.")
+        # As abas moram na seção 4; aqui só chamo o fragmento (que calcula só a aba aberta)
+        panorama_geral(snapshot)
+
+    # ==========================================================================
+    # VISÃO 3: SIMULADOR DE CENÁRIOS ("E SE O LÍDER PERDER?")
+    # ==========================================================================
+    elif opcao_menu == "Simulador de Cenários":
+        # Tela e estado moram na seção 5 (fragmento: editar placar não reexecuta a página)
+        simulador_cenarios(snapshot)
 
     # ==========================================================================
-    # VISÃO 2: ÁREA EXCLUSIVA CRUZEIRO
+    # VISÃO 2: RAIO-X DE UM CLUBE (PADRÃO: CRUZEIRO)
     # ==========================================================================
-    elif opcao_menu == "Raio-X Cruzeiro":
-        # Filtro só o Cruzeiro na tabela
-        df_cru = df_tabela[df_tabela['Time'].str.contains("Cruzeiro", case=False)]
+    elif opcao_menu == "Raio-X por Clube":
+        # Busca direta pelo ID do time (índice), sem varrer a tabela com str.contains
+        tabela_por_time = df_tabela.set_index('ID')
         
-        if df_cru.empty:
-            st.warning("⚠️ Dados do Cruzeiro não encontrados (o campeonato começou ou a API mudou o nome).")
+        if df_tabela.empty or time_escolhido not in tabela_por_time.index:
+            st.warning("⚠️ Dados do clube não encontrados (o campeonato começou ou a API mudou o nome).")
         else:
-            stats = df_cru.iloc[0]
+            stats = tabela_por_time.loc[time_escolhido]
+            # Jogos finalizados do clube: um .loc no índice por time (já vem ordenado por data)
+            jogos_time = df_time_jogos.loc[[time_escolhido]] if time_escolhido in df_time_jogos.index else df_time_jogos.iloc[0:0]
             
+            escudo = escudos_locais([stats['Escudo']], "grande").get(stats['Escudo'], stats['Escudo'])
+
             # HERO HEADER (CABEÇALHO BONITO COM DEGRADÊ)
             st.markdown(f"""
-            <div style="background: linear-gradient(90deg, #00539F 0%, #002D58 100%); padding: 25px; border-radius: 12px; margin-bottom: 25px; box-shadow: 0 4px 15px rgba(0,0,0,0.3);">
-                <h1 style="color: white; margin:0; font-size: 2.5rem;">🦊 Cruzeiro Esporte Clube</h1>
-                <p style="color: #e0e0e0; margin:0; font-size: 1.1rem;">Painel de Inteligência & Performance</p>
+            <div style="background: linear-gradient(90deg, #00539F 0%, #002D58 100%); padding: 25px; border-radius: 12px; margin-bottom: 25px; box-shadow: 0 4px 15px rgba(0,0,0,0.3); display: flex; align-items: center; gap: 20px;">
+                <img src="{escudo}" style="height: 70px;">
+                <div>
+                    <h1 style="color: white; margin:0; font-size: 2.5rem;">{nome_escolhido}</h1>
+                    <p style="color: #e0e0e0; margin:0; font-size: 1.1rem;">Painel de Inteligência & Performance</p>
+                </div>
             </div>
             """, unsafe_allow_html=True)
             
@@ -441,43 +795,48 @@ if dados_classificacao and dados_jogos:
             c1.metric("Posição na Tabela", f"{stats['Pos']}º Lugar")
             c2.metric("Pontos Conquistados", stats['Pontos'])
             # Calculo aproveitamento na hora: Pontos / (Jogos * 3)
-            c3.metric("Aproveitamento Total", f"{(stats['Pontos']/(stats['Jogos']*3)*100):.1f}%")
+            c3.metric("Aproveitamento Total", f"{(stats['Pontos']/(stats['Jogos']*3)*100):.1f}%" if stats['Jogos'] else "-")
             c4.metric("Saldo de Gols", stats['Saldo'])
             st.divider()
+
+            # --- FORMA RECENTE E CONFRONTO DIRETO (PRÉ-CALCULADOS NO SNAPSHOT) ---
+            # Série de forma e retrospecto por adversário saem prontos (brasileirao/forma.py):
+            # aqui é só um .loc pelo ID, sem filtrar a lista de jogos
+            if time_escolhido in snapshot.forma.index:
+                forma_time = snapshot.forma.loc[[time_escolhido]]
+                atual = forma_time.iloc[-1]
+                st.markdown("### 🔥 Forma Recente")
+                icones = {'V': '🟢', 'E': '⚪', 'D': '🔴'}
+                f1, f2, f3, f4 = st.columns(4)
+                f1.metric(f"Últimos {len(atual['Forma'])} jogos", " ".join(icones[r] for r in atual['Forma']))
+                f2.metric("Pontos na janela", f"{atual['Pontos_Janela']} de {3 * atual['Jogos_Janela']}")
+                f3.metric("Gols na janela", f"{atual['Gols_Pro_Janela']} pró / {atual['Gols_Contra_Janela']} contra")
+                nome_resultado = {'V': 'vitória', 'E': 'empate', 'D': 'derrota'}[atual['Resultado']]
+                f4.metric("Sequência atual", f"{atual['Sequencia']} {nome_resultado}{'s' if atual['Sequencia'] > 1 else ''}",
+                          f"{atual['Invicto']} sem perder" if atual['Invicto'] else f"{atual['Sem_Vencer']} sem vencer",
+                          delta_color="normal" if atual['Invicto'] else "inverse")
+                mostrar_grafico(grafico_forma, forma_time, chave=time_escolhido)
+
+                with st.expander("🤝 Confronto direto contra cada adversário"):
+                    if time_escolhido in snapshot.confrontos.index.get_level_values(0):
+                        retrospecto = snapshot.confrontos.loc[time_escolhido].join(df_times['Time'])
+                        st.dataframe(
+                            retrospecto.set_index('Time').sort_values(['Pontos', 'Gols_Pro'], ascending=False),
+                            use_container_width=True,
+                            column_config={
+                                "Gols_Pro": st.column_config.NumberColumn("Gols Pró"),
+                                "Gols_Contra": st.column_config.NumberColumn("Gols Contra"),
+                            },
+                        )
+                st.divider()
             
             # --- GRÁFICO 1: GOLS FEITOS x SOFRIDOS ---
             st.subheader("⚽ Equilíbrio: Ataque vs Defesa (Rodada a Rodada)")
             st.caption("Este gráfico ajuda a entender a consistência. Barras Azuis (Gols Feitos) devem ser maiores que as Vermelhas (Gols Sofridos).")
             
-            # Filtro jogos do Cruzeiro (Casa ou Fora) que já acabaram
-            jogos_cru = df_finalizados[(df_finalizados['Home'].str.contains('Cruzeiro')) | (df_finalizados['Away'].str.contains('Cruzeiro'))].sort_values('Rodada')
-            
-            if not jogos_cru.empty:
-                # Preciso "derreter" os dados para o gráfico de barras agrupadas
-                dados_grafico = []
-                for _, row in jogos_cru.iterrows():
-                    # Lógica para descobrir quem é quem
-                    if 'Cruzeiro' in row['Home']:
-                        gp, gs, adv, mando = row['Gols_Home'], row['Gols_Away'], row['Sigla_Away'], "(C)"
-                    else:
-                        gp, gs, adv, mando = row['Gols_Away'], row['Gols_Home'], row['Sigla_Home'], "(F)"
-                    
-                    dados_grafico.append({"Rodada": f"R{row['Rodada']} {mando}", "Tipo": "Gols Feitos", "Gols": gp, "Adv": adv})
-                    # Rótulo corrigido para "Gols Sofridos"
-                    dados_grafico.append({"Rodada": f"R{row['Rodada']} {mando}", "Tipo": "Gols Sofridos", "Gols": gs, "Adv": adv})
-                
-                # Gráfico com barras lado a lado (barmode='group')
-                # Ajustei as cores para bater com os novos nomes
-                fig_comp = px.bar(
-                    pd.DataFrame(dados_grafico), 
-                    x="Rodada", 
-                    y="Gols", 
-                    color="Tipo", 
-                    barmode="group", 
-                    color_discrete_map={"Gols Feitos":"#00539F", "Gols Sofridos":"#E74C3C"}
-                )
-                # Aplicando a formatação limpa (Função Nova)
-                st.plotly_chart(formatar_grafico(fig_comp), use_container_width=True)
+            if not jogos_time.empty:
+                # Barras lado a lado (gols feitos x sofridos) a partir da tabela por time
+                mostrar_grafico(grafico_gols_rodada, jogos_time, chave=time_escolhido)
             
             st.divider()
             
@@ -490,81 +849,47 @@ if dados_classificacao and dados_jogos:
             with col_t1:
                 st.markdown("#### ⏱️ Desempenho: 1º Tempo vs 2º Tempo")
                 st.caption("O time 'acorda' tarde ou cansa no final? Barras vermelhas altas no 2º tempo indicam queda física ou desatenção.")
-                g1p, g1c, g2p, g2c = 0, 0, 0, 0
-                matches_cru_full = dados_jogos['matches'] # Pego o raw para ter acesso ao 'score' detalhado
-                
-                for m in matches_cru_full:
-                    if m['status'] == 'FINISHED' and ('Cruzeiro' in m['homeTeam']['name'] or 'Cruzeiro' in m['awayTeam']['name']):
-                        ishome = 'Cruzeiro' in m['homeTeam']['name']
-                        # Trato nulos como 0
-                        ht_h = m['score']['halfTime']['home'] or 0
-                        ht_a = m['score']['halfTime']['away'] or 0
-                        ft_h = m['score']['fullTime']['home'] or 0
-                        ft_a = m['score']['fullTime']['away'] or 0
-                        
-                        # Acumulo os gols
-                        if ishome:
-                            g1p += ht_h; g1c += ht_a
-                            g2p += (ft_h - ht_h); g2c += (ft_a - ht_a)
-                        else:
-                            g1p += ht_a; g1c += ht_h
-                            g2p += (ft_a - ht_a); g2c += (ft_h - ht_h)
-                            
-                fig_tempos = go.Figure(data=[
-                    go.Bar(name='Gols Pró', x=['1º Tempo', '2º Tempo'], y=[g1p, g2p], marker_color='#2ecc71'),
-                    go.Bar(name='Gols Sofridos', x=['1º Tempo', '2º Tempo'], y=[g1c, g2c], marker_color='#e74c3c')
-                ])
-                fig_tempos.update_layout(barmode='group', height=300)
-                # Aplicando a formatação limpa (Função Nova)
-                st.plotly_chart(formatar_grafico(fig_tempos), use_container_width=True)
+                mostrar_grafico(grafico_tempos, jogos_time, chave=time_escolhido)
                 
             # Coluna 2: Radar Chart (Casa vs Fora)
             with col_t2:
                 st.markdown("#### 🏠 Fator Casa vs Visitante")
                 st.caption("Aproveitamento percentual. Um gráfico 'torto' indica dependência do mando de campo. O ideal é um triângulo grande e equilibrado.")
-                # Funçãozinha interna para calcular aproveitamento rápido
-                def get_aprov(is_home):
-                    subset = df_finalizados[df_finalizados['Home' if is_home else 'Away'].str.contains('Cruzeiro')]
-                    if subset.empty: return 0
-                    pts = 0
-                    for _, r in subset.iterrows():
-                        gh, ga = r['Gols_Home'], r['Gols_Away']
-                        if is_home: pts += 3 if gh > ga else (1 if gh == ga else 0)
-                        else: pts += 3 if ga > gh else (1 if ga == gh else 0)
-                    return (pts / (len(subset)*3)) * 100
-                
-                ac, af = get_aprov(True), get_aprov(False)
-                # O gráfico aranha precisa repetir o primeiro ponto no final para fechar o ciclo
-                fig_radar = go.Figure(go.Scatterpolar(r=[ac, af, ac], theta=['Jogando em Casa', 'Visitante', 'Jogando em Casa'], fill='toself', line_color='#00539F'))
-                fig_radar.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 100])), showlegend=False, height=300)
-                # Aplicando a formatação limpa (Função Nova)
-                st.plotly_chart(formatar_grafico(fig_radar), use_container_width=True)
+                mostrar_grafico(grafico_radar_mando, jogos_time, chave=time_escolhido)
 
             # --- PROJEÇÃO FINAL ---
             st.divider()
             st.subheader("🔮 Bola de Cristal: Projeção Final")
-            st.markdown("Baseado na média de pontos atual, onde o Cruzeiro terminaria o campeonato?")
+            st.markdown(f"Simulamos 100 mil vezes o resto do campeonato. Onde o {nome_escolhido} terminaria?")
             
-            if stats['Jogos'] > 0:
-                # Regra de 3 simples: Se fiz X pontos em Y jogos, farei Z em 38 jogos.
-                proj = int(stats['Pontos'] + (stats['Pontos']/stats['Jogos'] * (38 - stats['Jogos'])))
+            df_resumo, df_posicoes = snapshot.projecao, snapshot.posicoes
+            
+            if time_escolhido in df_resumo.index:
+                proj_time = df_resumo.loc[time_escolhido]
+                proj = int(round(proj_time['Pontos_Esperados']))
                 
                 # Barra de progresso visual (máximo 114 pontos)
                 st.progress(min(proj/114, 1.0)) 
                 
-                # O Storytelling aqui é crucial: explicar POR QUE deu o alerta
-                st.metric("Pontuação Projetada (Final do Campeonato)", f"{proj} Pontos")
+                p1, p2, p3, p4 = st.columns(4)
+                p1.metric("Pontuação Projetada (Média)", f"{proj} Pontos")
+                p2.metric("Chance de Título", f"{proj_time['Prob_Titulo']:.1%}")
+                p3.metric("Chance de Libertadores", f"{proj_time['Prob_Libertadores']:.1%}")
+                p4.metric("Risco de Z-4", f"{proj_time['Prob_Z4']:.1%}")
                 
-                # Mensagens condicionais baseadas no histórico do Brasileirão
-                if proj >= 58: 
-                    st.success("🎉 **Cenário Otimista:** Com essa pontuação, brigamos por vaga na **Libertadores**!")
-                elif proj >= 45: 
-                    st.warning("🛡️ **Cenário Neutro:** Pontuação de vaga na **Sul-Americana** ou meio de tabela. Seguro contra o rebaixamento.")
+                # Distribuição da posição final (em quantas simulações terminou em cada lugar)
+                mostrar_grafico(grafico_posicoes, df_posicoes, time_escolhido, chave=time_escolhido)
+                
+                # O Storytelling aqui é crucial: explicar POR QUE deu o alerta
+                if proj_time['Prob_Libertadores'] >= 0.5: 
+                    st.success("🎉 **Cenário Otimista:** Na maioria das simulações brigamos por vaga na **Libertadores**!")
+                elif proj_time['Prob_Z4'] < 0.25: 
+                    st.warning("🛡️ **Cenário Neutro:** Vaga na **Sul-Americana** ou meio de tabela. Risco de rebaixamento controlado.")
                 else: 
                     st.error(
-                        """
-                        🚨 **ALERTA Z-4 LIGADO!** Historicamente, times com menos de 45 pontos correm alto risco de rebaixamento. 
-                        A projeção atual indica que o Cruzeiro precisa melhorar o aproveitamento urgentemente.
+                        f"""
+                        🚨 **ALERTA Z-4 LIGADO!** Em pelo menos 1 de cada 4 temporadas simuladas o {nome_escolhido} termina no Z-4. 
+                        A projeção atual indica que o {nome_escolhido} precisa melhorar o aproveitamento urgentemente.
                         """
                     )
             else:
@@ -572,4 +897,13 @@ if dados_classificacao and dados_jogos:
 
 else:
     # Se caiu aqui, é porque a chave da API está errada ou a internet caiu.
-    st.error("Falha ao carregar dados. Verifique a API Key ou sua conexão.")
\ No newline at end of file
+    st.error("Falha ao carregar dados. Verifique a API Key ou sua conexão.")
+
+# ==============================================================================
+# 7. PAINEL DE DESEMPENHO (ESCONDIDO) + FECHAMENTO DO RERUN
+# ==============================================================================
+if ADMIN_TOKEN and st.query_params.get("admin") == ADMIN_TOKEN:
+    painel_admin()
+metricas.REGISTRO.finalizar_rerun(pagina=opcao_menu or "erro")
+# Primeira pintura do processo: do topo do script (antes dos imports) até a página inteira enviada
+metricas.registrar_inicializacao("primeira_pintura", time.perf_counter() - INICIO_SCRIPT)
\ No newline at end of file
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from brasileirao.backtest import backtest_temporada, pontuar
+from brasileirao.etl import achatar_jogos
+from brasileirao.modelo import calcular_forca_times, prever_jogos_lote
+from brasileirao.sintetico import gerar_temporadas
+
+
+@pytest.fixture(scope="module")
+def temporadas():
+    anterior, atual = gerar_temporadas(2, rodadas_jogadas=38, seed=11)
+    return achatar_jogos(anterior[2]), achatar_jogos(atual[2])
+
+
+def _direto(jogos, historico, rodada, peso_historico):
+    """O que o snapshot faria antes da `rodada`: calcular_forca_times do zero + prever_jogos_lote."""
+    datas = pd.to_datetime(jogos['Data'], utc=True)
+    corte = datas[jogos['Rodada'] == rodada].min()
+    forcas, media_casa, media_fora = calcular_forca_times(jogos[datas < corte], historico, peso_historico)
+    ids = pd.Index(np.union1d(jogos['Home_ID'].unique(), jogos['Away_ID'].unique()))
+    da_rodada = jogos[jogos['Rodada'] == rodada]
+    previsoes, _ = prever_jogos_lote(da_rodada, forcas.reindex(ids).fillna(1), media_casa, media_fora)
+    return da_rodada.join(previsoes).set_index('ID_Jogo')
+
+
+@pytest.mark.parametrize('com_historico', [False, True])
+def test_medias_bate_com_calcular_forca_times_no_corte(temporadas, com_historico):
+    historico, jogos = temporadas
+    historico = historico if com_historico else None
+
+    previsoes = backtest_temporada(jogos, historico, modelo="medias", peso_historico=0.25).set_index('ID_Jogo')
+    esperado = _direto(jogos, historico, rodada=20, peso_historico=0.25)
+
+    colunas = ['Lambda_Casa', 'Lambda_Fora', 'Prob_Casa', 'Prob_Empate', 'Prob_Fora']
+    pd.testing.assert_frame_equal(previsoes.loc[esperado.index, colunas], esperado[colunas],
+                                  check_exact=False, rtol=1e-9, check_dtype=False)
+
+
+def test_resultado_futuro_nao_vaza(temporadas):
+    _, jogos = temporadas
+    alterado = jogos.copy()
+    futuro = alterado['Rodada'] >= 20
+    alterado.loc[futuro, ['Gols_Home', 'Gols_Away']] = alterado.loc[futuro, ['Gols_Away', 'Gols_Home']].to_numpy()
+
+    antes = backtest_temporada(jogos, modelo="medias")
+    depois = backtest_temporada(alterado, modelo="medias")
+
+    ate_19 = antes['Rodada'] <= 19
+    pd.testing.assert_frame_equal(antes.loc[ate_19, 'Prob_Casa':], depois.loc[ate_19, 'Prob_Casa':])
+    assert not np.allclose(antes.loc[~ate_19, 'Prob_Casa'], depois.loc[~ate_19, 'Prob_Casa'])
+
+
+def test_sem_historico_primeira_rodada_fica_de_fora(temporadas):
+    _, jogos = temporadas
+    previsoes = backtest_temporada(jogos, modelo="medias")
+
+    assert previsoes['Rodada'].min() == 2
+    assert len(previsoes) == len(jogos) - (jogos['Rodada'] == 1).sum()
+    notas = pontuar(previsoes)
+    assert notas['Jogos'] == len(previsoes)
@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from brasileirao import cache_compartilhado
+from brasileirao.cache_compartilhado import CacheSQLite, criar_cache, json_para_bytes
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "cache.db")
+
+
+def _envelhecer(cache, chave, segundos):
+    # Volta o gravado_em da entrada, como se ela tivesse sido gravada há `segundos`
+    with cache._conectar() as conexao:
+        conexao.execute("UPDATE entradas SET gravado_em = gravado_em - ? WHERE chave = ?", (segundos, chave))
+
+
+def test_fresco_nao_chama_produzir_de_novo(caminho):
+    cache = criar_cache(f"sqlite:///{caminho}")
+    chamadas = []
+
+    def produzir():
+        chamadas.append(1)
+        return {"jogos": [1, 2, 3]}
+
+    assert cache.obter("api:jogos", 60, produzir) == {"jogos": [1, 2, 3]}
+    assert cache.obter("api:jogos", 60, produzir) == {"jogos": [1, 2, 3]}
+    assert len(chamadas) == 1
+
+
+def test_single_flight_na_primeira_carga(caminho, monkeypatch):
+    monkeypatch.setattr(cache_compartilhado, "INTERVALO_ESPERA", 0.01)
+    # Uma instância por thread, como réplicas diferentes apontando para o mesmo arquivo
+    replicas = [CacheSQLite(caminho) for _ in range(6)]
+    chamadas = []
+    largada = threading.Barrier(len(replicas))
+    resultados = [None] * len(replicas)
+
+    def produzir():
+        chamadas.append(1)
+        time.sleep(0.3)
+        return {"valor": 42}
+
+    def rodar(i):
+        largada.wait()
+        resultados[i] = replicas[i].obter("snapshot:atual", 60, produzir)
+
+    threads = [threading.Thread(target=rodar, args=(i,)) for i in range(len(replicas))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(chamadas) == 1
+    assert resultados == [{"valor": 42}] * len(replicas)
+
+
+def test_vencido_com_trava_de_outra_replica_serve_a_copia_velha(caminho):
+    cache = CacheSQLite(caminho)
+    cache.gravar("api:tabela", json_para_bytes({"versao": 1}))
+    _envelhecer(cache, "api:tabela", 120)
+    assert cache.travar("api:tabela", "outra-replica")
+
+    def produzir():
+        raise AssertionError("quem não tem a trava não busca")
+
+    assert cache.obter("api:tabela", 60, produzir) == {"versao": 1}
+
+
+def test_vencido_sem_trava_atualiza_e_libera(caminho):
+    cache = CacheSQLite(caminho)
+    cache.gravar("api:tabela", json_para_bytes({"versao": 1}))
+    _envelhecer(cache, "api:tabela", 120)
+
+    assert cache.obter("api:tabela", 60, lambda: {"versao": 2}) == {"versao": 2}
+    assert cache.obter("api:tabela", 60, lambda: {"versao": 3}) == {"versao": 2}
+    # A trava foi solta: outra réplica consegue pegar
+    assert cache.travar("api:tabela", "outra-replica")
+
+
+def test_erro_ao_atualizar_serve_a_copia_velha(caminho):
+    cache = CacheSQLite(caminho)
+    cache.gravar("api:tabela", json_para_bytes({"versao": 1}))
+    _envelhecer(cache, "api:tabela", 120)
+
+    def produzir():
+        raise ConnectionError("API fora do ar")
+
+    assert cache.obter("api:tabela", 60, produzir) == {"versao": 1}
+
+
+def test_erro_sem_copia_velha_sobe(caminho):
+    cache = CacheSQLite(caminho)
+
+    def produzir():
+        raise ConnectionError("API fora do ar")
+
+    with pytest.raises(ConnectionError):
+        cache.obter("api:tabela", 60, produzir)
+
+
+def test_trava_vencida_pode_ser_tomada(caminho):
+    cache = CacheSQLite(caminho)
+    assert cache.travar("api:tabela", "morta", validade=-1)
+    assert cache.travar("api:tabela", "viva")
+    assert not cache.travar("api:tabela", "terceira")
+    cache.liberar("api:tabela", "morta")  # Não é mais dela: não solta nada
+    assert not cache.travar("api:tabela", "terceira")
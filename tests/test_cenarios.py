@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from brasileirao.cenarios import Cenario
+from brasileirao.etl import achatar_jogos
+from brasileirao.sintetico import gerar_temporada, gerar_temporadas
+from brasileirao.snapshot import carregar_snapshot, montar_snapshot, salvar_snapshot, snapshot_de_bytes, snapshot_para_bytes
+
+
+@pytest.fixture(scope="module", params=["medias", "dixon_coles"])
+def base(request):
+    standings, matches = gerar_temporada(rodadas_jogadas=30, seed=5)
+    return montar_snapshot(standings, matches, n_simulacoes=2_000, seed=1, modelo=request.param)
+
+
+def _linha(tabela, id_time):
+    return tabela.set_index("ID").loc[id_time]
+
+
+def test_definir_mexe_so_nos_dois_times(base):
+    cenario = Cenario(base, n_simulacoes=2_000)
+    antes = cenario.tabela.set_index("ID")
+    jogo = base.agendados.iloc[0]
+    casa, fora = jogo["Home_ID"], jogo["Away_ID"]
+
+    cenario.definir(jogo["ID_Jogo"], 3, 1)
+
+    depois = cenario.tabela.set_index("ID")
+    assert depois.loc[casa, "Pontos"] == antes.loc[casa, "Pontos"] + 3
+    assert depois.loc[casa, "Vitórias"] == antes.loc[casa, "Vitórias"] + 1
+    assert depois.loc[casa, "Saldo"] == antes.loc[casa, "Saldo"] + 2
+    assert depois.loc[fora, "Derrotas"] == antes.loc[fora, "Derrotas"] + 1
+    assert depois.loc[fora, "Gols Sofridos"] == antes.loc[fora, "Gols Sofridos"] + 3
+    outros = antes.index.difference([casa, fora])
+    pd.testing.assert_frame_equal(depois.loc[outros, ["Pontos", "Jogos", "Saldo"]],
+                                  antes.loc[outros, ["Pontos", "Jogos", "Saldo"]])
+    assert jogo["ID_Jogo"] not in set(cenario.agendados["ID_Jogo"])
+    assert list(cenario.tabela["Pos"]) == list(range(1, len(cenario.tabela) + 1))
+
+
+def test_definir_e_desfazer_volta_ao_original(base):
+    cenario = Cenario(base, n_simulacoes=2_000)
+    tabela, projecao = cenario.tabela.copy(), cenario.projecao.copy()
+    jogos = base.agendados["ID_Jogo"].iloc[:3].tolist()
+
+    cenario.definir(jogos[0], 0, 4)
+    cenario.definir_varios({jogos[1]: (2, 2), jogos[2]: (1, 0)})
+    cenario.definir(jogos[0], 5, 0)  # Troca de placar: desfaz o anterior antes de somar
+    assert cenario.resultados == {jogos[0]: (5, 0), jogos[1]: (2, 2), jogos[2]: (1, 0)}
+
+    cenario.definir(jogos[0], None, None)
+    cenario.limpar()
+
+    assert cenario.resultados == {}
+    pd.testing.assert_frame_equal(cenario.tabela, tabela)
+    assert len(cenario.agendados) == len(base.agendados)
+    # Mesma semente e mesmos jogos: a projeção volta igual (o Dixon-Coles sai de outro
+    # ponto de partida no refit, então ali só até a tolerância do ajuste)
+    if base.metadados["modelo"] == "medias":
+        pd.testing.assert_frame_equal(cenario.projecao, projecao)
+    else:
+        np.testing.assert_allclose(cenario.projecao.to_numpy(), projecao.to_numpy(), atol=0.02)
+
+
+def test_jogo_fora_dos_agendados(base):
+    cenario = Cenario(base, n_simulacoes=500)
+    with pytest.raises(KeyError):
+        cenario.definir(-1, 1, 0)
+
+
+@pytest.fixture(scope="module", params=["medias", "dixon_coles"])
+def base_com_historico(request):
+    (_, _, anterior), (_, standings, matches) = gerar_temporadas(2, rodadas_jogadas=20, seed=8)
+    historico = achatar_jogos(anterior)[["Home_ID", "Away_ID", "Gols_Home", "Gols_Away", "Data"]]
+    historico = historico.assign(Data=pd.to_datetime(historico["Data"], utc=True))
+    return montar_snapshot(standings, matches, n_simulacoes=2_000, seed=1, df_historico=historico,
+                           modelo=request.param)
+
+
+def test_cenario_sem_placar_usa_o_historico_do_snapshot(base_com_historico, tmp_path):
+    # O snapshot pode vir do disco ou do cache compartilhado: o histórico vai junto
+    salvar_snapshot(base_com_historico, str(tmp_path))
+    for base in (base_com_historico, carregar_snapshot(str(tmp_path)),
+                 snapshot_de_bytes(snapshot_para_bytes(base_com_historico))):
+        assert len(base.historico) == len(base_com_historico.historico) > 0
+        atual = Cenario(base, "Atual", n_simulacoes=500)
+        # Mesmas forças do snapshot (o Dixon-Coles parte do ajuste dele: só até a tolerância)
+        np.testing.assert_allclose(atual.forcas.loc[base.forcas.index].to_numpy(), base.forcas.to_numpy(), rtol=1e-3)
+        assert atual.media_casa == pytest.approx(base.media_casa, rel=1e-3)
+
+
+def test_sobre_continua_com_o_historico_do_snapshot_novo(base_com_historico):
+    cenario = Cenario(base_com_historico, n_simulacoes=500)
+    jogo = base_com_historico.agendados["ID_Jogo"].iloc[-1]
+    cenario.definir(jogo, 1, 0)
+
+    refeito = cenario.sobre(base_com_historico)
+
+    assert refeito.df_historico is base_com_historico.historico
+    assert refeito.resultados == {jogo: (1, 0)}
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from brasileirao.dixon_coles import LIMITES_RHO, _funcao_objetivo, ajustar_dixon_coles
+
+
+def _dados(n_times=6, n_jogos=80, seed=0):
+    rng = np.random.default_rng(seed)
+    i_casa = rng.integers(0, n_times, n_jogos)
+    i_fora = (i_casa + rng.integers(1, n_times, n_jogos)) % n_times
+    # Muitos placares baixos, para passar pelos quatro ramos da correção (0x0, 0x1, 1x0, 1x1)
+    gols_casa = rng.poisson(1.1, n_jogos).astype(float)
+    gols_fora = rng.poisson(0.9, n_jogos).astype(float)
+    pesos = rng.uniform(0.3, 1.0, n_jogos)
+    mascaras = (
+        (gols_casa == 0) & (gols_fora == 0), (gols_casa == 0) & (gols_fora == 1),
+        (gols_casa == 1) & (gols_fora == 0), (gols_casa == 1) & (gols_fora == 1),
+    )
+    return (n_times, i_casa, i_fora, gols_casa, gols_fora, pesos, 4.0, *mascaras)
+
+
+@pytest.mark.parametrize('rho', [-0.15, 0.0, 0.12])
+def test_gradiente_bate_com_diferencas_finitas(rho):
+    args = _dados()
+    assert all(m.any() for m in args[-4:])
+    n_times = args[0]
+    rng = np.random.default_rng(1)
+    theta = np.concatenate([[0.1, 0.25], rng.normal(0, 0.3, 2 * n_times), [rho]])
+
+    _, grad = _funcao_objetivo(theta, *args)
+
+    passo = 1e-6
+    numerico = np.empty_like(theta)
+    for k in range(theta.size):
+        delta = np.zeros_like(theta)
+        delta[k] = passo
+        numerico[k] = (_funcao_objetivo(theta + delta, *args)[0] - _funcao_objetivo(theta - delta, *args)[0]) / (2 * passo)
+    np.testing.assert_allclose(grad, numerico, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize('rho', LIMITES_RHO)
+def test_lambdas_altos_com_rho_no_limite(rho):
+    # mu = log(3): lambdas de 3 a 6 gols, tau dos placares baixos abaixo de zero sem o piso
+    args = _dados(seed=2)
+    n_times = args[0]
+    rng = np.random.default_rng(4)
+    theta = np.concatenate([[np.log(3.0), 0.3], rng.normal(0, 0.3, 2 * n_times), [rho]])
+
+    valor, grad = _funcao_objetivo(theta, *args)
+
+    assert np.isfinite(valor) and np.all(np.isfinite(grad))
+    passo = 1e-6
+    numerico = np.array([
+        (_funcao_objetivo(theta + passo * e, *args)[0] - _funcao_objetivo(theta - passo * e, *args)[0]) / (2 * passo)
+        for e in np.eye(theta.size)
+    ])
+    np.testing.assert_allclose(grad, numerico, rtol=1e-5, atol=1e-5)
+
+
+def test_ajuste_recupera_mando_e_ordem_dos_ataques():
+    rng = np.random.default_rng(3)
+    ataque = np.array([0.4, 0.1, -0.1, -0.4])
+    jogos = []
+    for rodada in range(60):
+        for casa in range(4):
+            for fora in range(4):
+                if casa != fora:
+                    jogos.append((casa + 1, fora + 1,
+                                  rng.poisson(np.exp(0.3 + ataque[casa])), rng.poisson(np.exp(ataque[fora]))))
+    df = pd.DataFrame(jogos, columns=['Home_ID', 'Away_ID', 'Gols_Home', 'Gols_Away'])
+    df['Data'] = pd.Timestamp('2024-01-01', tz='UTC')
+
+    ajuste = ajustar_dixon_coles(df, meia_vida_dias=None, regularizacao=0.1)
+
+    assert ajuste.convergiu
+    assert list(np.argsort(-ajuste.ataque)) == [0, 1, 2, 3]
+    assert ajuste.fator_casa == pytest.approx(0.3, abs=0.1)
@@ -0,0 +1,20 @@
+import copy
+
+from brasileirao.etl import process_data
+from brasileirao.sintetico import gerar_temporada
+
+
+def test_jogo_finalizado_sem_placar_nao_entra_no_formato_longo():
+    standings, matches = gerar_temporada(rodadas_jogadas=5, seed=2)
+    matches = copy.deepcopy(matches)
+    jogo = next(j for j in matches['matches'] if j['status'] == 'FINISHED')
+    jogo['score']['fullTime'] = {'home': None, 'away': None}
+
+    _, finalizados, _, time_jogos, _ = process_data(standings, matches)
+
+    assert len(time_jogos) == 2 * (len(finalizados) - 1)
+    linhas = time_jogos.reset_index()
+    do_jogo = (linhas['ID'] == jogo['homeTeam']['id']) & (linhas['Adversario_ID'] == jogo['awayTeam']['id'])
+    assert not (do_jogo & (linhas['Rodada'] == jogo['matchday'])).any()
+    assert time_jogos['Gols_Pro'].between(0, 20).all() and time_jogos['Gols_Contra'].between(0, 20).all()
+    assert time_jogos['Pontos'].isin([0, 1, 3]).all()
@@ -0,0 +1,14 @@
+from brasileirao.metricas import RegistroMetricas
+
+
+def test_prometheus_escapa_valor_de_rotulo():
+    registro = RegistroMetricas()
+    registro.contar("cache_compartilhado", chave='api:"BSA"\\2024\nx')
+    registro.observar_tempo("etapa_segundos", 0.01, etapa="ok")
+
+    texto = registro.exportar_prometheus()
+
+    assert 'chave="api:\\"BSA\\"\\\\2024\\nx"' in texto
+    # Cada amostra continua numa linha só
+    linhas = [linha for linha in texto.splitlines() if linha and not linha.startswith("#")]
+    assert all(linha.rsplit(" ", 1)[1].replace(".", "").isdigit() for linha in linhas)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from brasileirao.modelo import _matriz_placares, prever_jogos_lote
+from brasileirao.simulacao import simular_temporada
+
+
+@pytest.mark.parametrize('rho, lamb_casa, lamb_fora', [(0.2, 3.2, 2.0), (-0.2, 6.0, 0.4), (-0.2, 0.4, 6.0)])
+def test_correcao_dixon_coles_nunca_deixa_probabilidade_negativa(rho, lamb_casa, lamb_fora):
+    # Sem o piso no tau: P(0x0) < 0 no primeiro caso, P(0x1) ou P(1x0) < 0 nos outros
+    placares = _matriz_placares(np.array([lamb_casa, 1.3]), np.array([lamb_fora, 1.1]), rho=rho)
+
+    assert placares.min() >= 0
+    np.testing.assert_allclose(placares.sum(axis=(1, 2)), 1.0)
+
+
+def test_correcao_dixon_coles_sem_piso_nao_muda_a_soma():
+    sem_rho = _matriz_placares(np.array([1.4]), np.array([1.0]))
+    com_rho = _matriz_placares(np.array([1.4]), np.array([1.0]), rho=-0.1)
+
+    assert com_rho[0, 0, 0] > sem_rho[0, 0, 0]
+    np.testing.assert_allclose(com_rho[0, 2:, 2:], sem_rho[0, 2:, 2:])
+
+
+def test_jogo_desequilibrado_com_rho_no_limite_chega_ao_simulador():
+    forcas = pd.DataFrame({'Ataque_Casa': [2.0, 1.0], 'Ataque_Fora': [2.0, 1.0],
+                           'Defesa_Casa': [0.8, 1.6], 'Defesa_Fora': [0.8, 1.6]},
+                          index=pd.Index([1, 2], name='ID'))
+    jogos = pd.DataFrame({'Home_ID': [1, 2], 'Away_ID': [2, 1]})
+    tabela = pd.DataFrame({'ID': [1, 2], 'Pontos': [0, 0], 'Vitórias': [0, 0], 'Saldo': [0, 0], 'Gols Pró': [0, 0]})
+
+    previsoes, placares = prever_jogos_lote(jogos, forcas, 1.25, 1.0, rho=0.2)
+    resumo, _ = simular_temporada(tabela, jogos, placares, n_simulacoes=1_000, seed=0)
+
+    assert placares.min() >= 0
+    np.testing.assert_allclose(previsoes[['Prob_Casa', 'Prob_Empate', 'Prob_Fora']].sum(axis=1), 1.0)
+    assert resumo['Pontos_Esperados'].sum() > 0
@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from brasileirao.simulacao import simular_temporada
+
+
+def _tabela(linhas):
+    # (ID, Pontos, Vitórias, Saldo, Gols Pró)
+    return pd.DataFrame(linhas, columns=['ID', 'Pontos', 'Vitórias', 'Saldo', 'Gols Pró'])
+
+
+def _jogos(pares):
+    return pd.DataFrame(pares, columns=['Home_ID', 'Away_ID'])
+
+
+def _placar_certo(gols_casa, gols_fora, n_gols=11):
+    # Matriz de placares com 100% num placar só: a simulação vira determinística
+    placar = np.zeros((n_gols, n_gols))
+    placar[gols_casa, gols_fora] = 1.0
+    return placar
+
+
+def test_soma_pontos_e_desempate_por_saldo():
+    tabela = _tabela([
+        (1, 10, 3, 5, 8),
+        (2, 9, 3, 2, 6),
+        (3, 9, 3, 0, 4),
+        (4, 4, 1, -7, 2),
+    ])
+    jogos = _jogos([(1, 2), (3, 4)])
+    placares = np.stack([_placar_certo(0, 2), _placar_certo(1, 1)])
+
+    resumo, posicoes = simular_temporada(tabela, jogos, placares, n_simulacoes=2_000, seed=0,
+                                         vagas_libertadores=1, vagas_rebaixamento=1)
+
+    # 2 x 0 para o visitante, 1 x 1 no outro jogo
+    assert resumo['Pontos_Esperados'].to_dict() == {1: 10, 2: 12, 3: 10, 4: 5}
+    # 1 e 3 empatam em pontos e vitórias; o saldo (3 contra 0) decide
+    esperado = pd.DataFrame(np.eye(4)[[1, 0, 2, 3]], index=posicoes.index, columns=posicoes.columns)
+    pd.testing.assert_frame_equal(posicoes, esperado)
+    assert resumo['Prob_Titulo'].to_dict() == {1: 0, 2: 1, 3: 0, 4: 0}
+    assert resumo['Prob_Z4'].to_dict() == {1: 0, 2: 0, 3: 0, 4: 1}
+
+
+def test_desempate_por_vitorias_antes_do_saldo():
+    # Mesmos pontos; o time 2 tem saldo muito melhor, mas uma vitória a menos
+    tabela = _tabela([(1, 7, 2, 0, 3), (2, 7, 1, 9, 12)])
+    resumo, posicoes = simular_temporada(tabela, _jogos([]), np.zeros((0, 11, 11)), n_simulacoes=500, seed=0)
+
+    assert posicoes.loc[1, 1] == 1 and posicoes.loc[2, 2] == 1
+    assert resumo['Pontos_Esperados'].to_dict() == {1: 7, 2: 7}
+
+
+def test_empate_em_tudo_vira_sorteio():
+    tabela = _tabela([(1, 5, 1, 2, 4), (2, 5, 1, 2, 4)])
+    _, posicoes = simular_temporada(tabela, _jogos([]), np.zeros((0, 11, 11)), n_simulacoes=20_000, seed=0)
+
+    assert posicoes.loc[1, 1] == pytest.approx(0.5, abs=0.02)
+    np.testing.assert_allclose(posicoes.sum(axis=0), 1.0)
+    np.testing.assert_allclose(posicoes.sum(axis=1), 1.0)
+
+
+def test_placar_acima_de_15_gols_nao_corrompe():
+    # Matriz 21 x 21 (max_gols = 20): os códigos de placar não cabem mais em 8 bits
+    tabela = _tabela([(1, 0, 0, 0, 0), (2, 0, 0, 0, 0), (3, 3, 1, 1, 1)])
+    jogos = _jogos([(1, 2), (3, 2)])
+    placares = np.stack([_placar_certo(17, 0, n_gols=21), _placar_certo(0, 20, n_gols=21)])
+
+    resumo, posicoes = simular_temporada(tabela, jogos, placares, n_simulacoes=1_000, seed=0)
+
+    # 1 e 3 terminam com 3 pontos e 1 vitória; 2 fica com 3 pontos, 1 vitória e saldo 20 - 17 = 3
+    assert resumo['Pontos_Esperados'].to_dict() == {1: 3, 2: 3, 3: 3}
+    # Saldo: 1 -> 17, 2 -> 3, 3 -> 1 - 20 = -19
+    assert posicoes.loc[1, 1] == 1 and posicoes.loc[2, 2] == 1 and posicoes.loc[3, 3] == 1
+
+
+def test_mesma_semente_mesmo_resultado_com_pool():
+    tabela = _tabela([(i, 0, 0, 0, 0) for i in range(1, 5)])
+    jogos = _jogos([(1, 2), (3, 4), (1, 3), (2, 4)])
+    placares = np.full((4, 11, 11), 1 / 121)
+
+    sequencial = simular_temporada(tabela, jogos, placares, n_simulacoes=25_000, seed=42)
+    em_pool = simular_temporada(tabela, jogos, placares, n_simulacoes=25_000, seed=42, n_processos=2)
+
+    pd.testing.assert_frame_equal(sequencial[1], em_pool[1])
+
+
+@pytest.mark.parametrize('estrago', ['negativo', 'zerado', 'nan'])
+def test_matriz_de_placares_invalida_diz_qual_jogo(estrago):
+    tabela = _tabela([(1, 0, 0, 0, 0), (2, 0, 0, 0, 0)])
+    jogos = _jogos([(1, 2), (2, 1)]).assign(ID_Jogo=[501, 502])
+    placares = np.stack([_placar_certo(1, 0), _placar_certo(2, 2)])
+    if estrago == 'negativo':
+        placares[1, 0, 0] = -0.01
+    elif estrago == 'zerado':
+        placares[1] = 0.0
+    else:
+        placares[1, 3, 3] = np.nan
+
+    with pytest.raises(ValueError, match="ID_Jogo 502"):
+        simular_temporada(tabela, jogos, placares, n_simulacoes=100, seed=0)